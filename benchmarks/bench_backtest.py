@@ -0,0 +1,79 @@
+"""
+백테스트 재생 시간 측정 (결정 시점만 방문하는 이벤트 루프 vs 모든 캔들을 도는 단순 루프)
+
+    python -m benchmarks.bench_backtest --symbols 5 --days 90 --workers 4
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from benchmarks.synthetic import synthetic_candles, synthetic_symbols
+from modules.backtest import Backtester, BacktestAccount, SimulatedOrderHandler
+from modules.batch_indicators import calculate_indicators_batch
+from modules.candle_buffer import CandleBuffer
+
+
+def replay_every_bar(backtester, symbol, times, indicators):
+    """모든 캔들에서 체결/신호를 확인하는 기준 구현 (결과 비교용)"""
+    account = BacktestAccount([symbol], backtester.balance, backtester.leverage)
+    handler = SimulatedOrderHandler(account, backtester.leverage, backtester.trade_rate,
+                                    backtester.maker_fee, backtester.taker_fee)
+    position = account.position_data[symbol]
+    ready, _, _ = backtester.strategy.entry_masks(indicators)
+    for i in range(len(times)):
+        handler.match(symbol, times[i], indicators['Open'][i], indicators['High'][i], indicators['Low'][i])
+        if ready[i]:
+            account.time = int(times[i])
+            account.prices[symbol] = indicators['Close'][i]
+            latest = {column: series[i] for column, series in indicators.items()}
+            backtester.execute(handler, symbol, backtester.strategy.generate_signals_from_latest(latest, position))
+    return handler.trade_history
+
+
+def run(symbol_count, days, workers):
+    bars = days * 24 * 60
+    symbols = synthetic_symbols(symbol_count)
+    candles = {symbol: synthetic_candles(bars, seed=i) for i, symbol in enumerate(symbols)}
+    backtester = Backtester()
+
+    start = time.perf_counter()
+    indicators = {}
+    for symbol, (times, values) in candles.items():
+        stacked = calculate_indicators_batch({column: values[i][None] for i, column in enumerate(CandleBuffer.COLUMNS)})
+        indicators[symbol] = {column: series[0] for column, series in stacked.items()}
+    precompute = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = {symbol: backtester.replay(symbol, candles[symbol][0], indicators[symbol]) for symbol in symbols}
+    replay = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = {symbol: replay_every_bar(backtester, symbol, candles[symbol][0], indicators[symbol]) for symbol in symbols}
+    every_bar = time.perf_counter() - start
+
+    mismatched = [symbol for symbol in symbols if results[symbol]['trades'] != expected[symbol]]
+    assert not mismatched, f"거래 내역 불일치: {mismatched}"
+
+    trades = sum(len(result['trades']) for result in results.values())
+    decisions = sum(result['decisions'] for result in results.values())
+    print(f"symbols={symbol_count} bars={bars} trades={trades} decisions={decisions}")
+    print(f"indicator precompute {precompute:7.2f} s")
+    print(f"event-loop replay    {replay:7.2f} s   (every-bar loop {every_bar:7.2f} s)")
+
+    if workers > 1:
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_run_one, [backtester] * symbol_count, [candles[s] for s in symbols], symbols))
+        print(f"end-to-end ({workers} processes) {time.perf_counter() - start:7.2f} s")
+
+
+def _run_one(backtester, candles, symbol):
+    return backtester.run_symbol(symbol, *candles)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--symbols', type=int, default=5)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+    run(args.symbols, args.days, args.workers)
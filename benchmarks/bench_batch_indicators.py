@@ -0,0 +1,66 @@
+"""
+심볼별 DataFrame 경로와 (심볼 x 캔들) 배치 경로의 지표+신호 계산 시간 비교
+
+    python -m benchmarks.bench_batch_indicators --symbols 5 50 200
+"""
+import argparse
+import time
+import pandas as pd
+from benchmarks.synthetic import synthetic_buffer, synthetic_symbols
+from modules.batch_indicators import calculate_indicators_batch, stack_candles
+from modules.parallel_eval import evaluate_candles
+from strategies.basic_strategy import BasicStrategy
+
+
+def run(symbol_counts, bars, repeat):
+    strategy = BasicStrategy()
+    for count in symbol_counts:
+        symbols = synthetic_symbols(count)
+        buffers = [synthetic_buffer(bars, seed=i) for i in range(count)]
+        # 절반은 포지션 보유 상태로 두어 청산 조건 경로도 비교
+        positions = {symbol: {'position_amount': (i % 2) * 1.0, 'avg_price': 100.0,
+                              'entry_time': pd.Timestamp.now()}
+                     for i, symbol in enumerate(symbols)}
+
+        def per_frame():
+            return {symbol: evaluate_candles(strategy, buffer['Open time'],
+                                             buffer.values[:, buffer.start:buffer.start + len(buffer)],
+                                             positions[symbol])
+                    for symbol, buffer in zip(symbols, buffers)}
+
+        def batch():
+            indicators = calculate_indicators_batch(stack_candles(buffers))
+            return strategy.generate_signals_batch(indicators, symbols, positions)
+
+        expected, result = per_frame(), batch()
+        mismatched = [s for s in symbols if _strip(expected[s]) != _strip(result[s])]
+        assert not mismatched, f"신호 불일치: {mismatched[:5]}"
+
+        frame_time, batch_time = _best(per_frame, repeat), _best(batch, repeat)
+        print(f"symbols={count:4d}  per-frame {frame_time * 1000:9.1f} ms   "
+              f"batch {batch_time * 1000:9.1f} ms   (x{frame_time / batch_time:.1f})")
+
+
+def _strip(signals):
+    """시간 기반 사유 문구를 제외한 신호 비교용 값"""
+    if signals is None:
+        return None
+    return signals['action'], round(float(signals['price']), 8)
+
+
+def _best(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--symbols', type=int, nargs='+', default=[5, 50, 200])
+    parser.add_argument('--bars', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.symbols, args.bars, args.repeat)
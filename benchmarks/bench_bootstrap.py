@@ -0,0 +1,86 @@
+"""
+시작 시 캔들 적재 시간 비교 (REST 지연을 흉내 낸 가짜 클라이언트 사용)
+
+  legacy - 심볼 x 타임프레임마다 999개를 DataFrame 으로 받아 astype 변환, 직렬, 두 번 (__init__ + initialize_data)
+  cold   - KlineBootstrap, 로컬 저장소 없음 (병렬 요청, NumPy 직접 변환)
+  warm   - KlineBootstrap, 로컬 저장소가 몇 분 전까지 채워진 상태 (빠진 구간만 요청)
+
+    python -m benchmarks.bench_bootstrap --symbols 5 50 --latency-ms 50
+"""
+import argparse
+import tempfile
+import time
+import numpy as np
+from benchmarks.synthetic import synthetic_symbols
+from modules.bootstrap import KlineBootstrap
+from modules.candle_buffer import CandleBuffer, TIMEFRAME_MS
+from modules.data_handler import DataHandler
+from modules.persistence import KLINE_DTYPE, kline_path
+
+TIMEFRAMES = ('1m', '1h')
+
+
+class FakeRest:
+    """요청마다 latency 만큼 기다린 뒤 /fapi/v1/klines 형식의 가상 캔들을 돌려주는 클라이언트"""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def klines(self, symbol, interval, limit=500, start_time=None, end_time=None):
+        time.sleep(self.latency)
+        step = TIMEFRAME_MS[interval]
+        last = int(time.time() * 1000) // step * step
+        first = last - (limit - 1) * step if start_time is None else start_time
+        opens = range(first, min(last, first + (limit - 1) * step) + 1, step)
+        return [[t, f"{100 + t % 7:.4f}", "101.0", "99.0", "100.5", "1234.5", t + step - 1,
+                 "0", 10, "0", "0", "0"] for t in opens]
+
+
+def legacy(rest, symbols):
+    handler = DataHandler.__new__(DataHandler)
+    handler.rest = rest
+    for _ in range(2):
+        for symbol in symbols:
+            for timeframe in TIMEFRAMES:
+                CandleBuffer.from_frame(handler.load_historical_data(symbol, timeframe, save_to_file=False))
+
+
+def fill_store(data_dir, symbols, behind_bars=5):
+    """몇 캔들 전까지 채워진 로컬 저장소 생성"""
+    for symbol in symbols:
+        for timeframe in TIMEFRAMES:
+            step = TIMEFRAME_MS[timeframe]
+            last = int(time.time() * 1000) // step * step - behind_bars * step
+            records = np.zeros(1000, dtype=KLINE_DTYPE)
+            records['open_time'] = last - np.arange(999, -1, -1) * step
+            for name in ('open', 'high', 'low', 'close', 'volume'):
+                records[name] = 100.0
+            records.tofile(kline_path(symbol, timeframe, data_dir))
+
+
+def run(symbol_counts, latency_ms, workers):
+    rest = FakeRest(latency_ms / 1000)
+    for count in symbol_counts:
+        symbols = synthetic_symbols(count)
+
+        start = time.perf_counter()
+        legacy(rest, symbols)
+        legacy_time = time.perf_counter() - start
+
+        cold_stats = KlineBootstrap(rest, tempfile.mkdtemp(), workers=workers).load(symbols, TIMEFRAMES)[1]
+        warm_dir = tempfile.mkdtemp()
+        fill_store(warm_dir, symbols)
+        warm_stats = KlineBootstrap(rest, warm_dir, workers=workers).load(symbols, TIMEFRAMES)[1]
+
+        print(f"symbols={count:3d}  legacy {legacy_time:7.2f} s   cold {cold_stats['seconds']:7.2f} s "
+              f"({cold_stats['fetched_bars']} bars)   warm {warm_stats['seconds']:7.2f} s "
+              f"({warm_stats['fetched_bars']} bars)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--symbols', type=int, nargs='+', default=[5, 50])
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+    run(args.symbols, args.latency_ms, args.workers)
@@ -0,0 +1,68 @@
+"""
+로컬 거래소 시뮬레이터(modules/exchange_sim.py)에 실제 TradingBot 을 연결해 처리량/지연 시간 측정
+
+심볼 수와 틱 속도를 현재 운영(심볼 5개, depth 100ms)의 10~100배로 올려 웹소켓 수신 -> 지표 -> 신호 -> 주문
+파이프라인의 초당 처리 메시지 수와 구간별 지연 시간(utils/tracing.py)을 확인합니다.
+
+    python -m benchmarks.bench_load --symbols 50 --rate 10 --duration 30 --runtime asyncio
+"""
+import argparse
+import os
+import socket
+import threading
+import time
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run(symbol_count, rate, duration, warmup, runtime, seed):
+    # 설정 모듈이 읽기 전에 REST/웹소켓 주소와 심볼 목록을 시뮬레이터로 지정
+    port = free_port()
+    symbols = [f"SIM{i:03d}USDT" for i in range(symbol_count)]
+    os.environ.update(BINANCE_BASE_URL=f"http://127.0.0.1:{port}", BINANCE_STREAM_URL=f"ws://127.0.0.1:{port}",
+                      COIN_LIST=','.join(symbols))
+
+    from main import TradingBot
+    from modules.exchange_sim import ExchangeSimulator
+    from utils.tracing import TRACER
+
+    simulator = ExchangeSimulator(symbols, rate=rate, seed=seed)
+    simulator.start_in_thread(port=port)
+
+    start = time.perf_counter()
+    bot = TradingBot()
+    print(f"bootstrap: {time.perf_counter() - start:.2f}s ({symbol_count} symbols)")
+    threading.Thread(target=bot.run_async if runtime == 'asyncio' else bot.run, daemon=True).start()
+
+    time.sleep(warmup)
+    TRACER.reset()
+    received, sent = sum(bot.ws_manager.stream_counts.values()), simulator.stats['messages']
+    evaluated, orders = bot.evaluation_stats['evaluated'], simulator.stats['orders']
+    time.sleep(duration)
+    received = sum(bot.ws_manager.stream_counts.values()) - received
+    sent = simulator.stats['messages'] - sent
+
+    print(f"runtime={runtime}  symbols={symbol_count}  rate={rate}/s  duration={duration}s")
+    print(f"messages: sent {sent / duration:,.0f}/s, received {received / duration:,.0f}/s "
+          f"({received / max(sent, 1):.1%})")
+    print(f"evaluations: {(bot.evaluation_stats['evaluated'] - evaluated) / duration:,.1f}/s, "
+          f"orders: {simulator.stats['orders'] - orders}")
+    print(f"{'stage':22s}{'count':>10s}{'p50 ms':>10s}{'p99 ms':>10s}{'max ms':>10s}")
+    for stage, stats in TRACER.stats().items():
+        print(f"{stage:22s}{stats['count']:10d}{stats['p50']:10.3f}{stats['p99']:10.3f}{stats['max']:10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, default=50)
+    parser.add_argument('--rate', type=float, default=10.0, help="심볼당 초당 틱 수 (틱마다 kline_1m, depth)")
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--warmup', type=float, default=3.0)
+    parser.add_argument('--runtime', choices=['thread', 'asyncio'], default='thread')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    run(args.symbols, args.rate, args.duration, args.warmup, args.runtime, args.seed)
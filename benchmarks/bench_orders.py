@@ -0,0 +1,98 @@
+"""
+동시에 나온 N 개 신호의 주문 전송 완료 시간 비교 (로컬 거래소 시뮬레이터, REST 지연 흉내)
+
+  sequential - 기존 방식: 심볼 순서대로 enter_*/exit_* (청산은 취소 -> 주문, 요청마다 REST 왕복을 기다림)
+  gateway    - OrderHandler.submit_signals: 신규 주문은 batchOrders 로 묶고, 청산은 심볼별 병렬 취소 -> 주문
+
+신호의 절반은 포지션 없는 심볼의 진입(BUY/SELL), 나머지는 포지션 있는 심볼의 청산(EXIT) 입니다.
+
+    python -m benchmarks.bench_orders --signals 1 5 20 50 --latency-ms 20
+"""
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import wait
+from benchmarks.bench_load import free_port
+
+
+def make_signals(bot, symbols):
+    """앞 절반은 진입, 뒤 절반은 청산 신호 (청산 심볼은 봇 계정에 포지션을 넣어 둠)"""
+    signals = {}
+    for i, symbol in enumerate(symbols):
+        price = bot.data_handler.coin_data[symbol]['1m'].last('Close')
+        if i < len(symbols) // 2 or len(symbols) == 1:
+            signals[symbol] = {'action': 'BUY' if i % 2 == 0 else 'SELL', 'price': price}
+        else:
+            amount = bot.order_handler.calculate_order_amount(symbol)
+            bot.data_handler.account.set_position(symbol, position_amount=amount if i % 2 == 0 else -amount,
+                                                  avg_price=price)
+            signals[symbol] = {'action': 'EXIT', 'price': price}
+    return signals
+
+
+def sequential(bot, signals):
+    handler = bot.order_handler
+    for symbol, signal in signals.items():
+        amount = bot.data_handler.position(symbol)['position_amount']
+        if signal['action'] == 'BUY':
+            handler.enter_long(symbol, signal['price'])
+        elif signal['action'] == 'SELL':
+            handler.enter_short(symbol, signal['price'])
+        elif amount > 0:
+            handler.exit_long(symbol, signal['price'])
+        elif amount < 0:
+            handler.exit_short(symbol, signal['price'])
+
+
+def gateway(bot, signals):
+    futures = {symbol: request.future for symbol, request in bot.order_handler.submit_signals(signals).items()}
+    wait(futures.values())
+    return sum(future.exception() is None for future in futures.values())
+
+
+def run(counts, latency_ms, repeat):
+    port = free_port()
+    symbols = [f"SIM{i:03d}USDT" for i in range(max(counts))]
+    os.environ.update(BINANCE_BASE_URL=f"http://127.0.0.1:{port}", BINANCE_STREAM_URL=f"ws://127.0.0.1:{port}",
+                      COIN_LIST=','.join(symbols))
+
+    from main import TradingBot
+    from modules.exchange_sim import ExchangeSimulator
+    from utils.logger import init_logger
+
+    simulator = ExchangeSimulator(symbols, rate=1.0, history_bars=100, rest_latency=latency_ms / 1000)
+    simulator.start_in_thread(port=port)
+    bot = TradingBot()
+    bot.data_handler.balance_data_update()  # 주문 수량 계산용 잔고
+    init_logger(logging.WARNING)  # 주문마다 남는 INFO 로그 제외
+
+    print(f"REST latency {latency_ms:g}ms, best of {repeat}")
+    print(f"{'signals':>8s}{'sequential ms':>16s}{'gateway ms':>14s}{'speedup':>10s}{'requests':>18s}")
+    for count in counts:
+        signals = make_signals(bot, symbols[:count])
+        times, requests = {}, {}
+        for name, flush in (('sequential', sequential), ('gateway', gateway)):
+            samples = []
+            before = simulator.stats['rest_requests']
+            for _ in range(repeat):
+                start = time.perf_counter()
+                flush(bot, signals)
+                samples.append((time.perf_counter() - start) * 1000)
+            times[name] = min(samples)
+            requests[name] = (simulator.stats['rest_requests'] - before) // repeat
+        print(f"{count:8d}{times['sequential']:16.1f}{times['gateway']:14.1f}"
+              f"{times['sequential'] / times['gateway']:9.1f}x"
+              f"{requests['sequential']:9d} -> {requests['gateway']:<5d}")
+        for symbol in signals:
+            bot.data_handler.account.set_position(symbol, position_amount=0.0)
+    bot.order_handler.gateway.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--signals', type=int, nargs='+', default=[1, 5, 20, 50])
+    parser.add_argument('--latency-ms', type=float, default=20.0, help="시뮬레이터 REST 응답 지연")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.signals, args.latency_ms, args.repeat)
@@ -0,0 +1,55 @@
+"""
+심볼 수/워커 수에 따른 recompute 모드 전략 평가 1주기 시간 측정
+
+    python -m benchmarks.bench_parallel_eval --symbols 5 50 200 --workers 1 2 4 8
+"""
+import argparse
+import threading
+import time
+from benchmarks.synthetic import synthetic_buffer, synthetic_symbols
+from modules.parallel_eval import SignalEvaluator
+
+
+def run(symbol_counts, worker_counts, executors, bars, repeat):
+    position = {'position_amount': 0, 'avg_price': 0.0}
+    lock = threading.Lock()
+    for count in symbol_counts:
+        symbols = synthetic_symbols(count)
+        candles = {symbol: synthetic_buffer(bars, seed=i) for i, symbol in enumerate(symbols)}
+        positions = {symbol: position for symbol in symbols}
+
+        serial = SignalEvaluator(executor='serial')
+        expected = serial.evaluate(candles, positions, symbols, lock)
+        serial_time = _best(lambda: serial.evaluate(candles, positions, symbols, lock), repeat)
+        serial.close()
+        print(f"symbols={count:4d} serial          {serial_time * 1000:9.1f} ms")
+
+        for executor in executors:
+            for workers in worker_counts:
+                evaluator = SignalEvaluator(executor=executor, workers=workers)
+                result = evaluator.evaluate(candles, positions, symbols, lock)  # 워커 기동 포함 1회
+                assert result == expected, f"{executor}({workers}) 결과가 직렬 모드와 다름"
+                elapsed = _best(lambda: evaluator.evaluate(candles, positions, symbols, lock), repeat)
+                evaluator.close()
+                print(f"symbols={count:4d} {executor:7s} x{workers:<3d}   {elapsed * 1000:9.1f} ms"
+                      f"   (x{serial_time / elapsed:.2f})")
+
+
+def _best(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--symbols', type=int, nargs='+', default=[5, 50, 200])
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8])
+    parser.add_argument('--executors', nargs='+', default=['thread', 'process'])
+    parser.add_argument('--bars', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.symbols, args.workers, args.executors, args.bars, args.repeat)
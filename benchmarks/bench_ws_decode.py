@@ -0,0 +1,122 @@
+"""
+웹소켓 메시지 디코딩 처리량 (초당 메시지 수) 비교
+
+  before - stdlib json.loads + 필드별 float() + kline 마다 pd.to_datetime(...) + pd.Timedelta (기존 핸들러)
+  <백엔드> - modules.ws_codec 디코더 (설치된 백엔드 전부: msgspec / orjson / json)
+
+    python -m benchmarks.bench_ws_decode --messages 50000 --levels 10
+"""
+import argparse
+import json
+import random
+import time
+import pandas as pd
+from modules.ws_codec import available_backends, make_codec
+
+
+def sample_messages(count, levels, seed=0):
+    """스트림 타입별 가상 메시지 (개별 스트림 형식과 combined stream 형식)"""
+    rng = random.Random(seed)
+    klines, depths, accounts = [], [], []
+    for i in range(count):
+        price = 100 + rng.random()
+        klines.append(json.dumps({
+            "e": "kline", "E": 1_700_000_000_000 + i, "s": "XRPUSDT",
+            "k": {"t": 1_700_000_000_000 + i // 60 * 60_000, "T": 1_700_000_059_999 + i // 60 * 60_000,
+                  "s": "XRPUSDT", "i": "1m", "f": i, "L": i + 10, "o": f"{price:.4f}", "c": f"{price + 0.01:.4f}",
+                  "h": f"{price + 0.02:.4f}", "l": f"{price - 0.02:.4f}", "v": f"{rng.random() * 1e4:.1f}",
+                  "n": 10, "x": i % 60 == 59, "q": "1000.0", "V": "500.0", "Q": "500.0", "B": "0"}
+        }))
+        depths.append(json.dumps({
+            "e": "depthUpdate", "E": 1_700_000_000_000 + i, "T": 1_700_000_000_000 + i, "s": "XRPUSDT",
+            "U": 10 * i + 1, "u": 10 * i + 10, "pu": 10 * i,
+            "b": [[f"{price - 0.001 * k:.4f}", f"{rng.random() * 100:.1f}"] for k in range(levels)],
+            "a": [[f"{price + 0.001 * k:.4f}", f"{rng.random() * 100:.1f}"] for k in range(levels)],
+        }))
+        accounts.append(json.dumps({
+            "e": "ACCOUNT_UPDATE", "E": 1_700_000_000_000 + i, "T": 1_700_000_000_000 + i,
+            "a": {"m": "ORDER", "B": [{"a": "USDT", "wb": "1000.0", "cw": "1000.0", "bc": "0"}],
+                  "P": [{"s": "XRPUSDT", "pa": "10", "ep": f"{price:.4f}", "cr": "0", "up": "0.5",
+                         "mt": "cross", "iw": "0", "ps": "BOTH"}]}
+        }))
+    combined = {
+        'kline': [f'{{"stream":"xrpusdt@kline_1m","data":{m}}}' for m in klines],
+        'depth': [f'{{"stream":"xrpusdt@depth@100ms","data":{m}}}' for m in depths],
+    }
+    return {'kline': klines, 'depth': depths, 'account': accounts}, combined
+
+
+# ▼ 기존 핸들러의 파싱 경로
+def before_kline(message):
+    data = json.loads(message)
+    kline = data['k']
+    return (pd.to_datetime(kline['t'], unit='ms') + pd.Timedelta(hours=9), float(kline['o']), float(kline['h']),
+            float(kline['l']), float(kline['c']), float(kline['v']), kline['x'])
+
+
+def before_depth(message):
+    data = json.loads(message)
+    return data, float(data["b"][-1][0]), float(data["a"][-1][0])
+
+
+def before_account(message):
+    data = json.loads(message)
+    return [{'avg_price': float(pos['ep']), 'position_amount': float(pos['pa']),
+             'unrealizedProfit': float(pos['up'])} for pos in data['a']['P']]
+
+
+def throughput(func, messages):
+    start = time.perf_counter()
+    for message in messages:
+        func(message)
+    return len(messages) / (time.perf_counter() - start)
+
+
+def check(codecs, messages):
+    """백엔드별 디코딩 결과가 같은지 확인"""
+    expected = codecs['json']
+    for name, codec in codecs.items():
+        for message in messages['kline'][:100]:
+            assert codec.kline(message) == expected.kline(message), name
+        for message in messages['account'][:100]:
+            assert codec.account(message) == expected.account(message), name
+        for message in messages['depth'][:100]:
+            result, reference = codec.depth(message), expected.depth(message)
+            assert result['u'] == reference['u'] and result['pu'] == reference['pu'], name
+            assert [tuple(map(float, level)) for level in result['b']] == \
+                [tuple(map(float, level)) for level in reference['b']], name
+
+
+def run(count, levels):
+    messages, combined = sample_messages(count, levels)
+    codecs = {name: make_codec(name) for name in available_backends()}
+    check(codecs, messages)
+
+    rows = {'before': {
+        'kline': throughput(before_kline, messages['kline']),
+        'depth': throughput(before_depth, messages['depth']),
+        'account': throughput(before_account, messages['account']),
+    }}
+    for name, codec in codecs.items():
+        rows[name] = {
+            'kline': throughput(codec.kline, messages['kline']),
+            'depth': throughput(codec.depth, messages['depth']),
+            'account': throughput(codec.account, messages['account']),
+            'combined kline': throughput(lambda m: codec.kline(codec.envelope(m)[1]), combined['kline']),
+            'combined depth': throughput(lambda m: codec.depth(codec.envelope(m)[1]), combined['depth']),
+        }
+
+    print(f"messages/sec ({count} messages, depth {levels} levels per side)")
+    columns = ['kline', 'depth', 'account', 'combined kline', 'combined depth']
+    print(f"{'':10s}" + ''.join(f"{column:>16s}" for column in columns))
+    for name, row in rows.items():
+        print(f"{name:10s}" + ''.join(f"{row[column]:16,.0f}" if column in row else f"{'-':>16s}"
+                                      for column in columns))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=50_000)
+    parser.add_argument('--levels', type=int, default=10)
+    args = parser.parse_args()
+    run(args.messages, args.levels)
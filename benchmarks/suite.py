@@ -0,0 +1,355 @@
+"""
+데이터/지표/주문 경로 벤치마크 모음 (오프라인, 가상 데이터)
+
+케이스별 최소/중앙값 실행 시간과 초당 처리량을 JSON 으로 저장하고, 저장해 둔 기준 결과와 비교해
+threshold 이상 느려진 케이스가 있으면 종료 코드 1 을 돌려줍니다.
+
+    python -m benchmarks.suite --save benchmarks/results/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/results/baseline.json --threshold 0.15
+    python -m benchmarks.suite --filter ws. --repeat 7
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from types import MethodType, SimpleNamespace
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import synthetic_candles, synthetic_symbols
+from modules.account_state import AccountState
+from modules.candle_aggregator import CandleAggregator, derived_buffers
+from modules.candle_buffer import CandleBuffer
+from modules.indicator_engine import IncrementalIndicators
+from modules.order_book import LocalOrderBook
+from modules.symbol_filters import ExchangeInfoCache
+from strategies.basic_strategy import BasicStrategy
+from utils.logger import init_logger
+
+CASES = []  # (이름, 파라미터, setup) - setup(**파라미터) -> (측정할 함수, 호출당 처리 건수)
+
+
+def case(name, *param_sets):
+    """벤치마크 케이스 등록 (param_sets 마다 별도 결과)"""
+    def register(setup):
+        for params in param_sets or ({},):
+            CASES.append((name, params, setup))
+        return setup
+    return register
+
+
+def case_key(name, params):
+    return name + (f"[{','.join(f'{k}={v}' for k, v in params.items())}]" if params else "")
+
+
+def synthetic_frame(bars, seed=0):
+    """가상 캔들 DataFrame (load_historical_data 결과와 같은 컬럼)"""
+    times, values = synthetic_candles(bars, seed)
+    frame = pd.DataFrame(values.T, columns=list(CandleBuffer.COLUMNS))
+    frame.insert(0, 'Open time', pd.to_datetime(times, unit='ms') + pd.Timedelta(hours=9))
+    return frame
+
+
+def raw_klines(bars, seed=0):
+    """/fapi/v1/klines 응답 형식의 가상 캔들"""
+    times, values = synthetic_candles(bars, seed)
+    return [[int(t), *(f"{v:.6f}" for v in row), int(t) + 59_999, "0", 10, "0", "0", "0"]
+            for t, row in zip(times.tolist(), values.T.tolist())]
+
+
+def stub_data_handler(symbols, bars):
+    """웹소켓 핸들러 / trade_cycle 이 참조하는 DataHandler 상태 (REST/파일 I/O 없음, 1h 는 1분봉에서 집계)"""
+    from modules.data_handler import DataHandler
+    coin_data, aggregator = {}, CandleAggregator(('1h',))
+    indicators = IncrementalIndicators(timeframes={'1m'})
+    for i, symbol in enumerate(symbols):
+        times, values = synthetic_candles(bars, seed=i)
+        coin_data[symbol] = {'1m': CandleBuffer.from_arrays(times, values, bars),
+                             **derived_buffers(times, values, aggregator.timeframes, bars)}
+        aggregator.seed(symbol, times, values)
+        indicators.seed(symbol, '1m', coin_data[symbol]['1m'])
+    account = AccountState(symbols)
+    handler = SimpleNamespace(
+        lock=threading.RLock(), coin_data=coin_data, data_version=defaultdict(int), indicators=indicators,
+        aggregator=aggregator, account=account, position=account.position,
+        position_data=account.snapshot().positions,
+        order_books={symbol: LocalOrderBook(symbol) for symbol in symbols}, orderbook_data={},
+        writer=SimpleNamespace(submit_kline=lambda *args: None, submit_orderbook=lambda *args: None),
+        save_orderbook_data=lambda symbol: None,
+    )
+    handler.aggregate_kline = MethodType(DataHandler.aggregate_kline, handler)
+    return handler
+
+
+# ▼ 지표 / 신호
+@case('indicators.calculate_indicators', {'bars': 1_000}, {'bars': 10_000}, {'bars': 100_000})
+def _calculate_indicators(bars):
+    strategy, frame = BasicStrategy(), synthetic_frame(bars)
+    return lambda: strategy.calculate_indicators(frame.copy()), bars
+
+
+@case('signals.generate_trading_signals', {'bars': 1_000})
+def _generate_trading_signals(bars):
+    strategy = BasicStrategy()
+    indicators = strategy.calculate_indicators(synthetic_frame(bars))
+    position = {'position_amount': 0.0, 'avg_price': 0.0, 'entry_time': None}
+    return lambda: strategy.generate_trading_signals(indicators, position), 1
+
+
+@case('signals.incremental_latest', {'symbols': 200})
+def _incremental_latest(symbols):
+    strategy, names = BasicStrategy(), synthetic_symbols(symbols)
+    data_handler = stub_data_handler(names, 1_000)
+    positions = data_handler.position_data
+
+    def run():
+        for symbol in names:
+            strategy.generate_signals_from_latest(data_handler.indicators.latest(symbol, '1m'), positions[symbol])
+    return run, symbols
+
+
+# ▼ 웹소켓 핸들러
+def _ws_manager(symbols, bars=1_000):
+    from modules.ws_manager import WebSocketManager
+    manager = WebSocketManager(stub_data_handler(symbols, bars))
+    manager.register_streams(symbols)
+    return manager
+
+
+@case('ws.on_kline', {'closed': False}, {'closed': True})
+def _on_kline(closed, messages=1_000):
+    manager = _ws_manager(['BENCHUSDT'])
+    buffer = manager.data_handler.coin_data['BENCHUSDT']['1m']
+    start = buffer.last_open_time
+    template = ('{{"e":"kline","E":{event},"s":"BENCHUSDT","k":{{"t":{open_time},"o":"100.0","h":"101.0",'
+                '"l":"99.0","c":"{close:.1f}","v":"10.0","x":{closed}}}}}')
+    state = {'next': start + 60_000}
+
+    def run():
+        # closed: 메시지마다 새 캔들 확정 / 아니면 진행 중 캔들 갱신 (메시지 문자열 생성은 format 한 번)
+        for i in range(messages):
+            open_time = state['next'] if closed else start
+            if closed:
+                state['next'] += 60_000
+            manager._on_kline(None, template.format(event=open_time + 59_999, open_time=open_time,
+                                                    close=100 + i % 7 * 0.1, closed=str(closed).lower()),
+                              '1m', save_to_file=closed)
+    return run, messages
+
+
+@case('ws.on_depth', {'levels': 10})
+def _on_depth(levels, messages=1_000):
+    manager = _ws_manager(['BENCHUSDT'])
+    book = manager.data_handler.order_books['BENCHUSDT']
+    snapshot = {'lastUpdateId': 0, 'bids': [[f"{99 - i * 0.01:.2f}", "5"] for i in range(100)],
+                'asks': [[f"{101 + i * 0.01:.2f}", "5"] for i in range(100)]}
+    diffs = [json.dumps({
+        "e": "depthUpdate", "E": i, "s": "BENCHUSDT", "U": i, "u": i + 1 if i else 1, "pu": i,
+        "b": [[f"{99 - (i + k) % 100 * 0.01:.2f}", f"{(i + k) % 9}"] for k in range(levels)],
+        "a": [[f"{101 + (i + k) % 100 * 0.01:.2f}", f"{(i + k) % 9}"] for k in range(levels)]})
+        for i in range(messages)]
+
+    def run():
+        book.apply_snapshot(snapshot)
+        for message in diffs:
+            manager._on_depth(None, message)
+        assert book.last_update_id == messages and not book.resyncs
+    return run, messages
+
+
+# ▼ 파일 I/O
+@case('io.load_historical_data', {'bars': 999})
+def _load_historical_data(bars):
+    """REST 응답 -> DataFrame 변환 + 확정 캔들 저장 요청 (임시 DATA_DIR 아카이브, 디스크 기록은 writer 스레드)"""
+    from modules import data_handler
+    from modules.persistence import AsyncWriter
+    data_handler.DATA_DIR = tempfile.mkdtemp()
+    handler = data_handler.DataHandler.__new__(data_handler.DataHandler)
+    raw = raw_klines(bars)
+    handler.rest = SimpleNamespace(klines=lambda symbol, interval, limit: raw)
+    handler.writer = AsyncWriter(data_handler.DATA_DIR).start()
+
+    def run():
+        # 실패 시 None 을 돌려주므로 확인 (예외 경로를 측정하지 않도록)
+        assert handler.load_historical_data('BENCHUSDT', '1m', bars, save_to_file=True) is not None
+    return run, bars
+
+
+@case('io.load_klines_csv', {'bars': 999})
+def _load_klines_csv(bars):
+    """load_historical_data 가 저장한 CSV 읽기 (backtest.load_klines 의 CSV 경로)"""
+    from modules.backtest import load_klines
+    data_dir = tempfile.mkdtemp()
+    synthetic_frame(bars).to_csv(os.path.join(data_dir, 'klines_BENCHUSDT_1m.csv'), index=False, sep='\t')
+    return lambda: load_klines('BENCHUSDT', '1m', data_dir), bars
+
+
+@case('io.load_klines_archive', {'bars': 525_600, 'slice': 10_080})
+def _load_klines_archive(bars, slice):
+    """아카이브(1년치 1분봉)에서 일주일 구간 읽기 (backtest.load_klines 의 바이너리 경로)"""
+    from modules.backtest import load_klines
+    from modules.persistence import KLINE_DTYPE, kline_path
+    data_dir = tempfile.mkdtemp()
+    times, values = synthetic_candles(bars)
+    records = np.empty(bars, dtype=KLINE_DTYPE)
+    records['open_time'] = times
+    for i, name in enumerate(('open', 'high', 'low', 'close', 'volume')):
+        records[name] = values[i]
+    records.tofile(kline_path('BENCHUSDT', '1m', data_dir))
+    start = int(times[bars // 2])
+    end = start + slice * 60_000
+
+    def run():
+        assert len(load_klines('BENCHUSDT', '1m', data_dir, start, end)[0]) == slice
+    return run, slice
+
+
+@case('io.bootstrap_parse', {'bars': 1_500})
+def _bootstrap_parse(bars):
+    """REST 응답 -> NumPy 배열 (modules/bootstrap.py)"""
+    from modules.bootstrap import parse_klines
+    raw = raw_klines(bars)
+    return lambda: parse_klines(raw), bars
+
+
+# ▼ 주문
+@case('orders.order_params', {'symbols': 200})
+def _order_params(symbols):
+    """주문 파라미터 생성 (exchangeInfo 필터로 가격/수량 보정 + 로컬 검증)"""
+    from modules.order_handler import OrderHandler
+    names = synthetic_symbols(symbols)
+    handler = OrderHandler.__new__(OrderHandler)
+    handler.data_handler = stub_data_handler(names, 300)
+    handler.data_handler.exchange_info = ExchangeInfoCache(rest=SimpleNamespace(), path=os.devnull)
+    handler.data_handler.exchange_info.apply([{'symbol': symbol, 'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '0.0001', 'maxPrice': '100000', 'tickSize': '0.0001'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.1', 'maxQty': '1000000', 'stepSize': '0.1'},
+        {'filterType': 'MIN_NOTIONAL', 'notional': '5'}]} for symbol in names], time.time())
+    orders = [(symbol, handler.data_handler.coin_data[symbol]['1m'].last('Close') * 1.000123) for symbol in names]
+
+    def run():
+        for symbol, price in orders:
+            handler.order_params(symbol, 'BUY', 'LIMIT', 123.456789, price)
+    return run, symbols
+
+
+# ▼ 매매 주기
+@case('bot.trade_cycle', {'symbols': 5}, {'symbols': 50}, {'symbols': 200})
+def _trade_cycle(symbols):
+    """모든 심볼 캔들이 갱신된 상태의 TradingBot.trade_cycle 1회 (주문 전송 제외)"""
+    from main import TradingBot
+    names = synthetic_symbols(symbols)
+    bot = TradingBot.__new__(TradingBot)
+    bot.data_handler = stub_data_handler(names, 1_000)
+    bot.strategy = BasicStrategy()
+    bot.data_handler.indicators.timeframes = set(bot.strategy.timeframes)
+    bot.order_handler = SimpleNamespace(submit_signals=lambda signals: {})
+    bot.evaluated_versions, bot.evaluation_stats, bot.evaluator = {}, Counter(), None
+
+    def run():
+        for symbol in names:
+            bot.data_handler.data_version[(symbol, '1m')] += 1
+        bot.trade_cycle()
+    return run, symbols
+
+
+# ▼ 실행 / 비교
+def measure(fn, repeat, min_time=0.2):
+    """호출당 실행 시간 (repeat 번 측정, 측정마다 min_time 이상 걸리도록 반복 횟수 자동 조정)"""
+    fn()  # 워밍업
+    number, elapsed = 1, 0.0
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return timings
+
+
+def run_suite(name_filter=None, repeat=5, min_time=0.2):
+    results = {}
+    for name, params, setup in CASES:
+        key = case_key(name, params)
+        if name_filter and name_filter not in key:
+            continue
+        fn, ops = setup(**params)
+        timings = measure(fn, repeat, min_time)
+        best = min(timings)
+        results[key] = {'best': best, 'median': statistics.median(timings), 'ops': ops, 'ops_per_sec': ops / best}
+        print(f"{key:45s} best {best * 1000:10.3f} ms  median {results[key]['median'] * 1000:10.3f} ms  "
+              f"{results[key]['ops_per_sec']:14,.0f} ops/s", flush=True)
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'time': datetime.now(timezone.utc).isoformat(timespec='seconds'), 'commit': commit,
+        'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+        'platform': platform.platform(), 'cpus': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    기준 결과 대비 best 시간 비교
+    :return: threshold 이상 느려진 케이스 목록
+    """
+    regressions = []
+    print(f"\n{'case':45s}{'baseline ms':>14s}{'current ms':>14s}{'change':>10s}")
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            print(f"{key:45s}{'-':>14s}{result['best'] * 1000:14.3f}{'new':>10s}")
+            continue
+        change = result['best'] / reference['best'] - 1
+        flag = '  REGRESSION' if change > threshold else ''
+        print(f"{key:45s}{reference['best'] * 1000:14.3f}{result['best'] * 1000:14.3f}{change:+10.1%}{flag}")
+        if change > threshold:
+            regressions.append(key)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', default=None, help="이름에 이 문자열이 들어간 케이스만 실행")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help="측정 1회의 최소 시간 (초)")
+    parser.add_argument('--save', default=None, help="결과 JSON 저장 경로")
+    parser.add_argument('--baseline', default=None, help="비교할 기준 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=0.15, help="회귀로 판단할 느려짐 비율")
+    args = parser.parse_args()
+    init_logger(logging.WARNING)  # 측정 중 파일 저장 등 INFO 로그 생략
+
+    results = run_suite(args.filter, args.repeat, args.min_time)
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or '.', exist_ok=True)
+        with open(args.save, 'w') as fp:
+            json.dump({'environment': environment(), 'results': results}, fp, indent=2)
+    if args.baseline:
+        with open(args.baseline) as fp:
+            regressions = compare(results, json.load(fp)['results'], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)}개 케이스가 {args.threshold:.0%} 이상 느려짐: {', '.join(regressions)}")
+            sys.exit(1)
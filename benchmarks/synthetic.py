@@ -0,0 +1,31 @@
+import numpy as np
+from modules.candle_buffer import CandleBuffer
+
+
+def synthetic_candles(bars, seed=0, start_ms=1_700_000_000_000, interval_ms=60_000):
+    """
+    랜덤워크 기반 가상 OHLCV 배열 (오프라인 벤치마크용)
+    :return: (open time int64[bars], OHLCV float64[5, bars])
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.001, bars)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.gamma(2.0, 500.0, bars)
+    times = start_ms + np.arange(bars, dtype=np.int64) * interval_ms
+    return times, np.stack([open_, high, low, close, volume])
+
+
+def synthetic_buffer(bars, seed=0, capacity=None):
+    """가상 캔들로 채운 CandleBuffer"""
+    times, values = synthetic_candles(bars, seed)
+    buffer = CandleBuffer(capacity or bars)
+    for t, row in zip(times.tolist(), values.T.tolist()):
+        buffer.append(t, *row)
+    return buffer
+
+
+def synthetic_symbols(count):
+    return [f"SYN{i:03d}USDT" for i in range(count)]
@@ -9,14 +9,77 @@ API_KEY = os.getenv("BINANCE_API_KEY")
 SECRET_KEY = os.getenv("BINANCE_SECRET_KEY")
 
 # 거래 설정
-COIN_LIST = ['XRPUSDT','DOGEUSDT','HBARUSDT','ADAUSDT','WIFUSDT']
+COIN_LIST = os.getenv("COIN_LIST", "XRPUSDT,DOGEUSDT,HBARUSDT,ADAUSDT,WIFUSDT").split(',')  # 쉼표 구분 (시뮬레이터 부하 테스트 시 변경)
 TRADE_RATE = 0.2
 TARGET_LEVERAGE = 5
 INTERVAL = "1m"
+RUNTIME = "thread"  # "thread": 웹소켓 스레드 + 1초 폴링 루프, "asyncio": 이벤트 기반 asyncio 런타임
+
+# 전략 평가 설정
+EVALUATION_MODE = "incremental"  # "incremental": 증분 지표, "recompute": 심볼별 전체 재계산, "batch": 전 심볼 배열 일괄 계산
+EVALUATION_EXECUTOR = "process"  # recompute 모드 실행기: "serial", "thread", "process"
+EVALUATION_WORKERS = None        # 병렬 워커 수 (None 이면 CPU 코어 수)
 KST = timezone(timedelta(hours=9))
-BASE_URL = "https://fapi.binance.com"
+BASE_URL = os.getenv("BINANCE_BASE_URL", "https://fapi.binance.com")        # REST (로컬 시뮬레이터: http://127.0.0.1:8765)
+STREAM_URL = os.getenv("BINANCE_STREAM_URL", "wss://fstream.binance.com")  # 웹소켓 (로컬 시뮬레이터: ws://127.0.0.1:8765)
+
+# REST 설정 (modules/rest_client.py)
+REST_POOL_SIZE = 10           # keep-alive 연결 풀 크기
+REST_TIMEOUT = 10             # 요청 타임아웃 (초)
+REST_WEIGHT_LIMIT = 2400      # 분당 IP weight 한도 (거래소 REQUEST_WEIGHT)
+REST_ORDER_LIMIT_10S = 300    # 10초당 주문 수 한도
+REST_ORDER_LIMIT_1M = 1200    # 분당 주문 수 한도
+
+# 주문 전송 (modules/order_gateway.py)
+ORDER_WORKERS = 8       # 심볼별 취소/주문을 동시에 보내는 스레드 수 (REST_POOL_SIZE 이하 권장)
+ORDER_BATCH_SIZE = 5    # batchOrders 요청 하나에 묶는 신규 주문 수 (거래소 최대 5, 1 이면 묶지 않음)
+
+# 유저 데이터 스트림 (modules/ws_manager.py, modules/async_runtime.py)
+LISTEN_KEY_KEEPALIVE = 1800  # listen key 연장 주기 (초, 연장하지 않으면 60분 후 만료)
+
+# 심볼별 거래 규칙 캐시 (modules/symbol_filters.py)
+EXCHANGE_INFO_TTL = 24 * 3600    # 로컬 파일(DATA_DIR/exchange_info.json)을 다시 받지 않고 쓰는 시간 (초)
+EXCHANGE_INFO_REFRESH = 3600     # 실행 중 exchangeInfo 재조회 주기 (초)
+
+# 시작 시 캔들 적재 설정 (modules/bootstrap.py)
+BOOTSTRAP_WORKERS = 8             # 심볼/타임프레임별 병렬 요청 수 (rate limit 은 REST 클라이언트가 관리)
+BOOTSTRAP_MAX_FILL_BARS = 50_000  # 로컬 저장소 이후 이어 받을 최대 캔들 수 (넘으면 최근 구간만 새로 받음)
+BOOTSTRAP_HISTORY_BARS = 60_000   # 상위 타임프레임 집계용으로 로컬 저장소에서 읽는 1분봉 수 (1h 1000개 분량)
+
+# 1분봉 스트림에서 집계하는 상위 타임프레임 (modules/candle_aggregator.py, 예: ('5m', '15m', '1h', '4h'))
+# 캔들은 1분봉만 구독/백필하고 상위 타임프레임은 별도 스트림이나 REST 요청 없이 만듭니다.
+DERIVED_TIMEFRAMES = ('1h',)
+
+# 웹소켓 설정
+WS_COMBINED_STREAMS = True       # True: 모든 심볼/스트림을 /stream?streams= 연결로 다중화
+WS_STREAMS_PER_CONNECTION = 200  # combined stream 연결당 최대 스트림 수 (거래소 제한)
+WS_JSON_BACKEND = "auto"         # 메시지 디코더: "auto" (msgspec > orjson > json), "msgspec", "orjson", "json"
+
+# 오더북 설정 (REST 스냅샷 + @depth 차분 스트림으로 로컬 오더북 유지)
+ORDERBOOK_UPDATE_SPEED = "100ms"  # 차분 스트림 주기: "100ms", "250ms", "500ms"
+ORDERBOOK_SNAPSHOT_LIMIT = 1000   # REST 스냅샷 호가 개수
+ORDER_PRICE_SOURCE = "signal"     # 지정가 주문 가격: "signal": 전략 신호 가격, "book": 로컬 오더북 최우선 호가
+
+# 백테스트 설정 (modules/backtest.py)
+BACKTEST_INITIAL_BALANCE = 1000.0  # 심볼별 시작 잔고 (USDT)
+BACKTEST_MAKER_FEE = 0.0002        # 지정가 대기 체결 수수료율
+BACKTEST_TAKER_FEE = 0.0005        # 즉시 체결(시장가성) 수수료율
 
 # 파일 경로
 BALANCE_LOG = "my_bot/logs/balance_log.txt"
 TRADE_LOG = "my_bot/logs/trade_log.txt"
-DATA_DIR = "my_bot/data"
\ No newline at end of file
+DATA_DIR = "my_bot/data"
+
+# 저장 설정 (웹소켓 데이터는 백그라운드 writer 가 모아서 기록)
+PERSIST_FLUSH_INTERVAL = 1.0  # 배치 저장 주기 (초)
+PERSIST_FSYNC = False         # 배치마다 fsync 여부 (True: 전원 장애에도 안전, 대신 느림)
+
+# 로그 설정 (utils/logger.py, 백그라운드 스레드에서 콘솔/JSON 파일 기록)
+LOG_LEVEL = "INFO"               # "DEBUG" 면 오더북/캔들 스트림 샘플링 로그 출력
+LOG_MAX_BYTES = 10 * 1024 * 1024  # 로그 파일 회전 크기
+LOG_BACKUP_COUNT = 5             # 보관할 이전 로그 파일 수
+LOG_SAMPLE_INTERVAL = 1.0        # 고빈도 스트림 로그를 키(심볼/스트림)별로 남기는 최소 간격 (초)
+
+# 지연 시간 추적 설정 (utils/tracing.py, 틱 -> 주문 구간별 히스토그램)
+TRACE_ENABLED = True       # 단계별 시각 기록 여부 (고정 버킷이라 운영 중에도 켜 둘 수 있음)
+TRACE_LOG_INTERVAL = 300   # 구간별 p50/p99/max 로그 주기 (초)
@@ -1,11 +1,16 @@
-from config.settings import COIN_LIST
+from config.settings import RUNTIME, EVALUATION_MODE, EVALUATION_EXECUTOR, EVALUATION_WORKERS, TRACE_LOG_INTERVAL, \
+    EXCHANGE_INFO_REFRESH
 from modules.data_handler import DataHandler
 from modules.order_handler import OrderHandler
 from strategies.basic_strategy import BasicStrategy
 from modules.ws_manager import WebSocketManager
+from modules.parallel_eval import SignalEvaluator
+from modules.batch_indicators import calculate_indicators_batch, stack_candles
 from utils.time_sync import TimeSync
-from utils.logger import init_logger,log_balance
+from utils.logger import init_logger,logger
+from utils.tracing import TRACER
 import schedule
+from collections import Counter
 import time
 
 class TradingBot:
@@ -16,6 +21,15 @@ class TradingBot:
         self.ws_manager  = WebSocketManager(self.data_handler)
         self.order_handler  = OrderHandler(self.data_handler)
         self.strategy = BasicStrategy()
+        self.strategy.trade_history = self.data_handler.orders.trade_history  # 계정 스트림 체결로 기록되는 거래
+        # 전략이 쓰는 타임프레임만 지표 계산, 캔들 버전이 바뀐 심볼만 평가
+        self.data_handler.indicators.timeframes = set(self.strategy.timeframes)
+        self.evaluated_versions = {}
+        self.evaluation_stats = Counter()
+        # recompute 모드: 심볼별 전체 지표 재계산을 병렬 실행
+        self.evaluator = None
+        if EVALUATION_MODE == "recompute":
+            self.evaluator = SignalEvaluator(self.strategy, EVALUATION_EXECUTOR, EVALUATION_WORKERS)
         init_logger()
 
     def run(self):
@@ -25,12 +39,17 @@ class TradingBot:
         schedule.every(1).hour.at(":01").do(
             lambda: self.time_sync.check_time_diff()
         )
+        schedule.every(1).hour.do(self.log_evaluation_stats)
+        schedule.every(1).hour.do(self.log_performance)
+        schedule.every(1).hour.do(self.log_rest_stats)
+        schedule.every(TRACE_LOG_INTERVAL).seconds.do(TRACER.log_summary)  # 틱 -> 주문 구간별 지연 시간
+        self.data_handler.exchange_info.start_refresh(EXCHANGE_INFO_REFRESH)  # 백그라운드 스레드에서 재조회
 
         self.check_balance()
         self.check_positions()
 
         self.ws_manager.start_account_websocket()  # 계정 업데이트
-        self.ws_manager.start_coin_websockets()    # 코인별 3개 웹소켓
+        self.ws_manager.start_coin_websockets()    # 코인별 3개 스트림 (기본: combined stream 다중화)
 
         # 기존 스케줄러 설정 유지
         # schedule.every(1).hour.do(self.check_balance)
@@ -43,43 +62,95 @@ class TradingBot:
             time.sleep(1)
 
     def trade_cycle(self):
-        """매매 주기 실행"""
-        for symbol in self.data_handler.coin_data.keys():
-            # 데이터 가져오기
-            df_1m = self.data_handler.coin_data[symbol]['1m']
-            df_1h = self.data_handler.coin_data[symbol]['1h']
-            
-            # 지표 계산
-            df_1m = self.strategy.calculate_indicators(df_1m)
-            df_1h = self.strategy.calculate_indicators(df_1h)
-            
-            # 매매 신호 생성
-            position = self.data_handler.position_data[symbol]
-            signals = self.strategy.generate_trading_signals(df_1m, position)
-            
-            # 신호에 따라 매매 실행
-            if signals['action'] == 'BUY':
-                self.order_handler.enter_long(symbol, signals['price'])
-            elif signals['action'] == 'SELL':
-                self.order_handler.enter_short(symbol, signals['price'])
-            elif signals['action'] == 'EXIT':
-                if position['position_amount'] > 0:
-                    self.order_handler.exit_long(symbol, signals['price'])
-                elif position['position_amount'] < 0:
-                    self.order_handler.exit_short(symbol, signals['price'])
-
-
-    # 기존 position_check 기능 유지
+        """
+        매매 주기 실행 (마지막 평가 이후 캔들이 갱신된 심볼만)
+        :return: 심볼 -> OrderRequest (OrderHandler.submit_signals, future: 접수 응답, fill: 체결/취소 결과)
+        """
+        symbols = []
+        for symbol in list(self.data_handler.coin_data):
+            version = tuple(self.data_handler.data_version[(symbol, timeframe)]
+                            for timeframe in self.strategy.timeframes)
+            if self.evaluated_versions.get(symbol) == version:
+                self.evaluation_stats['skipped'] += 1
+                continue
+            self.evaluated_versions[symbol] = version
+            self.evaluation_stats['evaluated'] += 1
+            symbols.append(symbol)
+
+        positions = self.data_handler.position_data  # 이번 주기 동안 같은 포지션 스냅샷으로 평가
+        if self.evaluator is not None:
+            results = self.evaluator.evaluate(
+                {symbol: self.data_handler.coin_data[symbol]['1m'] for symbol in symbols},
+                positions, symbols, self.data_handler.lock
+            )
+        elif EVALUATION_MODE == "batch" and symbols:
+            # 전 심볼 캔들을 (심볼 x 캔들) 배열로 쌓아 지표/신호를 한 번에 계산
+            with self.data_handler.lock:
+                candles = stack_candles([self.data_handler.coin_data[symbol]['1m'] for symbol in symbols])
+            indicators = calculate_indicators_batch(candles)
+            results = self.strategy.generate_signals_batch(indicators, symbols, positions)
+        else:
+            results = {symbol: self.generate_signals(symbol, positions[symbol]) for symbol in symbols}
+
+        for symbol in symbols:
+            TRACER.decision(symbol)
+
+        # 주문은 심볼별로 동시에 전송 (신규 주문은 batchOrders 로 묶고, 응답은 기다리지 않음)
+        return self.order_handler.submit_signals({symbol: results[symbol] for symbol in symbols})
+
+    def generate_signals(self, symbol, position=None):
+        """
+        심볼 하나의 매매 신호 생성 (지표 워밍업 전이면 None)
+        :param position: 평가에 쓸 포지션 (없으면 현재 포지션)
+        """
+        # 지표 가져오기 (웹소켓 수신 시 증분 계산된 최신 값)
+        latest_1m = self.data_handler.indicators.latest(symbol, '1m')
+        if latest_1m is None:
+            return None  # 지표 워밍업 전
+
+        # 매매 신호 생성
+        if position is None:
+            position = self.data_handler.position(symbol)
+        return self.strategy.generate_signals_from_latest(latest_1m, position)
+
+    def log_evaluation_stats(self):
+        """전략 평가 실행/생략 횟수 로그"""
+        logger.info(f"전략 평가: 실행 {self.evaluation_stats['evaluated']}회, "
+                    f"생략 {self.evaluation_stats['skipped']}회 (데이터 변경 없음)")
+
+    def log_performance(self):
+        """계정 스트림 체결로 기록된 거래의 전략 성과 로그"""
+        metrics = self.strategy.performance_metrics()
+        if metrics:
+            logger.info(f"전략 성과: 거래 {metrics['total_trades']}회, 승률 {metrics['win_rate']:.1%}, "
+                        f"profit factor {metrics['profit_factor']:.2f}, 최대 낙폭 {metrics['max_drawdown']:.4f}")
+
+    def log_rest_stats(self):
+        """REST 엔드포인트별 지연 시간 / rate limit 대기 로그"""
+        rest = self.data_handler.rest
+        for endpoint, stats in rest.latency_stats().items():
+            logger.info(f"REST {endpoint}: {stats['count']}회, p50 {stats['p50']:.1f}ms, "
+                        f"p99 {stats['p99']:.1f}ms, max {stats['max']:.1f}ms")
+        logger.info(f"REST rate limit 대기: {rest.limiter.waits}회")
+
+    # 기존 position_check 기능 유지 (전체 포지션 1회 조회, 레버리지는 다른 심볼만 변경)
     def check_positions(self):
-        for symbol in COIN_LIST:
-            self.data_handler.position_data_update(symbol)
-            self.order_handler.set_leverage(symbol)
+        positions = self.data_handler.refresh_positions()
+        changed = self.order_handler.sync_leverage(positions)
+        logger.info(f"포지션 갱신: {len(positions)}개 심볼, 레버리지 변경 {changed or '없음'}")
 
     # 기존 balance check 로직 유지
     def check_balance(self):
-        balance = self.data_handler.balance_data_update()
-        log_balance(f"잔고 정보: {balance}")        # ... [기존 잔고 처리 로직] ...
+        self.data_handler.balance_data_update()  # 잔고 로그는 balance_data_update 에서 기록
+
+    def run_async(self):
+        """asyncio 런타임으로 실행 (웹소켓/스케줄/전략 평가를 이벤트 루프 하나에서 처리)"""
+        from modules.async_runtime import AsyncRuntime
+        AsyncRuntime(self).run()
 
 if __name__ == "__main__":
     bot = TradingBot()
-    bot.run()
\ No newline at end of file
+    if RUNTIME == "asyncio":
+        bot.run_async()
+    else:
+        bot.run()
\ No newline at end of file
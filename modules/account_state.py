@@ -0,0 +1,179 @@
+import threading
+from datetime import datetime
+from types import MappingProxyType
+
+
+class _Record:
+    """
+    __slots__ 기반 불변 레코드 (기존 dict 와 같이 record['필드'] / get() 으로도 읽기 가능)
+    값을 바꿀 때는 replace() 로 새 레코드를 만들어 교체하므로 읽는 쪽은 락 없이 일관된 값을 봅니다.
+    """
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name, self.DEFAULTS.get(name)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} 는 불변입니다 (replace() 사용)")
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def keys(self):
+        return self.__slots__
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.__slots__]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def replace(self, **changes):
+        return type(self)(**{**self.to_dict(), **changes})
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.items() == other.items()
+
+    def __reduce__(self):  # 프로세스 풀로 넘길 때 (SignalEvaluator)
+        return _restore, (type(self), self.to_dict())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.items())})"
+
+
+def _restore(cls, fields):
+    return cls(**fields)
+
+
+class Position(_Record):
+    """
+    심볼 하나의 포지션 (기존 position_data[symbol] dict 의 키와 같은 필드)
+    entry_time: 포지션을 연 시각 (로컬 naive datetime, 포지션 없으면 None)
+    """
+    __slots__ = ('avg_price', 'position_amount', 'leverage', 'unrealizedProfit', 'breakeven_price', 'entry_time')
+    DEFAULTS = {'avg_price': 0.0, 'position_amount': 0.0, 'leverage': 0, 'unrealizedProfit': 0.0,
+                'breakeven_price': 0.0}
+
+
+class Balance(_Record):
+    """계좌 잔고 (기존 balance_data dict 의 키와 같은 필드, USDT)"""
+    __slots__ = ('wallet', 'total', 'free', 'used', 'PNL')
+    DEFAULTS = {'wallet': 0.0, 'total': 0.0, 'free': 0.0, 'used': 0.0, 'PNL': 0.0}
+
+
+class Order(_Record):
+    """
+    미체결 주문 하나 (ORDER_TRADE_UPDATE 또는 /fapi/v1/openOrders 응답)
+    filled: 누적 체결 수량, update_time: 마지막 이벤트 시각 (epoch ms)
+    """
+    __slots__ = ('order_id', 'client_order_id', 'symbol', 'side', 'type', 'status', 'price', 'quantity', 'filled',
+                 'reduce_only', 'update_time')
+    DEFAULTS = {'price': 0.0, 'quantity': 0.0, 'filled': 0.0, 'reduce_only': False, 'update_time': 0}
+
+
+class AccountSnapshot:
+    """특정 시점의 전 심볼 포지션 + 잔고 (읽기 전용)"""
+    __slots__ = ('version', 'positions', 'balance')
+
+    def __init__(self, version, positions, balance):
+        self.version = version
+        self.positions = positions  # 심볼 -> Position (MappingProxyType)
+        self.balance = balance
+
+
+class AccountState:
+    """
+    포지션/잔고 상태 저장소 (웹소켓 ACCOUNT_UPDATE, positionRisk/account REST 응답이 기록)
+
+    레코드는 불변이라 쓰기는 새 레코드 하나를 만들어 심볼 자리에 넣는 것으로 끝나고 (O(1)),
+    읽는 쪽(trade_cycle, OrderHandler)은 락 없이 position(symbol) 로 일관된 레코드를 얻습니다.
+    여러 심볼을 한 번에 바꾸는 쓰기는 심볼 -> 레코드 dict 를 복사해 통째로 교체(copy-on-write)하므로
+    snapshot() 이 일부 심볼만 반영된 상태를 보지 않습니다. snapshot() 은 version 이 바뀐 경우에만 새로 만듭니다.
+    쓰기끼리는 write_lock 으로 직렬화합니다 (캔들/오더북 갱신에 쓰는 DataHandler.lock 과 별개).
+    """
+
+    def __init__(self, symbols=()):
+        self.write_lock = threading.Lock()
+        self._positions = {symbol: Position() for symbol in symbols}
+        self._balance = Balance()
+        self.version = 0
+        self._snapshot = AccountSnapshot(-1, MappingProxyType({}), self._balance)
+
+    def __contains__(self, symbol):
+        return symbol in self._positions
+
+    def position(self, symbol):
+        """심볼의 현재 포지션 (없는 심볼이면 KeyError)"""
+        return self._positions[symbol]
+
+    @property
+    def balance(self):
+        return self._balance
+
+    def snapshot(self):
+        """전 심볼 포지션 + 잔고의 일관된 스냅샷 (변경이 없으면 이전 스냅샷 재사용)"""
+        snapshot = self._snapshot
+        if snapshot.version != self.version:
+            with self.write_lock:
+                snapshot = self._snapshot = AccountSnapshot(self.version, MappingProxyType(dict(self._positions)),
+                                                            self._balance)
+        return snapshot
+
+    @staticmethod
+    def _merge(old, fields, time_ms=None):
+        """
+        old 포지션에 fields 반영 (없는 필드는 유지: 예를 들어 breakeven_price 가 없는 이벤트도 기존 값 보존)
+        수량이 0 에서 바뀌면 entry_time 을 time_ms (없으면 현재 시각) 로, 0 이 되면 None 으로 설정합니다.
+        """
+        new = old.replace(**fields)
+        if new.position_amount == 0:
+            if new.entry_time is not None:
+                new = new.replace(entry_time=None)
+        elif old.position_amount == 0 or new.entry_time is None:
+            opened = datetime.fromtimestamp(time_ms / 1000) if time_ms else datetime.now()
+            new = new.replace(entry_time=opened)
+        return new
+
+    def set_position(self, symbol, time_ms=None, **fields):
+        """심볼 하나의 포지션 필드 갱신 :return: 새 Position"""
+        with self.write_lock:
+            position = self._positions[symbol] = self._merge(self._positions.get(symbol, Position()), fields, time_ms)
+            self.version += 1
+        return position
+
+    def apply_positions(self, updates, time_ms=None, times=None):
+        """
+        여러 심볼 포지션을 한 번에 갱신 (copy-on-write, 추적 중인 심볼만)
+        :param updates: 심볼 -> 바꿀 필드 dict
+        :param time_ms: 새로 열린 포지션의 entry_time (epoch ms, 없으면 현재 시각)
+        :param times: 심볼 -> entry_time 용 시각 (심볼마다 다를 때, 예: positionRisk updateTime)
+        :return: 심볼 -> 새 Position
+        """
+        times = times or {}
+        with self.write_lock:
+            positions = dict(self._positions)
+            changed = {symbol: self._merge(positions[symbol], fields, times.get(symbol, time_ms))
+                       for symbol, fields in updates.items() if symbol in positions}
+            positions.update(changed)
+            self._positions = positions
+            self.version += 1
+        return changed
+
+    def set_balance(self, **fields):
+        with self.write_lock:
+            self._balance = self._balance.replace(**fields)
+            self.version += 1
+        return self._balance
+
+    def add_symbol(self, symbol):
+        with self.write_lock:
+            if symbol not in self._positions:
+                self._positions = {**self._positions, symbol: Position()}
+                self.version += 1
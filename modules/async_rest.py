@@ -0,0 +1,85 @@
+import asyncio
+import time
+from collections import defaultdict
+import aiohttp
+from config.settings import API_KEY, SECRET_KEY, BASE_URL
+from modules.rest_client import LIMITER, RequestSigner, RestAPIError, request_costs
+from utils.latency import LatencyHistogram
+
+
+class AsyncRestClient:
+    """
+    aiohttp 기반 비동기 Binance Futures REST 클라이언트 (async with 로 세션 관리)
+    서명, rate limit(WeightLimiter), 지연 시간 히스토그램은 동기 RestClient 와 같은 구성을 씁니다.
+    """
+
+    def __init__(self, base_url=BASE_URL, limiter=None):
+        self.base_url = base_url
+        self.signer = RequestSigner(SECRET_KEY or '')
+        self.limiter = limiter or LIMITER
+        self.latency = defaultdict(LatencyHistogram)
+        self.session = None
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(headers={"X-MBX-APIKEY": API_KEY or ''})
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def request(self, method, path, params=None, signed=False):
+        """
+        REST 요청
+        :param signed: True 면 timestamp/signature 추가
+        :return: JSON 응답
+        """
+        wait = self.limiter.reserve(request_costs(method, path, params))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        query = self.signer.query(params, signed)
+        url = f"{self.base_url}{path}?{query}" if query else f"{self.base_url}{path}"
+
+        start = time.perf_counter()
+        async with self.session.request(method, url) as response:
+            data = await response.json(content_type=None)
+            self.latency[f"{method} {path}"].record((time.perf_counter() - start) * 1000)
+            self.limiter.update(response.headers, response.status)
+            if response.status != 200:
+                raise RestAPIError(response.status, data)
+            return data
+
+    def latency_stats(self):
+        """엔드포인트별 지연 시간 요약 (ms)"""
+        return {endpoint: histogram.summary() for endpoint, histogram in self.latency.items()}
+
+    async def server_time(self):
+        return (await self.request('GET', '/fapi/v1/time'))['serverTime']
+
+    async def exchange_info(self):
+        return await self.request('GET', '/fapi/v1/exchangeInfo')
+
+    async def account(self):
+        return await self.request('GET', '/fapi/v2/account', signed=True)
+
+    async def position_risk(self, symbol=None):
+        """포지션 정보 (symbol 이 없으면 전체 심볼)"""
+        return await self.request('GET', '/fapi/v2/positionRisk', {'symbol': symbol}, signed=True)
+
+    async def open_orders(self, symbol=None):
+        """미체결 주문 (symbol 이 없으면 전체 심볼)"""
+        return await self.request('GET', '/fapi/v1/openOrders', {'symbol': symbol}, signed=True)
+
+    async def change_leverage(self, symbol, leverage):
+        return await self.request('POST', '/fapi/v1/leverage', {'symbol': symbol, 'leverage': leverage}, signed=True)
+
+    async def create_order(self, params):
+        return await self.request('POST', '/fapi/v1/order', params, signed=True)
+
+    async def cancel_all_orders(self, symbol):
+        return await self.request('DELETE', '/fapi/v1/allOpenOrders', {'symbol': symbol}, signed=True)
+
+    async def new_listen_key(self):
+        return (await self.request('POST', '/fapi/v1/listenKey'))['listenKey']
+
+    async def keepalive_listen_key(self):
+        return await self.request('PUT', '/fapi/v1/listenKey')
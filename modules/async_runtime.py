@@ -0,0 +1,188 @@
+import asyncio
+import time
+import aiohttp
+from config.settings import TARGET_LEVERAGE, TRACE_LOG_INTERVAL, EXCHANGE_INFO_REFRESH, LISTEN_KEY_KEEPALIVE
+from modules.async_rest import AsyncRestClient, RestAPIError
+from modules.symbol_filters import OrderValidationError
+from modules.ws_manager import CombinedConnection, STREAM_BASE_URL
+from utils.logger import logger, log_trade
+from utils.tracing import TRACER, stamp
+
+
+class AsyncRuntime:
+    """
+    asyncio 이벤트 루프 하나로 돌아가는 TradingBot 런타임
+
+    TradingBot.run 의 (스트림별 스레드 + 1초 sleep 폴링) 대신, 웹소켓 수신, 주기 작업
+    (시간 체크, 잔고 갱신), 전략 평가를 같은 루프에서 처리합니다. 포지션/주문 상태는 계정 스트림
+    이벤트로 유지하고, REST 조회는 계정 스트림이 (재)연결될 때 한 번만 합니다.
+    전략은 사용하는 타임프레임의 캔들 메시지가 들어온 심볼만 즉시 평가되고, 주문은 비동기
+    REST 요청으로 보내므로 신호 → 주문 지연이 sleep 주기가 아닌 처리 시간으로 결정됩니다.
+    """
+    TIME_CHECK_INTERVAL = 3600  # 서버-로컬 시간 차이 체크 주기 (초)
+    BALANCE_INTERVAL = 3600     # 잔고 갱신 주기 (초)
+    RECONNECT_DELAY = 5         # 웹소켓 재연결 대기 (초)
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.data_handler = bot.data_handler
+        self.ws_manager = bot.ws_manager
+        self.order_handler = bot.order_handler
+        self.rest = None
+        self.pending_orders = set()  # 주문 요청이 진행 중인 심볼 (중복 주문 방지)
+
+    def run(self):
+        asyncio.run(self.main())
+
+    async def main(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.bot.time_sync.sync_system_time)
+
+        async with AsyncRestClient() as rest:
+            self.rest = rest
+            await self.refresh_balance()
+            await self.refresh_positions(set_leverage=True)
+
+            tasks = [
+                self._account_reader(),
+                self._every(self.TIME_CHECK_INTERVAL, self.check_time),
+                self._every(self.BALANCE_INTERVAL, self.refresh_balance),
+                self._every(TRACE_LOG_INTERVAL, self.log_latency),
+                self._every(EXCHANGE_INFO_REFRESH, self.refresh_exchange_info),
+            ]
+            for streams in self.ws_manager.register_streams(list(self.data_handler.coin_data)):
+                tasks.append(self._market_reader(CombinedConnection(streams).url))
+            await asyncio.gather(*tasks)
+
+    # ▼ 주기 작업
+    async def _every(self, interval, job):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await job()
+            except Exception as e:
+                logger.error(f"주기 작업 실패 ({job.__name__}): {e}")
+
+    async def log_latency(self):
+        TRACER.log_summary()
+
+    async def check_time(self):
+        server_time = await self.rest.server_time()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.bot.time_sync.check_time_diff, server_time)
+
+    async def refresh_exchange_info(self):
+        info = await self.rest.exchange_info()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.data_handler.exchange_info.refresh, info)  # 파일 저장 포함
+
+    async def refresh_balance(self):
+        account = await self.rest.account()
+        self.data_handler.balance_data_update(balance=account)
+
+    async def refresh_positions(self, set_leverage=False):
+        """전체 포지션을 한 번에 조회해 반영 (set_leverage 면 목표 레버리지와 다른 심볼만 변경)"""
+        positions = self.data_handler.apply_position_risks(await self.rest.position_risk())
+        if not set_leverage:
+            return
+        for symbol, position in positions.items():
+            if position['leverage'] != TARGET_LEVERAGE:
+                try:
+                    await self.rest.change_leverage(symbol, TARGET_LEVERAGE)
+                    self.data_handler.account.set_position(symbol, leverage=TARGET_LEVERAGE)
+                except RestAPIError as e:
+                    logger.error(f"{symbol} 레버리지 설정 실패: {e}")
+
+    # ▼ 웹소켓 수신
+    async def _read_websocket(self, url, on_message, on_open=None):
+        """
+        재연결을 포함한 웹소켓 수신 루프
+        :param url: 주소 또는 연결마다 주소를 만드는 코루틴 함수
+        :param on_open: 연결 직후 실행할 코루틴 함수 (그동안 도착한 메시지는 끝난 뒤 순서대로 처리)
+        핸들러 예외는 메시지 하나만 버리고 수신을 계속합니다 (재연결하면 같은 연결의 다른 심볼 메시지도 잃음).
+        """
+        while True:
+            try:
+                async with self.rest.session.ws_connect(await url() if callable(url) else url, heartbeat=60) as ws:
+                    if on_open is not None:
+                        await on_open()
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            try:
+                                on_message(msg.data)
+                            except Exception as e:
+                                logger.error(f"웹소켓 메시지 처리 오류: {e}")
+                        elif msg.type == aiohttp.WSMsgType.ERROR:
+                            break
+            except Exception as e:
+                logger.error(f"웹소켓 연결 실패: {e}")
+            logger.warning(f"웹소켓 연결 종료, {self.RECONNECT_DELAY}초 후 재연결")
+            await asyncio.sleep(self.RECONNECT_DELAY)
+
+    async def _market_reader(self, url):
+        await self._read_websocket(url, self.on_market_message)
+
+    async def _account_reader(self):
+        keepalive = asyncio.create_task(self._every(LISTEN_KEY_KEEPALIVE, self.rest.keepalive_listen_key))
+        try:
+            await self._read_websocket(
+                self._account_url,
+                lambda message: self.ws_manager._on_account_update(None, message),
+                on_open=self.reconcile_orders
+            )
+        finally:
+            keepalive.cancel()
+
+    async def _account_url(self):
+        """연결마다 listen key 발급 (유효한 키가 있으면 같은 키, 만료됐으면 새 키)"""
+        return f"{STREAM_BASE_URL}/ws/{await self.rest.new_listen_key()}"
+
+    async def reconcile_orders(self):
+        """계정 스트림 (재)연결 시 포지션/미체결 주문 대조 (끊긴 동안 놓친 이벤트 보정)"""
+        try:
+            positions, open_orders = await asyncio.gather(self.rest.position_risk(), self.rest.open_orders())
+        except RestAPIError as e:
+            logger.error(f"주문/포지션 대조 실패: {e}")
+            return
+        self.data_handler.reconcile_orders(open_orders, positions)
+
+    def on_market_message(self, message):
+        """시장 데이터 반영 후, 캔들 이벤트면 해당 심볼 전략 평가 (1분봉 하나로 모든 타임프레임이 갱신됨)"""
+        stream = self.ws_manager.dispatch_stream(message, stamp())
+        if stream is None or '@kline_' not in stream:
+            return
+        self.evaluate(stream.split('@')[0].upper())
+
+    # ▼ 전략 평가 / 주문
+    def evaluate(self, symbol):
+        if symbol in self.pending_orders or symbol not in self.data_handler.coin_data:
+            return
+        self.bot.evaluation_stats['evaluated'] += 1
+        signals = self.bot.generate_signals(symbol)
+        TRACER.decision(symbol)
+        if signals is not None and signals['action'] != 'HOLD':
+            self.pending_orders.add(symbol)
+            asyncio.create_task(self.execute(symbol, signals))
+
+    async def execute(self, symbol, signals):
+        """OrderHandler.plan_order (enter_*/exit_* 와 같은 규칙) 로 만든 주문을 비동기 전송"""
+        try:
+            request = self.order_handler.plan_order(symbol, signals)
+            if request is None:
+                return
+            params = request.params
+            if request.cancel_first:
+                await self.rest.cancel_all_orders(symbol)
+            sent = time.monotonic_ns()
+            order = await self.rest.create_order(params)
+            acked = time.monotonic_ns()
+            TRACER.order(symbol, sent, acked)
+            log_trade(symbol, params['side'], params.get('price'), params['quantity'],
+                      latency_ms=round((acked - sent) / 1e6, 3))
+            return order
+        except OrderValidationError as e:
+            self.order_handler.log_rejected(symbol, signals['action'], e)
+        except (RestAPIError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"{symbol} {signals['action']} 주문 실패: {e!r}")
+        finally:
+            self.pending_orders.discard(symbol)
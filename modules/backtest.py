@@ -0,0 +1,341 @@
+"""
+저장된 캔들로 BasicStrategy 를 재생하는 백테스트
+
+    python -m modules.backtest --symbols XRPUSDT DOGEUSDT --workers 4
+"""
+import argparse
+import os
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from config.settings import (COIN_LIST, DATA_DIR, TARGET_LEVERAGE, TRADE_RATE,
+                             BACKTEST_INITIAL_BALANCE, BACKTEST_MAKER_FEE, BACKTEST_TAKER_FEE)
+from modules.batch_indicators import calculate_indicators_batch
+from modules.candle_buffer import CandleBuffer, KST_OFFSET
+from modules.kline_archive import read_klines, to_arrays, to_ms
+from modules.order_gateway import SymbolLocks
+from modules.order_handler import OrderHandler
+from modules.persistence import kline_path
+from strategies.basic_strategy import BasicStrategy
+
+
+def load_klines(symbol, timeframe='1m', data_dir=DATA_DIR, start=None, end=None):
+    """
+    저장된 캔들 읽기 (아카이브 바이너리 우선, 없으면 load_historical_data 가 예전에 저장한 CSV)
+    :param start, end: open time 구간 [start, end) (epoch ms 또는 KST 시각, 아카이브는 해당 구간만 읽음)
+    :return: (open time int64[N] epoch ms, OHLCV float64[5, N])
+    """
+    records = read_klines(symbol, timeframe, start, end, data_dir)
+    if len(records) or os.path.exists(kline_path(symbol, timeframe, data_dir)):
+        return to_arrays(records)
+
+    path = os.path.join(data_dir, f"klines_{symbol}_{timeframe}.csv")
+    if not os.path.exists(path):
+        return np.empty(0, dtype=np.int64), np.empty((len(CandleBuffer.COLUMNS), 0))
+    df = pd.read_csv(path, sep='\t')
+    open_time = pd.to_datetime(df['Open time']) - KST_OFFSET
+    times = open_time.to_numpy().astype('datetime64[ms]').astype(np.int64)
+    keep = np.ones(len(times), dtype=bool)
+    if start is not None:
+        keep &= times >= to_ms(start)
+    if end is not None:
+        keep &= times < to_ms(end)
+    return times[keep], df[list(CandleBuffer.COLUMNS)].to_numpy(dtype=np.float64).T[:, keep].copy()
+
+
+class BacktestAccount:
+    """시뮬레이션 계좌 (OrderHandler 가 참조하는 DataHandler 의 잔고/포지션 대체)"""
+
+    def __init__(self, symbols, balance, leverage=TARGET_LEVERAGE):
+        self.balance_data = {"wallet": balance, "total": balance, "free": balance, "used": 0.0, "PNL": 0.0}
+        self.position_data = {symbol: {'avg_price': 0.0, 'position_amount': 0.0, 'leverage': leverage,
+                                       'unrealizedProfit': 0.0, 'entry_time': None}
+                              for symbol in symbols}
+        self.order_books = {}  # 오더북 없음 (OrderHandler.limit_price 는 신호 가격 사용)
+        self.prices = {}       # 심볼 -> 결정 시점 종가
+        self.time = None       # 결정 시점 open time (epoch ms)
+
+    def position(self, symbol):
+        return self.position_data[symbol]
+
+
+class SimulatedOrderHandler(OrderHandler):
+    """
+    거래소 대신 BacktestAccount 에 체결시키는 OrderHandler
+
+    enter_*/exit_* 진입/청산 규칙은 OrderHandler 그대로 쓰고, 주문 전송만 시뮬레이션합니다.
+      - 심볼당 미체결 주문은 1개 (새 주문이 기존 미체결 주문을 대체)
+      - LIMIT 주문은 다음 캔들부터 체결 판단: 시가가 이미 지정가보다 유리하면 시가에 taker 수수료,
+        캔들 중 지정가에 닿으면 지정가에 maker 수수료로 체결
+      - 레버리지 증거금이 소진되는 가격에 닿으면 강제 청산 (유지증거금은 무시)
+    """
+
+    def __init__(self, account, leverage=TARGET_LEVERAGE, trade_rate=TRADE_RATE,
+                 maker_fee=BACKTEST_MAKER_FEE, taker_fee=BACKTEST_TAKER_FEE):
+        self.data_handler = account
+        self.symbol_lock = SymbolLocks()
+        self.leverage = leverage
+        self.trade_rate = trade_rate
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.orders = {}         # 심볼 -> 미체결 주문
+        self.entries = {}        # 심볼 -> 진입 체결 정보 (청산 시 거래 기록용)
+        self.trade_history = []  # 청산된 거래 (BasicStrategy.performance_metrics 형식)
+
+    def set_leverage(self, symbol):
+        self.data_handler.position_data[symbol]['leverage'] = self.leverage
+
+    def cancel_all_orders(self, symbol):
+        self.orders.pop(symbol, None)
+
+    def calculate_order_amount(self, symbol):
+        balance = float(self.data_handler.balance_data['wallet'])
+        price = self.data_handler.prices[symbol]
+        return round((balance * self.trade_rate * self.leverage) / price, 4)
+
+    def create_order(self, symbol, side, order_type, quantity, price=None, **kwargs):
+        if quantity <= 0:
+            return None
+        order = {'symbol': symbol, 'side': side, 'type': order_type, 'quantity': quantity,
+                 'price': price, 'time': self.data_handler.time}
+        self.orders[symbol] = order
+        return order
+
+    def match(self, symbol, open_time, open_, high, low):
+        """
+        캔들 하나로 강제 청산과 미체결 주문 체결 처리
+        :return: 체결 가격 (체결 없으면 None)
+        """
+        position = self.data_handler.position_data[symbol]
+        amount = position['position_amount']
+        if amount != 0:
+            margin = position['avg_price'] / self.leverage
+            if amount > 0 and low <= position['avg_price'] - margin:
+                self.orders.pop(symbol, None)
+                return self._fill(symbol, 'SELL', abs(amount), position['avg_price'] - margin,
+                                  self.taker_fee, open_time, 'liquidation')
+            if amount < 0 and high >= position['avg_price'] + margin:
+                self.orders.pop(symbol, None)
+                return self._fill(symbol, 'BUY', abs(amount), position['avg_price'] + margin,
+                                  self.taker_fee, open_time, 'liquidation')
+
+        order = self.orders.get(symbol)
+        if order is None:
+            return None
+        price = order['price']
+        if order['type'] != 'LIMIT' or price is None:
+            fill, fee_rate = open_, self.taker_fee
+        elif order['side'] == 'BUY':
+            if open_ <= price:
+                fill, fee_rate = open_, self.taker_fee
+            elif low <= price:
+                fill, fee_rate = price, self.maker_fee
+            else:
+                return None
+        else:
+            if open_ >= price:
+                fill, fee_rate = open_, self.taker_fee
+            elif high >= price:
+                fill, fee_rate = price, self.maker_fee
+            else:
+                return None
+        del self.orders[symbol]
+        return self._fill(symbol, order['side'], order['quantity'], fill, fee_rate, open_time, 'exit')
+
+    def _fill(self, symbol, side, quantity, price, fee_rate, open_time, reason):
+        position = self.data_handler.position_data[symbol]
+        balance = self.data_handler.balance_data
+        amount = position['position_amount']
+        direction = 1 if side == 'BUY' else -1
+        fee = price * quantity * fee_rate
+        balance['wallet'] -= fee
+
+        if amount * direction >= 0:
+            # 신규 진입 또는 같은 방향 추가 (평균 단가 갱신)
+            total = abs(amount) + quantity
+            position['avg_price'] = (position['avg_price'] * abs(amount) + price * quantity) / total
+            position['position_amount'] = amount + direction * quantity
+            if amount == 0:
+                position['entry_time'] = pd.Timestamp(int(open_time), unit='ms') + KST_OFFSET
+                self.entries[symbol] = {'time': int(open_time), 'fee': 0.0}
+            self.entries[symbol]['fee'] += fee
+        else:
+            # 청산 (reduce only: 보유 수량까지만)
+            quantity = min(quantity, abs(amount))
+            pnl = (price - position['avg_price']) * quantity * (1 if amount > 0 else -1)
+            balance['wallet'] += pnl
+            balance['PNL'] += pnl
+            entry = self.entries.pop(symbol)
+            self.trade_history.append({
+                'symbol': symbol,
+                'side': 'LONG' if amount > 0 else 'SHORT',
+                'entry_time': entry['time'],
+                'exit_time': int(open_time),
+                'entry_price': position['avg_price'],
+                'exit_price': price,
+                'quantity': quantity,
+                'fee': entry['fee'] + fee,
+                'profit': pnl - entry['fee'] - fee,
+                'reason': reason
+            })
+            position['position_amount'] = amount + direction * quantity
+            if position['position_amount'] == 0:
+                position.update({'avg_price': 0.0, 'entry_time': None})
+            else:
+                self.entries[symbol] = {'time': entry['time'], 'fee': 0.0}
+        return price
+
+
+class Backtester:
+    """
+    저장된 캔들을 BasicStrategy 와 SimulatedOrderHandler 로 재생하는 백테스트 엔진
+
+    지표는 calculate_indicators_batch 로 전체 구간을 한 번에 계산하고, 진입 조건도
+    BasicStrategy.entry_masks 로 전 구간 mask 를 먼저 구합니다. 이벤트 루프는 결정 시점
+    (진입 신호 캔들, 포지션 보유 중인 캔들, 미체결 주문이 닿는 캔들)만 방문하며, 그 시점마다
+    실거래와 같은 generate_signals_from_latest → enter_*/exit_* 경로를 실행합니다.
+    결정은 확정 캔들 종가 기준이고, 주문 체결은 다음 캔들부터 판단합니다.
+    심볼마다 독립된 계좌(시작 잔고 balance)로 실행하므로 심볼 단위로 병렬 실행할 수 있습니다.
+    """
+
+    def __init__(self, strategy=None, timeframe='1m', data_dir=DATA_DIR, balance=BACKTEST_INITIAL_BALANCE,
+                 leverage=TARGET_LEVERAGE, trade_rate=TRADE_RATE,
+                 maker_fee=BACKTEST_MAKER_FEE, taker_fee=BACKTEST_TAKER_FEE, start=None, end=None):
+        """:param start, end: 재생할 open time 구간 [start, end) (epoch ms 또는 KST 시각, None 이면 저장된 전체)"""
+        self.strategy = strategy or BasicStrategy()
+        self.timeframe = timeframe
+        self.data_dir = data_dir
+        self.start = start
+        self.end = end
+        self.balance = balance
+        self.leverage = leverage
+        self.trade_rate = trade_rate
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+
+    def run(self, symbols=None, workers=None):
+        """
+        여러 심볼 백테스트 (workers > 1 이면 심볼별 프로세스 병렬)
+        :return: {'symbols': 심볼 -> run_symbol 결과, 'trades': 전체 거래(청산 시각 순), 'metrics': performance_metrics}
+        """
+        symbols = list(symbols or COIN_LIST)
+        if workers and workers > 1 and len(symbols) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(symbols))) as pool:
+                results = list(pool.map(_run_symbol, [self] * len(symbols), symbols))
+        else:
+            results = [self.run_symbol(symbol) for symbol in symbols]
+
+        trades = sorted((trade for result in results for trade in result['trades']), key=lambda t: t['exit_time'])
+        self.strategy.trade_history = trades
+        return {
+            'symbols': {result['symbol']: result for result in results},
+            'trades': trades,
+            'metrics': self.strategy.performance_metrics()
+        }
+
+    def run_symbol(self, symbol, times=None, values=None):
+        """
+        심볼 하나 백테스트
+        :param times, values: 캔들 배열 (생략하면 data_dir 의 저장 파일에서 start ~ end 구간을 읽음)
+        """
+        if times is None:
+            times, values = load_klines(symbol, self.timeframe, self.data_dir, self.start, self.end)
+        candles = {column: values[i][np.newaxis] for i, column in enumerate(CandleBuffer.COLUMNS)}
+        indicators = {column: series[0] for column, series in calculate_indicators_batch(candles).items()}
+        return self.replay(symbol, times, indicators)
+
+    def replay(self, symbol, times, indicators):
+        """미리 계산된 지표 배열 (컬럼 -> float64[N]) 로 매매 재생"""
+        account = BacktestAccount([symbol], self.balance, self.leverage)
+        handler = SimulatedOrderHandler(account, self.leverage, self.trade_rate, self.maker_fee, self.taker_fee)
+        handler.set_leverage(symbol)
+        position = account.position_data[symbol]
+
+        ready, long_entry, short_entry = self.strategy.entry_masks(indicators)
+        signal_bars = np.flatnonzero(long_entry | short_entry).tolist()
+        ready = ready.tolist()
+        # 결정 시점마다 한 줄씩 꺼내므로 Python 리스트로 한 번 변환 (원소 접근/비교가 NumPy 스칼라보다 빠름)
+        rows = {column: series.tolist() for column, series in indicators.items()}
+        opens, highs, lows, closes = (rows[column] for column in ('Open', 'High', 'Low', 'Close'))
+        times = times.tolist()
+
+        bars = len(times)
+        decisions = 0
+        i = signal_bars[0] if signal_bars else bars
+        while i < bars:
+            handler.match(symbol, times[i], opens[i], highs[i], lows[i])
+            if ready[i]:
+                account.time = times[i]
+                account.prices[symbol] = closes[i]
+                latest = {column: series[i] for column, series in rows.items()}
+                self.execute(handler, symbol, self.strategy.generate_signals_from_latest(latest, position))
+                decisions += 1
+
+            # 다음 결정 시점: 포지션 보유 중이면 다음 캔들, 아니면 다음 진입 신호 또는 미체결 주문이 닿는 캔들
+            if position['position_amount'] != 0:
+                i += 1
+                continue
+            k = bisect_right(signal_bars, i)
+            next_signal = signal_bars[k] if k < len(signal_bars) else bars
+            order = handler.orders.get(symbol)
+            if order is None:
+                i = next_signal
+                continue
+            if order['side'] == 'BUY':
+                touched = indicators['Low'][i + 1:next_signal] <= order['price']
+            else:
+                touched = indicators['High'][i + 1:next_signal] >= order['price']
+            first = int(np.argmax(touched)) if len(touched) else 0
+            i = i + 1 + first if len(touched) and touched[first] else next_signal
+
+        return {
+            'symbol': symbol,
+            'bars': bars,
+            'signals': len(signal_bars),
+            'decisions': decisions,
+            'trades': handler.trade_history,
+            'final_balance': account.balance_data['wallet']
+        }
+
+    def execute(self, handler, symbol, signals):
+        """OrderHandler.plan_order 와 같은 규칙(포지션 없을 때 진입, 있을 때 청산)으로 enter_*/exit_* 시뮬레이션 주문"""
+        position = handler.data_handler.position_data[symbol]
+        if signals['action'] == 'BUY':
+            handler.enter_long(symbol, signals['price'])
+        elif signals['action'] == 'SELL':
+            handler.enter_short(symbol, signals['price'])
+        elif signals['action'] == 'EXIT':
+            if position['position_amount'] > 0:
+                handler.exit_long(symbol, signals['price'])
+            elif position['position_amount'] < 0:
+                handler.exit_short(symbol, signals['price'])
+
+
+def _run_symbol(backtester, symbol):
+    return backtester.run_symbol(symbol)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--symbols', nargs='+', default=COIN_LIST)
+    parser.add_argument('--timeframe', default='1m')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--start', help="시작 시각 (KST, 예: 2024-01-01)")
+    parser.add_argument('--end', help="끝 시각 (KST, 포함하지 않음)")
+    parser.add_argument('--balance', type=float, default=BACKTEST_INITIAL_BALANCE)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    backtester = Backtester(timeframe=args.timeframe, data_dir=args.data_dir, balance=args.balance,
+                            start=args.start, end=args.end)
+    report = backtester.run(args.symbols, args.workers)
+    elapsed = time.perf_counter() - start
+
+    for symbol, result in report['symbols'].items():
+        print(f"{symbol:12s} bars={result['bars']:8d}  trades={len(result['trades']):5d}  "
+              f"balance={result['final_balance']:12.2f}")
+    print(f"metrics: {report['metrics']}")
+    print(f"elapsed: {elapsed:.2f}s")
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from modules.candle_buffer import CandleBuffer
+
+EPSILON = np.finfo(np.float64).eps
+
+
+def stack_candles(buffers):
+    """
+    여러 심볼의 CandleBuffer 를 (심볼 x 캔들) 2차원 배열로 쌓기
+    길이가 짧은 심볼은 앞쪽을 NaN 으로 채웁니다 (오른쪽 끝 = 최신 캔들 정렬).
+    :return: {'Open': ..., 'High': ..., 'Low': ..., 'Close': ..., 'Volume': ...}
+    """
+    bars = max((len(buffer) for buffer in buffers), default=0)
+    stacked = {column: np.full((len(buffers), bars), np.nan) for column in CandleBuffer.COLUMNS}
+    for row, buffer in enumerate(buffers):
+        size = len(buffer)
+        if size:
+            for column in CandleBuffer.COLUMNS:
+                stacked[column][row, bars - size:] = buffer[column]
+    return stacked
+
+
+def ewm_rows(x, alpha, adjust, min_periods):
+    """
+    행마다 pandas Series.ewm(alpha, adjust, min_periods, ignore_na=False).mean() 을 한 번에 계산
+    파라미터가 같은 행끼리 묶어 DataFrame(열 = 행) 의 ewm 을 한 번씩 호출하므로, 시간 축 순회는
+    pandas 의 컴파일된 루프에서 모든 열에 대해 수행됩니다 (수개월치 1분봉도 수십 ms).
+    :param x: (행, 캔들) 배열
+    :param alpha, adjust, min_periods: 행별 값 (스칼라 또는 (행,) 배열)
+    """
+    rows = x.shape[0]
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=np.float64), (rows,)).tolist()
+    adjust = np.broadcast_to(np.asarray(adjust, dtype=bool), (rows,)).tolist()
+    min_periods = np.broadcast_to(np.asarray(min_periods), (rows,)).tolist()
+
+    groups = {}
+    for row, params in enumerate(zip(alpha, adjust, min_periods)):
+        groups.setdefault(params, []).append(row)
+
+    out = np.empty(x.shape)
+    for (row_alpha, row_adjust, row_min_periods), index in groups.items():
+        frame = pd.DataFrame(x[index].T)
+        out[index] = frame.ewm(alpha=row_alpha, adjust=row_adjust, min_periods=row_min_periods).mean().to_numpy().T
+    return out
+
+
+def _sma_seed(x, length):
+    """pandas_ta.ema(sma=True) 입력 변환: 첫 length 개 유효값을 단순평균 하나로 대체"""
+    x = x.copy()
+    valid = ~np.isnan(x)
+    first = np.where(valid.any(axis=1), valid.argmax(axis=1), x.shape[1])
+    for row, start in enumerate(first):
+        seed = start + length - 1
+        if seed < x.shape[1]:
+            x[row, seed] = x[row, start:seed + 1].mean()
+            x[row, start:seed] = np.nan
+        else:
+            x[row, start:] = np.nan
+    return x
+
+
+def ema_rows(x, lengths):
+    """
+    pandas_ta.ema 를 여러 길이에 대해 한 번에 계산
+    :return: lengths 순서의 (행, 캔들) 배열 목록
+    """
+    seeded = np.concatenate([_sma_seed(x, length) for length in lengths])
+    alpha = np.repeat([2.0 / (length + 1) for length in lengths], x.shape[0])
+    return np.split(ewm_rows(seeded, alpha, adjust=False, min_periods=0), len(lengths))
+
+
+def rolling_rows(x, length, reduce):
+    """행마다 길이 length 창의 rolling 집계 (pandas rolling(length).reduce() 와 같이 앞쪽은 NaN)"""
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] >= length:
+        out[:, length - 1:] = reduce(sliding_window_view(x, length, axis=1), axis=-1)
+    return out
+
+
+def _shift(x):
+    out = np.full(x.shape, np.nan)
+    out[:, 1:] = x[:, :-1]
+    return out
+
+
+def calculate_indicators_batch(candles):
+    """
+    BasicStrategy.calculate_indicators 와 같은 지표를 (심볼 x 캔들) 배열로 한 번에 계산
+
+    :param candles: stack_candles 결과 (컬럼 -> (심볼, 캔들) 배열)
+    :return: 컬럼명 -> (심볼, 캔들) 배열 (calculate_indicators 와 같은 컬럼명, dropna 전)
+    """
+    high, low, close = candles['High'], candles['Low'], candles['Close']
+    symbols = close.shape[0]
+    prev_high, prev_low, prev_close = _shift(high), _shift(low), _shift(close)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # RMA(14) 입력: RSI 상승/하락폭, true range, +DM/-DM
+        diff = close - prev_close
+        up = np.where(diff < 0, 0.0, diff)
+        down = np.where(diff > 0, 0.0, diff)
+        high_low = high - low
+        high_low = np.where(high_low == 0, EPSILON, high_low)
+        true_range = np.fmax(np.fmax(np.abs(high_low), np.abs(high - prev_close)), np.abs(prev_close - low))
+        true_range[np.isnan(prev_close)] = np.nan
+        move_up = high - prev_high
+        move_down = prev_low - low
+        plus = np.where((move_up > move_down) & (move_up > 0), move_up, np.where(np.isnan(move_up), np.nan, 0.0))
+        minus = np.where((move_down > move_up) & (move_down > 0), move_down, np.where(np.isnan(move_down), np.nan, 0.0))
+        plus[np.abs(plus) < EPSILON] = 0.0
+        minus[np.abs(minus) < EPSILON] = 0.0
+
+        up_avg, down_avg, atr, dm_plus, dm_minus = np.split(
+            ewm_rows(np.concatenate([up, down, true_range, plus, minus]), 1 / 14, True, 14), 5
+        )
+        rsi = 100 * up_avg / (up_avg + np.abs(down_avg))
+        k = 100 / atr
+        dmp = k * dm_plus
+        dmn = k * dm_minus
+        dx = 100 * np.abs(dmp - dmn) / (dmp + dmn)
+
+        # EMA / MACD
+        ema_200, ema_50, ema_12, ema_26 = ema_rows(close, (200, 50, 12, 26))
+        macd = ema_12 - ema_26
+
+        # ADX(14) 와 MACD 시그널(9) 은 서로 독립이므로 한 번에
+        stacked = np.concatenate([dx, _sma_seed(macd, 9)])
+        adx, macd_signal = np.split(ewm_rows(
+            stacked,
+            np.repeat([1 / 14, 2 / 10], symbols),
+            np.repeat([True, False], symbols),
+            np.repeat([14, 0], symbols)
+        ), 2)
+
+        # Stochastic (14, 3, 3)
+        lowest = rolling_rows(low, 14, np.min)
+        highest = rolling_rows(high, 14, np.max)
+        stoch_range = highest - lowest
+        stoch = 100 * (close - lowest) / np.where(stoch_range == 0, EPSILON, stoch_range)
+        stoch_k = rolling_rows(stoch, 3, np.mean)
+        stoch_d = rolling_rows(stoch_k, 3, np.mean)
+
+        # 피보나치 되돌림 레벨
+        recent_high = rolling_rows(high, 50, np.max)
+        recent_low = rolling_rows(low, 50, np.min)
+        fib_range = recent_high - recent_low
+
+    return {
+        **candles,
+        'ema_200': np.round(ema_200, 4), 'ema_50': np.round(ema_50, 4), 'rsi': np.round(rsi, 4),
+        'STOCHk_14_3_3': stoch_k, 'STOCHd_14_3_3': stoch_d,
+        'ADX_14': adx, 'DMP_14': dmp, 'DMN_14': dmn,
+        'atr': atr,
+        'MACD_12_26_9': macd, 'MACDh_12_26_9': macd - macd_signal, 'MACDs_12_26_9': macd_signal,
+        'fib_0.236': recent_high - fib_range * 0.236,
+        'fib_0.5': recent_high - fib_range * 0.5,
+        'fib_0.786': recent_high - fib_range * 0.786,
+        'volume_ma_20': rolling_rows(candles['Volume'], 20, np.mean),
+    }
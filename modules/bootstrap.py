@@ -0,0 +1,140 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from config.settings import DATA_DIR, BOOTSTRAP_WORKERS, BOOTSTRAP_MAX_FILL_BARS, BOOTSTRAP_HISTORY_BARS
+from modules.candle_buffer import CandleBuffer, DEFAULT_CAPACITY, TIMEFRAME_MS
+from modules.kline_archive import to_arrays
+from modules.persistence import KLINE_DTYPE, kline_path, read_records
+from modules.rest_client import shared_client
+from utils.logger import logger
+
+KLINES_PER_REQUEST = 1500  # /fapi/v1/klines limit 최대값
+
+
+def parse_klines(raw):
+    """
+    /fapi/v1/klines 응답을 DataFrame 을 거치지 않고 타입이 정해진 배열로 변환
+    :return: (open time int64[N] epoch ms, OHLCV float64[5, N])
+    """
+    if not raw:
+        return np.empty(0, dtype=np.int64), np.empty((len(CandleBuffer.COLUMNS), 0))
+    times = np.fromiter((kline[0] for kline in raw), dtype=np.int64, count=len(raw))
+    values = np.array([kline[1:6] for kline in raw], dtype=np.float64).T
+    return times, values
+
+
+def read_stored_klines(symbol, timeframe, count, data_dir=DATA_DIR):
+    """append-only 저장소의 마지막 count 개 확정 캔들 (open time int64[N], OHLCV float64[5, N])"""
+    return to_arrays(read_records(kline_path(symbol, timeframe, data_dir), KLINE_DTYPE)[-count:])
+
+
+class KlineBootstrap:
+    """
+    시작 시 심볼/타임프레임별 캔들 적재
+
+    로컬 저장소(persistence.py 의 확정 캔들 파일)에서 마지막 캔들을 읽고, 마지막 저장 캔들 이후
+    빠진 구간만 REST 로 받아 이어 붙입니다 (warm). 저장소가 비어 있으면 최근 capacity 개를 받습니다 (cold).
+    빠진 구간이 BOOTSTRAP_MAX_FILL_BARS 보다 길면 저장소를 버리고 cold 와 같이 최근 구간만 받습니다.
+    저장소에서는 최대 history_bars 개까지 읽어 결과 배열(times/values)로 돌려주므로 (버퍼에는 최근 capacity 개)
+    상위 타임프레임 집계에 REST 요청 없이 긴 구간을 쓸 수 있습니다.
+    요청은 심볼/타임프레임별로 스레드 풀에서 병렬 실행되며, 공용 RestClient 의 WeightLimiter 가
+    rate limit 을 넘지 않도록 대기시킵니다.
+    """
+
+    def __init__(self, rest=None, data_dir=DATA_DIR, capacity=DEFAULT_CAPACITY,
+                 workers=BOOTSTRAP_WORKERS, max_fill_bars=BOOTSTRAP_MAX_FILL_BARS,
+                 history_bars=BOOTSTRAP_HISTORY_BARS):
+        self.rest = rest or shared_client()
+        self.data_dir = data_dir
+        self.capacity = capacity
+        self.workers = workers
+        self.max_fill_bars = max_fill_bars
+        self.history_bars = max(history_bars, capacity)
+
+    def load(self, symbols, timeframes):
+        """
+        :return: ({(심볼, 타임프레임): 결과}, 통계)
+                 결과는 {'buffer': CandleBuffer, 'times'/'values': 적재한 전체 구간, 'fetched': REST 로 받은 확정 캔들
+                 (open time, OHLCV), 'mode', 'requests'} (적재에 실패한 심볼/타임프레임은 빈 결과, mode 'failed')
+        """
+        start = time.perf_counter()
+        keys = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(keys)))) as pool:
+            results = dict(zip(keys, pool.map(self._load_or_empty, keys)))
+        elapsed = time.perf_counter() - start
+
+        stats = {
+            'series': len(keys),
+            'warm': sum(result['mode'] == 'warm' for result in results.values()),
+            'cold': sum(result['mode'] == 'cold' for result in results.values()),
+            'failed': sum(result['mode'] == 'failed' for result in results.values()),
+            'requests': sum(result['requests'] for result in results.values()),
+            'fetched_bars': sum(len(result['fetched'][0]) for result in results.values()),
+            'seconds': elapsed,
+        }
+        logger.info(f"캔들 부트스트랩: {stats['series']}개 (warm {stats['warm']}, cold {stats['cold']}, "
+                    f"실패 {stats['failed']}), "
+                    f"REST {stats['requests']}회 / {stats['fetched_bars']}개 캔들, {elapsed:.2f}초")
+        return results, stats
+
+    def _load_or_empty(self, key):
+        """심볼/타임프레임 하나 적재 (REST 오류 등으로 실패하면 로그를 남기고 빈 결과, 다른 심볼 적재는 계속)"""
+        symbol, timeframe = key
+        try:
+            return self.load_series(symbol, timeframe)
+        except Exception as e:
+            logger.error(f"캔들 적재 실패 - {symbol} {timeframe}: {e}")
+            times, values = np.empty(0, dtype=np.int64), np.empty((len(CandleBuffer.COLUMNS), 0))
+            return {
+                'buffer': CandleBuffer.from_arrays(times, values, self.capacity),
+                'times': times,
+                'values': values,
+                'fetched': (times, values),
+                'mode': 'failed',
+                'requests': 0,
+            }
+
+    def load_series(self, symbol, timeframe):
+        interval = TIMEFRAME_MS[timeframe]
+        now = int(time.time() * 1000)
+        stored_times, stored_values = read_stored_klines(symbol, timeframe, self.history_bars, self.data_dir)
+
+        missing = (now - int(stored_times[-1])) // interval if len(stored_times) else None
+        if missing is not None and missing <= self.max_fill_bars:
+            mode, start_time = 'warm', int(stored_times[-1]) + interval
+        else:
+            mode, start_time = 'cold', None
+            stored_times, stored_values = stored_times[:0], stored_values[:, :0]
+
+        chunks, requests = [], 0
+        if start_time is None:
+            raw = self.rest.klines(symbol, timeframe, limit=self.capacity)
+            requests += 1
+            chunks.append(parse_klines(raw))
+        else:
+            # 빠진 구간을 limit 단위로 이어 받기 (마지막 요청에 진행 중 캔들 포함)
+            while start_time <= now:
+                limit = int(min(KLINES_PER_REQUEST, (now - start_time) // interval + 1))
+                raw = self.rest.klines(symbol, timeframe, limit=limit, start_time=start_time)
+                requests += 1
+                chunk = parse_klines(raw)
+                chunks.append(chunk)
+                if len(raw) < limit:
+                    break
+                start_time = int(chunk[0][-1]) + interval
+
+        fetched_times = np.concatenate([stored_times[:0]] + [chunk[0] for chunk in chunks])
+        fetched_values = np.concatenate([stored_values[:, :0]] + [chunk[1] for chunk in chunks], axis=1)
+        times = np.concatenate([stored_times, fetched_times])
+        values = np.concatenate([stored_values, fetched_values], axis=1)
+
+        # 진행 중 캔들은 저장 대상(확정 캔들)에서 제외
+        closed = fetched_times + interval <= now
+        return {
+            'buffer': CandleBuffer.from_arrays(times, values, self.capacity),
+            'times': times,
+            'values': values,
+            'fetched': (fetched_times[closed], fetched_values[:, closed]),
+            'mode': mode,
+            'requests': requests,
+        }
@@ -0,0 +1,114 @@
+import numpy as np
+from modules.candle_buffer import CandleBuffer, TIMEFRAME_MS
+
+BASE_TIMEFRAME = '1m'  # 구독/백필하는 유일한 캔들 타임프레임 (상위 타임프레임은 여기서 집계)
+
+
+def bucket_start(open_time, timeframe):
+    """1분봉 open time 이 속한 상위 캔들의 open time (거래소와 같이 UTC epoch 기준 정렬)"""
+    return open_time - open_time % TIMEFRAME_MS[timeframe]
+
+
+def aggregate_klines(times, values, timeframe):
+    """
+    1분봉 배열을 상위 타임프레임 캔들로 집계 (과거 데이터 적재용)
+    :param times: int64[N] 1분봉 open time (epoch ms, 오래된 순)
+    :param values: float64[5, N] OHLCV
+    :return: (open time int64[M], OHLCV float64[5, M]) 마지막 캔들은 진행 중일 수 있음
+    """
+    if len(times) == 0:
+        return times[:0].astype(np.int64), values[:, :0]
+    buckets = times - times % TIMEFRAME_MS[timeframe]
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(times)] - 1
+    return buckets[starts], np.stack([
+        values[0, starts],
+        np.maximum.reduceat(values[1], starts),
+        np.minimum.reduceat(values[2], starts),
+        values[3, ends],
+        np.add.reduceat(values[4], starts),
+    ])
+
+
+class _Bucket:
+    """집계 중인 상위 캔들 하나 (확정된 1분봉 합계 + 진행 중 1분봉)"""
+    __slots__ = ('start', 'closed', 'minute', 'current')
+
+    def __init__(self, start):
+        self.start = start
+        self.closed = None   # 이 캔들에 속한 지나간 1분봉들의 (open, high, low, close, volume)
+        self.minute = None   # 진행 중 1분봉 open time
+        self.current = None  # 진행 중 1분봉 OHLCV
+
+    def merged(self):
+        if self.closed is None:
+            return self.current
+        open_, high, low, _, volume = self.closed
+        _, cur_high, cur_low, close, cur_volume = self.current
+        return open_, max(high, cur_high), min(low, cur_low), close, volume + cur_volume
+
+
+class CandleAggregator:
+    """
+    1분봉 스트림 -> 상위 타임프레임(5m/15m/1h/4h 등) 캔들 증분 집계
+
+    심볼/타임프레임별로 집계 중인 캔들 하나만 들고 있어 1분봉 메시지마다 O(타임프레임 수) 입니다.
+    같은 1분봉의 진행 중 갱신은 진행 중 값만 바꾸고, 새 1분봉이 시작되면 직전 1분봉을 합계에 넣습니다.
+    결과는 거래소 kline_<타임프레임> 스트림과 같은 값입니다 (빠진 1분봉이 없다면).
+    """
+
+    def __init__(self, timeframes):
+        for timeframe in timeframes:
+            if TIMEFRAME_MS[timeframe] % TIMEFRAME_MS[BASE_TIMEFRAME]:
+                raise ValueError(f"1분봉으로 집계할 수 없는 타임프레임: {timeframe}")
+        self.timeframes = tuple(timeframes)
+        self.buckets = {}  # (심볼, 타임프레임) -> _Bucket
+
+    def seed(self, symbol, times, values):
+        """
+        과거 1분봉의 마지막 상위 캔들 구간으로 집계 상태 초기화
+        (마지막 1분봉은 진행 중으로 취급, 이후 같은 open time 메시지가 오면 갱신)
+        """
+        for timeframe in self.timeframes:
+            self.buckets.pop((symbol, timeframe), None)
+        if len(times) == 0:
+            return
+        for timeframe in self.timeframes:
+            start = bucket_start(int(times[-1]), timeframe)
+            first = int(np.searchsorted(times, start))
+            bucket = self.buckets[(symbol, timeframe)] = _Bucket(start)
+            if first < len(times) - 1:
+                _, closed = aggregate_klines(times[first:-1], values[:, first:-1], timeframe)
+                bucket.closed = tuple(closed[:, 0].tolist())
+            bucket.minute, bucket.current = int(times[-1]), tuple(values[:, -1].tolist())
+
+    def remove(self, symbol):
+        for timeframe in self.timeframes:
+            self.buckets.pop((symbol, timeframe), None)
+
+    def update(self, symbol, open_time, open_, high, low, close, volume):
+        """
+        1분봉 메시지 반영
+        :return: [(타임프레임, 상위 캔들 open time, (open, high, low, close, volume))] 갱신된 상위 캔들
+        """
+        current = (open_, high, low, close, volume)
+        updates = []
+        for timeframe in self.timeframes:
+            key = (symbol, timeframe)
+            start = bucket_start(open_time, timeframe)
+            bucket = self.buckets.get(key)
+            if bucket is None or start > bucket.start:
+                bucket = self.buckets[key] = _Bucket(start)
+            elif start < bucket.start or open_time < bucket.minute:
+                continue  # 이미 지난 1분봉 메시지
+            elif open_time > bucket.minute:
+                bucket.closed = bucket.merged()  # 직전 1분봉 확정
+            bucket.minute, bucket.current = open_time, current
+            updates.append((timeframe, start, bucket.merged()))
+        return updates
+
+
+def derived_buffers(times, values, timeframes, capacity):
+    """과거 1분봉 배열로 상위 타임프레임 CandleBuffer 생성 {타임프레임: CandleBuffer}"""
+    return {timeframe: CandleBuffer.from_arrays(*aggregate_klines(times, values, timeframe), capacity)
+            for timeframe in timeframes}
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_CAPACITY = 1000  # 심볼/타임프레임별 보관 캔들 수
+KST_OFFSET = pd.Timedelta(hours=9)
+
+# 타임프레임별 캔들 길이 (ms)
+TIMEFRAME_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '1d': 86_400_000,
+}
+
+
+class CandleBuffer:
+    """
+    고정 용량 컬럼형 캔들 링버퍼 (open time: int64 epoch ms, OHLCV: float64)
+
+    각 슬롯을 [p] 와 [p + capacity] 두 곳에 동시에 기록(미러링)하므로,
+    최근 capacity 개 캔들은 항상 [start, start + size) 하나의 연속 구간입니다.
+    진행 중 캔들 갱신과 새 캔들 추가(가장 오래된 캔들 밀어내기) 모두 O(1) 이고
+    view() 는 복사 없는 연속 배열을 돌려줍니다.
+
+    주의: view() 배열은 이후 갱신에 따라 값이 바뀌므로 data_handler.lock 밖에서
+    보관하려면 복사해서 사용해야 합니다.
+    """
+    COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.open_time = np.zeros(2 * capacity, dtype=np.int64)
+        self.values = np.zeros((len(self.COLUMNS), 2 * capacity), dtype=np.float64)
+        self.start = 0
+        self.size = 0
+        self.version = 0  # 갱신될 때마다 증가 (DataFrame 캐시 무효화용)
+        self._frame = None
+        self._frame_version = -1
+
+    @classmethod
+    def from_frame(cls, df, capacity=DEFAULT_CAPACITY):
+        """load_historical_data 형식의 DataFrame ('Open time' 은 KST datetime) 으로 생성"""
+        if df is None or df.empty:
+            return cls(capacity)
+        df = df.iloc[-capacity:]
+        open_time = (df['Open time'] - KST_OFFSET - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)
+        return cls.from_arrays(open_time.to_numpy(dtype=np.int64), df[list(cls.COLUMNS)].to_numpy(dtype=np.float64).T,
+                               capacity)
+
+    @classmethod
+    def from_arrays(cls, open_time, values, capacity=DEFAULT_CAPACITY):
+        """
+        배열로 생성 (최근 capacity 개만 보관, 두 미러 구간에 한 번에 복사)
+        :param open_time: int64[N] epoch ms (오래된 순)
+        :param values: float64[5, N] OHLCV
+        """
+        buffer = cls(capacity)
+        open_time, values = open_time[-capacity:], values[:, -capacity:]
+        size = len(open_time)
+        for offset in (0, capacity):
+            buffer.open_time[offset:offset + size] = open_time
+            buffer.values[:, offset:offset + size] = values
+        buffer.size = size
+        buffer.version += 1
+        return buffer
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def empty(self):
+        return self.size == 0
+
+    @property
+    def last_open_time(self):
+        """마지막(진행 중) 캔들의 open time (epoch ms), 비어 있으면 None"""
+        if self.size == 0:
+            return None
+        return int(self.open_time[self.start + self.size - 1])
+
+    def _write(self, pos, open_time, open_, high, low, close, volume):
+        mirror = pos + self.capacity
+        self.open_time[pos] = self.open_time[mirror] = open_time
+        values = self.values
+        values[0, pos] = values[0, mirror] = open_
+        values[1, pos] = values[1, mirror] = high
+        values[2, pos] = values[2, mirror] = low
+        values[3, pos] = values[3, mirror] = close
+        values[4, pos] = values[4, mirror] = volume
+        self.version += 1
+
+    def append(self, open_time, open_, high, low, close, volume):
+        """새 캔들 추가. 가득 차면 가장 오래된 캔들을 밀어냅니다."""
+        if self.size < self.capacity:
+            pos = (self.start + self.size) % self.capacity
+            self.size += 1
+        else:
+            pos = self.start
+            self.start = (self.start + 1) % self.capacity
+        self._write(pos, open_time, open_, high, low, close, volume)
+
+    def update_last(self, open_, high, low, close, volume):
+        """진행 중 캔들의 OHLCV 를 제자리 갱신"""
+        pos = (self.start + self.size - 1) % self.capacity
+        self._write(pos, self.open_time[pos], open_, high, low, close, volume)
+
+    def upsert(self, open_time, open_, high, low, close, volume):
+        """
+        open time 기준으로 캔들 반영
+
+        :return: 'update' (진행 중 캔들 갱신), 'append' (새 캔들), None (과거 캔들 메시지 무시)
+        """
+        last = self.last_open_time
+        if last is not None and open_time < last:
+            return None
+        if last == open_time:
+            self.update_last(open_, high, low, close, volume)
+            return 'update'
+        self.append(open_time, open_, high, low, close, volume)
+        return 'append'
+
+    def view(self, column):
+        """컬럼의 연속 배열 뷰 (복사 없음, 오래된 순). 'Open time' 은 epoch ms"""
+        end = self.start + self.size
+        if column == 'Open time':
+            return self.open_time[self.start:end]
+        return self.values[self.COLUMNS.index(column), self.start:end]
+
+    def __getitem__(self, column):
+        return self.view(column)
+
+    def last(self, column):
+        """마지막 캔들의 컬럼 값"""
+        return self.view(column)[-1]
+
+    def rows(self):
+        """(open time, open, high, low, close, volume) 튜플 목록 (오래된 순)"""
+        end = self.start + self.size
+        return list(zip(self.open_time[self.start:end].tolist(),
+                        *self.values[:, self.start:end].tolist()))
+
+    def to_frame(self):
+        """
+        기존 coin_data 형식의 DataFrame 으로 변환 ('Open time' 은 KST datetime)
+        버전이 바뀌지 않았으면 이전 결과를 재사용합니다 (호출자에게는 얕은 복사본 반환).
+        """
+        if self._frame_version != self.version:
+            end = self.start + self.size
+            frame = pd.DataFrame({
+                'Open time': pd.to_datetime(self.open_time[self.start:end], unit='ms') + KST_OFFSET,
+                **{column: self.values[i, self.start:end].copy() for i, column in enumerate(self.COLUMNS)}
+            })
+            self._frame, self._frame_version = frame, self.version
+        return self._frame.copy(deep=False)
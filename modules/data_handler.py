@@ -1,72 +1,131 @@
 import time
-from datetime import datetime, timezone, timedelta
-import hmac
-import hashlib
 import json
-import requests
 import threading 
+from collections import defaultdict
 import pandas as pd
 import pandas_ta as ta
-from binance.client import Client
-from config.settings import API_KEY, SECRET_KEY, COIN_LIST, DATA_DIR, BASE_URL
+from config.settings import COIN_LIST, DATA_DIR, DERIVED_TIMEFRAMES
+from modules.indicator_engine import IncrementalIndicators
+from modules.candle_buffer import CandleBuffer
+from modules.candle_aggregator import BASE_TIMEFRAME, CandleAggregator, derived_buffers
+from modules.persistence import AsyncWriter
+from modules.kline_archive import last_open_time, read_klines, to_frame
+from modules.order_book import LocalOrderBook
+from modules.account_state import AccountState
+from modules.order_tracker import OrderTracker
+from modules.rest_client import RestAPIError, shared_client
+from modules.bootstrap import KlineBootstrap
+from modules.symbol_filters import ExchangeInfoCache
+from utils.logger import logger, log_balance
 import numpy as np
 import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 class DataHandler:
+    TIMEFRAMES = (BASE_TIMEFRAME, *DERIVED_TIMEFRAMES)  # 심볼별로 유지하는 캔들 타임프레임 (1분봉 + 집계)
+
     def __init__(self):
-        self.client = Client(API_KEY, SECRET_KEY)
+        self.rest = shared_client()  # 공용 REST 클라이언트 (연결 풀 + rate limit)
         self.lock = threading.Lock()  # lock 속성 추가
-        self.coin_data = {symbol: {'1m': self.load_historical_data(symbol, interval='1m'),
-                               '1h': self.load_historical_data(symbol, interval='1h')} 
-                      for symbol in COIN_LIST}
+        # 심볼/타임프레임별 캔들 링버퍼 (DataFrame 이 필요하면 to_frame(), 과거 데이터는 initialize_data 에서 적재)
+        self.coin_data = {symbol: {timeframe: CandleBuffer() for timeframe in self.TIMEFRAMES} for symbol in COIN_LIST}
         # self.coin_data = {symbol: {'1m': pd.DataFrame(), '1h': pd.DataFrame()} for symbol in COIN_LIST}  # 빈 DataFrame으로 초기화
-        self.orderbook_data = {symbol: None for symbol in COIN_LIST}  # orderbook_data 추가
-        self.position_data = {symbol: {} for symbol in COIN_LIST}
-        self.balance_data = {"wallet": 0.0, "total": 0.0, "free": 0, "used": 0.0, "PNL": 0.0}
+        self.orderbook_data = {symbol: None for symbol in COIN_LIST}  # orderbook_data 추가 (저장용 상위 20호가)
+        self.order_books = {symbol: LocalOrderBook(symbol) for symbol in COIN_LIST}  # 심볼별 로컬 오더북
+        self.account = AccountState(COIN_LIST)  # 포지션/잔고 (불변 레코드, 읽을 때 락 불필요)
+        self.orders = OrderTracker()  # 미체결 주문 / 체결 -> 거래 기록 (유저 데이터 스트림)
+        self.indicators = IncrementalIndicators()  # 심볼/타임프레임별 증분 지표 상태
+        self.data_version = defaultdict(int)  # (심볼, 타임프레임) -> 캔들 갱신 횟수 (변경 감지용)
+        self.aggregator = CandleAggregator(DERIVED_TIMEFRAMES)  # 1분봉 -> 상위 타임프레임 증분 집계
         os.makedirs(DATA_DIR, exist_ok=True)  # 데이터 디렉토리 생성
+        self.writer = AsyncWriter().start()  # 웹소켓 데이터 백그라운드 저장
+        self.bootstrap = KlineBootstrap(self.rest)  # 로컬 저장소 + 빠진 구간만 REST 로 캔들 적재
+        self.exchange_info = ExchangeInfoCache(self.rest)  # 심볼별 가격/수량 필터 (initialize_data 에서 적재)
+
+    def initialize_data(self, symbols=None):
+        """
+        웹소켓 시작 전 초기 데이터 로드 (심볼별 병렬, 로컬 저장소 이후 빠진 구간만 요청)
+        1분봉만 적재하고 상위 타임프레임은 적재한 1분봉 구간을 집계해 만듭니다.
+        :return: 적재 통계 (warm/cold 수, REST 요청 수, 소요 시간)
+        """
+        self.exchange_info.load()  # TTL 안이면 메모리/로컬 파일 사용
+        results, stats = self.bootstrap.load(symbols or list(self.coin_data), (BASE_TIMEFRAME,))
+        with self.lock:
+            for (symbol, _), result in results.items():
+                buffers = {BASE_TIMEFRAME: result['buffer'],
+                           **derived_buffers(result['times'], result['values'], self.aggregator.timeframes,
+                                             result['buffer'].capacity)}
+                self.coin_data.setdefault(symbol, {}).update(buffers)
+                self.aggregator.seed(symbol, result['times'], result['values'])
+                for timeframe, buffer in buffers.items():
+                    # 증분 지표 상태를 과거 데이터로 초기화
+                    self.indicators.seed(symbol, timeframe, buffer)
+                    self.data_version[(symbol, timeframe)] += 1
+        # REST 로 새로 받은 확정 1분봉만 append-only 저장소에 이어 붙임 (상위 타임프레임은 다시 집계 가능)
+        for (symbol, timeframe), result in results.items():
+            times, values = result['fetched']
+            for row in zip(times.tolist(), *values.tolist()):
+                self.writer.submit_kline(symbol, timeframe, *row)
+        return stats
+
+    def aggregate_kline(self, symbol, open_time, open_, high, low, close, volume):
+        """
+        1분봉 메시지로 상위 타임프레임 캔들과 증분 지표 갱신 (self.lock 안에서, 1분봉 반영 직후 호출)
+        """
+        for timeframe, bar_time, bar in self.aggregator.update(symbol, open_time, open_, high, low, close, volume):
+            self.coin_data[symbol][timeframe].upsert(bar_time, *bar)
+            self.data_version[(symbol, timeframe)] += 1
+            self.indicators.update(symbol, timeframe, bar_time, *bar)
 
-    def initialize_data(self):
-        """웹소켓 시작 전 초기 데이터 로드"""
-        for symbol in COIN_LIST:
-            # 1분, 1시간 데이터 초기화
-            self.coin_data[symbol]['1m'] = self.load_historical_data(symbol, interval='1m', save_to_file=True)
-            self.coin_data[symbol]['1h'] = self.load_historical_data(symbol, interval='1h', save_to_file=True)
+    def _initialize_symbol(self, symbol):
+        return self.initialize_data([symbol])
 
-    def write_balance(self,binance_balance):
-        with open("binance_balance.txt", "a") as fp :
-            fp.write(binance_balance)
-            fp.write('\n')
+    def add_symbol(self, symbol):
+        """거래 심볼 추가 (과거 데이터 로드 및 상태 초기화)"""
+        self.orderbook_data.setdefault(symbol, None)
+        with self.lock:
+            self.order_books.setdefault(symbol, LocalOrderBook(symbol))
+        self.account.add_symbol(symbol)
+        self._initialize_symbol(symbol)
+
+    def remove_symbol(self, symbol):
+        """거래 심볼 제거 (캔들/지표/오더북 상태 삭제, 포지션 정보는 유지)"""
+        with self.lock:
+            self.coin_data.pop(symbol, None)
+            self.orderbook_data.pop(symbol, None)
+            self.order_books.pop(symbol, None)
+            self.aggregator.remove(symbol)
+            for timeframe in self.TIMEFRAMES:
+                self.indicators.states.pop((symbol, timeframe), None)
+                self.data_version.pop((symbol, timeframe), None)
 
     def get_account_info(self):
-        url = f"{BASE_URL}/fapi/v2/account"
-
-        # 타임스탬프와 서명 생성
-        timestamp = int(time.time() * 1000)
-        query_string = f"timestamp={timestamp}"
-        signature = hmac.new(
-            SECRET_KEY.encode('utf-8'),
-            query_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-
-        # 요청 헤더 설정
-        headers = {
-            "X-MBX-APIKEY": API_KEY
-        }
+        try:
+            return self.rest.account()
+        except RestAPIError as e:
+            return {"error": e.status, "message": e.payload}
 
-        # 요청 보내기
-        response = requests.get(url, headers=headers, params={"timestamp": timestamp, "signature": signature})
+    @property
+    def position_data(self):
+        """심볼 -> Position 읽기 전용 스냅샷 (한 주기 동안 같은 값을 보려면 한 번 받아서 사용)"""
+        return self.account.snapshot().positions
 
-        # 결과 반환
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return {"error": response.status_code, "message": response.text}
+    @property
+    def balance_data(self):
+        return self.account.balance
 
-    def balance_data_update(self,event_reason=None):
-        nowtime = datetime.now(timezone(timedelta(hours=9))).strftime('%Y-%m-%d %H:%M:%S')
-        balance = self.get_account_info()
+    def position(self, symbol):
+        """심볼의 현재 포지션 (Position, 락 없이 읽기)"""
+        return self.account.position(symbol)
+
+    def balance_data_update(self,event_reason=None,balance=None):
+        """
+        잔고 갱신
+        :param event_reason: 로그에 덧붙일 갱신 사유
+        :param balance: 이미 조회한 /fapi/v2/account 응답 (없으면 직접 조회)
+        """
+        if balance is None:
+            balance = self.get_account_info()
         # print(balance)
         total_wallet_balance = round(float(balance['totalWalletBalance']),3) # total wallet balance, only for USDT asset
         total_unrealized_profit = round(float(balance['totalUnrealizedProfit']),3)
@@ -74,87 +133,92 @@ class DataHandler:
         usdt_used = round(float(balance['totalInitialMargin']),3) # usdt_used
         usdt_total = round(float(balance['totalMarginBalance']),3) # usdt_total
 
-        self.balance_data['wallet']=total_wallet_balance
-        self.balance_data['total']=usdt_total
-        self.balance_data['free']=usdt_free
-        self.balance_data['used']=usdt_used
-        self.balance_data['PNL']=total_unrealized_profit
-
-        binance_balance = (
-                        f"{nowtime}\t"
-                        f"wallet: {total_wallet_balance}\t"
-                        f"total: {usdt_total}\t"
-                        f"free: {usdt_free}\t"
-                        f"used: {usdt_used}\t"
-                        f"PNL: {total_unrealized_profit}"
-                        )
-        # event_reason이 전달된 경우, 추가
-        if event_reason:
-            binance_balance += f"\t{event_reason}"
-        print(binance_balance)
-        self.write_balance(binance_balance) # write balance to file
-        return self.balance_data
-
-    def position_data_update(self,symbol):
-        url = f"{BASE_URL}/fapi/v2/positionRisk"
-
-        # 타임스탬프와 서명 생성
-        timestamp = int(time.time() * 1000)
-        query_string = f"symbol={symbol}&timestamp={timestamp}"
-        signature = hmac.new(
-            SECRET_KEY.encode('utf-8'),
-            query_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-
-        # 요청 헤더 설정
-        headers = {
-            "X-MBX-APIKEY": API_KEY
-        }
+        # 잔고 항목을 한 번에 교체 (새 Balance 레코드)
+        balance_data = self.account.set_balance(
+            wallet=total_wallet_balance,
+            total=usdt_total,
+            free=usdt_free,
+            used=usdt_used,
+            PNL=total_unrealized_profit
+        )
+
+        # 콘솔 + BALANCE_LOG 기록 (백그라운드 로그 스레드, 기존 binance_balance.txt 대체)
+        log_balance(balance_data.to_dict(), event_reason)
+        return balance_data
 
-        # 요청 보내기
-        response = requests.get(url, headers=headers, params={"symbol": symbol, "timestamp": timestamp, "signature": signature})
-
-        # 결과 반환
-        if response.status_code == 200:
-            data = response.json()
-            if data:
-                self.position_data[symbol] = {
-                    "avg_price": float(data[0]['entryPrice']),
-                    "position_amount": float(data[0]['positionAmt']),
-                    "leverage": int(data[0]['leverage']),
-                    "unrealizedProfit": float(data[0]['unRealizedProfit']),
-                    "breakeven_price": float(data[0]['breakEvenPrice'])
-                }
-                print(symbol,self.position_data[symbol])
-                return self.position_data[symbol]
-        else:
-            print(f"Error fetching leverage for {symbol}: {response.text}")
+    def apply_position_risk(self, item):
+        """/fapi/v2/positionRisk 응답 항목 하나를 포지션 상태에 반영"""
+        return self.account.set_position(item['symbol'], int(item.get('updateTime', 0)),
+                                         **self._position_from_risk(item))
+
+    def apply_position_risks(self, items):
+        """
+        /fapi/v2/positionRisk 전체 응답을 포지션 상태에 한 번에 반영 (거래 중인 심볼만)
+        :return: 심볼 -> 갱신된 Position
+        """
+        return self.account.apply_positions({item['symbol']: self._position_from_risk(item) for item in items},
+                                            times={item['symbol']: int(item.get('updateTime', 0)) for item in items})
+
+    def refresh_positions(self):
+        """전체 심볼 포지션을 positionRisk 요청 한 번으로 갱신 (심볼 수와 무관하게 1회)"""
+        try:
+            return self.apply_position_risks(self.rest.position_risk())
+        except RestAPIError as e:
+            logger.error(f"포지션 조회 실패: {e.payload}")
+            return {}
+
+    def reconcile_orders(self, open_orders=None, positions=None):
+        """
+        계정 스트림 (재)연결 시 REST 로 포지션과 미체결 주문을 다시 받아 추적 상태와 맞춤
+        (주기적인 포지션 폴링 대신, 연결이 끊긴 동안 놓친 이벤트만 보정)
+        :param open_orders: 이미 받은 /fapi/v1/openOrders 응답 (없으면 직접 조회)
+        :param positions: 이미 받은 /fapi/v2/positionRisk 응답 (없으면 직접 조회)
+        """
+        try:
+            if positions is None:
+                positions = self.rest.position_risk()
+            if open_orders is None:
+                open_orders = self.rest.open_orders()
+        except RestAPIError as e:
+            logger.error(f"주문/포지션 대조 실패: {e.payload}")
+            return False
+        self.apply_position_risks(positions)
+        self.orders.reconcile([item for item in open_orders if item['symbol'] in self.coin_data], self.position_data,
+                              {item['symbol']: int(item.get('updateTime') or 0) for item in positions})
+        return True
+
+    @staticmethod
+    def _position_from_risk(item):
+        return {
+            "avg_price": float(item['entryPrice']),
+            "position_amount": float(item['positionAmt']),
+            "leverage": int(item['leverage']),
+            "unrealizedProfit": float(item['unRealizedProfit']),
+            "breakeven_price": float(item['breakEvenPrice'])
+        }
 
     def save_orderbook_data(self, symbol):
-        """오더북 데이터 저장"""
-        path = os.path.join(DATA_DIR, f"orderbook_{symbol}.csv")
-        df = pd.DataFrame(self.orderbook_data[symbol])
-        df.to_csv(path, index=False)
+        """오더북 데이터 저장 (백그라운드 writer 에 전달, 디스크 I/O 없음)"""
+        self.writer.submit_orderbook(symbol, self.orderbook_data[symbol])
 
 
-    def load_historical_data(self, symbol, interval, limit=999, save_to_file=True):
+    def load_historical_data(self, symbol, interval, limit=999, save_to_file=True, start=None, end=None):
         """
         Binance API를 통해 과거 데이터를 로드하고, 필요시 파일로 저장합니다.
+        start/end 를 지정하면 REST 대신 로컬 캔들 아카이브에서 해당 구간만 읽습니다.
         
         :param symbol: 코인 심볼 (예: 'BTCUSDT')
         :param interval: 데이터 간격 (예: '1m', '1h')
         :param limit: 가져올 데이터 개수
-        :param save_to_file: 데이터를 파일로 저장할지 여부 (기본값: True)
+        :param save_to_file: 확정 캔들을 아카이브(DATA_DIR/klines_{symbol}_{interval}.bin)에 저장할지 여부 (기본값: True)
+        :param start, end: 아카이브에서 읽을 open time 구간 [start, end) (epoch ms 또는 KST 시각)
         :return: pandas DataFrame
         """
+        if start is not None or end is not None:
+            return to_frame(read_klines(symbol, interval, start, end, DATA_DIR))
         try:
             # Binance API를 통해 데이터 가져오기
-            raw_data = self.client.futures_klines(
-                symbol=symbol, 
-                interval=interval, 
-                limit=limit
-            )
+            raw_data = self.rest.klines(symbol, interval, limit)
             
             # 데이터프레임으로 변환
             df = pd.DataFrame(raw_data, columns=[
@@ -175,14 +239,19 @@ class DataHandler:
             # self.add_indicators(df)  # 지표 추가
             # 파일로 저장 (옵션)
             if save_to_file:
-                file_path = os.path.join(DATA_DIR, f"klines_{symbol}_{interval}.csv")
-                df.to_csv(file_path, index=False, sep='\t')
-                print(f"📁 데이터 저장 완료: {file_path}")
+                # 아카이브 마지막 캔들 이후의 확정 캔들(close time 이 지난 캔들)만 백그라운드 writer 로 이어 붙임
+                # (append-only 파일의 open time 정렬 유지, 아직 기록 전인 캔들과의 중복은 writer 가 거름)
+                now = time.time() * 1000
+                last = last_open_time(symbol, interval, DATA_DIR)
+                for kline in raw_data:
+                    if kline[6] < now and (last is None or kline[0] > last):
+                        self.writer.submit_kline(symbol, interval, kline[0], *map(float, kline[1:6]))
+                logger.info(f"📁 데이터 저장 요청: {symbol} {interval}")
             
             return df
         
         except Exception as e:
-            print(f"❌ 데이터 로드 실패: {e}")
+            logger.error(f"❌ 데이터 로드 실패: {e}")
             return pd.DataFrame()  # 빈 데이터프레임 반환
 
     # 기존 함수들 유지
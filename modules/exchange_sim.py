@@ -0,0 +1,585 @@
+"""
+로컬 거래소 시뮬레이터 (오프라인 부하/지연 테스트용 Binance Futures 대역)
+
+REST (/fapi/v1/time, exchangeInfo, klines, depth, leverage, order, batchOrders, allOpenOrders, openOrders,
+listenKey, /fapi/v2/account, positionRisk)와
+웹소켓 (/stream?streams= combined, /ws/<스트림> 개별, /ws/<listenKey> 계정) 을 aiohttp 서버 하나로 제공합니다.
+시세는 심볼별 시드 랜덤워크 (또는 --data-dir 의 저장 캔들 종가를 순서대로 재생) 이며, 틱마다
+kline_1m / kline_1h / depth 차분 메시지를 만들어 구독 중인 연결에 보냅니다. 주문은 거래소와 같이 tickSize/
+stepSize/최소 주문 금액을 어기면 거절하고, 나머지는 즉시 체결되어 계정 스트림에 ORDER_TRADE_UPDATE /
+ACCOUNT_UPDATE 를 보냅니다 (TRAILING_STOP_MARKET 은 취소될 때까지 미체결). 서명은 검증하지 않습니다.
+
+    python -m modules.exchange_sim --symbols XRPUSDT DOGEUSDT --rate 10 --port 8765
+    BINANCE_BASE_URL=http://127.0.0.1:8765 BINANCE_STREAM_URL=ws://127.0.0.1:8765 python main.py
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from aiohttp import web, WSMsgType
+from config.settings import DATA_DIR, TARGET_LEVERAGE, ORDERBOOK_UPDATE_SPEED
+from modules.candle_buffer import TIMEFRAME_MS
+
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':'))
+
+LISTEN_KEY = "simulated-listen-key"
+TIMEFRAMES = ('1m', '1h')
+BOOK_LEVELS = 5      # 틱마다 다시 호가를 내는 최우선 호가 개수 (매수/매도 각각)
+BOOK_DEPTH = 50      # 유지할 호가 범위 (중간가에서 틱 단위)
+MIN_NOTIONAL = 5.0   # 최소 주문 금액 (USDT)
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+class SimSymbol:
+    """심볼 하나의 시세/캔들/오더북 상태"""
+
+    def __init__(self, symbol, seed, history_bars, path=None, start_price=None):
+        self.symbol = symbol
+        self.rng = random.Random(seed)
+        self.path = path  # 재생할 종가 (없으면 랜덤워크)
+        self.path_index = 0
+        self.price = start_price or (path[0] if path else 10 ** self.rng.uniform(-1, 3))
+        self.tick = 10 ** (math.floor(math.log10(self.price)) - 4)
+        self.decimals = max(0, -int(math.floor(math.log10(self.tick))))
+        # 수량 단위: 가격이 낮을수록 큰 단위 (1 미만 -> 1개, 1~10 -> 0.1 ... 최대 소수 3자리)
+        self.quantity_decimals = min(3, max(0, int(math.floor(math.log10(self.price))) + 1))
+        self.step_size = 10 ** -self.quantity_decimals
+        self.update_id = 1
+        self.bids, self.asks = {}, {}  # 가격 틱 인덱스 -> 수량
+        self._requote()
+
+        now = _now_ms()
+        self.history = {}  # 타임프레임 -> 확정 캔들 [open time, open, high, low, close, volume] 목록
+        self.candles = {}  # 타임프레임 -> 진행 중 캔들
+        for timeframe in TIMEFRAMES:
+            interval = TIMEFRAME_MS[timeframe]
+            current = now // interval * interval
+            self.history[timeframe] = self._synthetic_history(current, interval, history_bars)
+            self.candles[timeframe] = [current, self.price, self.price, self.price, self.price, 0.0]
+
+    def _synthetic_history(self, current, interval, bars):
+        """현재 가격에서 거꾸로 만든 확정 캔들 (마지막 종가 = 현재 가격)"""
+        close, rows = self.price, []
+        volatility = 0.002 * math.sqrt(interval / 60_000)
+        for ago in range(1, bars + 1):  # 최근 캔들부터 (앞 캔들 종가 = 다음 캔들 시가)
+            open_ = close * math.exp(self.rng.gauss(0, volatility))
+            spread = abs(self.rng.gauss(0, volatility / 2)) * close
+            rows.append([current - ago * interval, open_, max(open_, close) + spread, min(open_, close) - spread,
+                         close, self.rng.uniform(100, 10_000)])
+            close = open_
+        rows.reverse()
+        return rows
+
+    def _fmt(self, index):
+        return f"{index * self.tick:.{self.decimals}f}"
+
+    def symbol_info(self):
+        """exchangeInfo symbols[] 항목"""
+        tick = f"{self.tick:.{self.decimals}f}"
+        step = f"{self.step_size:.{self.quantity_decimals}f}"
+        lot = {"minQty": step, "maxQty": "1000000", "stepSize": step}
+        return {
+            "symbol": self.symbol, "status": "TRADING", "pricePrecision": self.decimals,
+            "quantityPrecision": self.quantity_decimals,
+            "filters": [
+                {"filterType": "PRICE_FILTER", "minPrice": tick, "maxPrice": "1000000", "tickSize": tick},
+                {"filterType": "LOT_SIZE", **lot},
+                {"filterType": "MARKET_LOT_SIZE", **lot},
+                {"filterType": "MIN_NOTIONAL", "notional": f"{MIN_NOTIONAL}"},
+            ],
+        }
+
+    def reject_reason(self, quantity, price, limit, reduce_only):
+        """거래소 필터 위반 시 (code, msg), 통과하면 None (limit: 지정가 주문이면 가격 단위도 확인)"""
+        if quantity <= 0 or abs(quantity / self.step_size - round(quantity / self.step_size)) > 1e-6:
+            return -1111, "Precision is over the maximum defined for this asset."
+        if limit and abs(price / self.tick - round(price / self.tick)) > 1e-6:
+            return -1111, "Precision is over the maximum defined for this asset."
+        if not reduce_only and price * quantity < MIN_NOTIONAL:
+            return -4164, f"Order's notional must be no smaller than {MIN_NOTIONAL}"
+        return None
+
+    def _requote(self):
+        """중간가 주변 BOOK_LEVELS 호가를 새 수량으로 갱신하고, 교차하거나 멀어진 호가 삭제
+        :return: (bids 변경 [(인덱스, 수량)], asks 변경)"""
+        mid = round(self.price / self.tick)
+        bid_changes, ask_changes = [], []
+        for book, changes, side in ((self.bids, bid_changes, -1), (self.asks, ask_changes, 1)):
+            for index in list(book):
+                if side * (index - mid) <= 0 or abs(index - mid) > BOOK_DEPTH:
+                    del book[index]
+                    changes.append((index, 0.0))
+            for level in range(1, BOOK_LEVELS + 1):
+                index = mid + side * level
+                book[index] = round(self.rng.uniform(1, 1000), 1)
+                changes.append((index, book[index]))
+        return bid_changes, ask_changes
+
+    def step(self, now):
+        """
+        한 틱 진행
+        :return: [(스트림 접미사, data)] (kline 확정 메시지가 있으면 진행 중 캔들 메시지보다 먼저)
+        """
+        if self.path:
+            self.path_index = (self.path_index + 1) % len(self.path)
+            self.price = self.path[self.path_index]
+        else:
+            self.price *= math.exp(self.rng.gauss(0, 0.0005))
+        volume = self.rng.uniform(0, 50)
+
+        events = []
+        for timeframe in TIMEFRAMES:
+            interval = TIMEFRAME_MS[timeframe]
+            candle = self.candles[timeframe]
+            open_time = now // interval * interval
+            if open_time > candle[0]:
+                events.append((f"kline_{timeframe}", self._kline(timeframe, candle, now, closed=True)))
+                self.history[timeframe].append(candle)
+                candle = self.candles[timeframe] = [open_time, candle[4], candle[4], candle[4], candle[4], 0.0]
+            candle[2] = max(candle[2], self.price)
+            candle[3] = min(candle[3], self.price)
+            candle[4] = self.price
+            candle[5] += volume
+            events.append((f"kline_{timeframe}", self._kline(timeframe, candle, now, closed=False)))
+
+        bid_changes, ask_changes = self._requote()
+        first = self.update_id + 1
+        previous, self.update_id = self.update_id, self.update_id + len(bid_changes) + len(ask_changes)
+        events.append(("depth", {
+            "e": "depthUpdate", "E": now, "T": now, "s": self.symbol, "U": first, "u": self.update_id,
+            "pu": previous,
+            "b": [[self._fmt(index), f"{quantity}"] for index, quantity in bid_changes],
+            "a": [[self._fmt(index), f"{quantity}"] for index, quantity in ask_changes],
+        }))
+        return events
+
+    def _kline(self, timeframe, candle, now, closed):
+        interval = TIMEFRAME_MS[timeframe]
+        return {
+            "e": "kline", "E": now, "s": self.symbol,
+            "k": {"t": candle[0], "T": candle[0] + interval - 1, "s": self.symbol, "i": timeframe,
+                  "o": f"{candle[1]:.{self.decimals}f}", "h": f"{candle[2]:.{self.decimals}f}",
+                  "l": f"{candle[3]:.{self.decimals}f}", "c": f"{candle[4]:.{self.decimals}f}",
+                  "v": f"{candle[5]:.1f}", "x": closed}
+        }
+
+    def klines(self, timeframe, limit, start_time=None, end_time=None):
+        """/fapi/v1/klines 응답 (확정 캔들 + 진행 중 캔들)"""
+        interval = TIMEFRAME_MS[timeframe]
+        rows = self.history[timeframe] + [self.candles[timeframe]]
+        if start_time is not None:
+            rows = [row for row in rows if row[0] >= start_time][:limit]
+        else:
+            rows = rows[-limit:]
+        if end_time is not None:
+            rows = [row for row in rows if row[0] <= end_time]
+        return [[row[0], f"{row[1]:.{self.decimals}f}", f"{row[2]:.{self.decimals}f}",
+                 f"{row[3]:.{self.decimals}f}", f"{row[4]:.{self.decimals}f}", f"{row[5]:.1f}",
+                 row[0] + interval - 1, "0", 0, "0", "0", "0"] for row in rows]
+
+    def depth(self, limit):
+        """/fapi/v1/depth 응답"""
+        return {
+            "lastUpdateId": self.update_id, "E": _now_ms(), "T": _now_ms(),
+            "bids": [[self._fmt(i), f"{self.bids[i]}"] for i in sorted(self.bids, reverse=True)[:limit]],
+            "asks": [[self._fmt(i), f"{self.asks[i]}"] for i in sorted(self.asks)[:limit]],
+        }
+
+
+class ExchangeSimulator:
+    """
+    시뮬레이터 서버 상태 (시세 생성, 구독 연결, 계좌)
+
+    :param symbols: 심볼 목록
+    :param rate: 심볼당 초당 틱 수 (틱마다 kline_1m, kline_1h, depth 메시지 1개씩)
+    :param data_dir: 저장 캔들이 있으면 1m 종가를 재생 (없는 심볼은 랜덤워크)
+    :param rest_latency: REST 요청마다 더할 지연 (초)
+    """
+
+    def __init__(self, symbols, rate=10.0, seed=0, history_bars=1500, data_dir=None, balance=10_000.0,
+                 account_interval=0.0, rest_latency=0.0):
+        self.rate = rate
+        self.account_interval = account_interval
+        self.rest_latency = rest_latency  # REST 응답 전 대기 (초, 거래소까지의 왕복 지연 흉내)
+        self.markets = {symbol: SimSymbol(symbol, seed + i, history_bars, self._recorded_path(symbol, data_dir))
+                        for i, symbol in enumerate(symbols)}
+        self.subscribers = {}  # 스트림 이름 -> {WebSocketResponse: combined 여부}
+        self.user_sockets = set()
+        self.balance = balance
+        self.positions = {symbol: {'amount': 0.0, 'entry': 0.0, 'leverage': TARGET_LEVERAGE, 'updated': 0}
+                          for symbol in symbols}
+        self.order_id = 0
+        self.open_orders = {}  # 주문 ID -> 미체결 주문 (트레일링 스탑)
+        self.stats = Counter()
+        self.runner = None
+
+    @staticmethod
+    def _recorded_path(symbol, data_dir):
+        if not data_dir:
+            return None
+        from modules.backtest import load_klines
+        _, values = load_klines(symbol, '1m', data_dir)
+        return values[3].tolist() if values.shape[1] else None
+
+    # ▼ 시세 생성 / 전송
+    async def market_loop(self):
+        interval = 1 / self.rate
+        next_tick = time.monotonic()
+        while True:
+            next_tick += interval
+            now = _now_ms()
+            for market in self.markets.values():
+                for suffix, data in market.step(now):
+                    await self.publish(f"{market.symbol.lower()}@{self._stream_suffix(suffix)}", data)
+            self.stats['ticks'] += 1
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+
+    @staticmethod
+    def _stream_suffix(suffix):
+        return f"depth@{ORDERBOOK_UPDATE_SPEED}" if suffix == 'depth' else suffix
+
+    async def publish(self, stream, data):
+        sockets = self.subscribers.get(stream)
+        if not sockets:
+            return
+        payload = _dumps(data)
+        combined = f'{{"stream":"{stream}","data":{payload}}}'
+        for ws, is_combined in list(sockets.items()):
+            try:
+                await ws.send_str(combined if is_combined else payload)
+                self.stats['messages'] += 1
+            except ConnectionError:
+                sockets.pop(ws, None)
+
+    async def account_loop(self):
+        """account_interval 초마다 ACCOUNT_UPDATE (계정 스트림 부하용)"""
+        while True:
+            await asyncio.sleep(self.account_interval)
+            for symbol in self.markets:
+                await self.push_account_update(symbol, 'FUNDING_FEE')
+
+    async def push_user(self, data):
+        payload = _dumps(data)
+        for ws in list(self.user_sockets):
+            try:
+                await ws.send_str(payload)
+                self.stats['user_messages'] += 1
+            except ConnectionError:
+                self.user_sockets.discard(ws)
+
+    async def push_account_update(self, symbol, reason):
+        position = self.positions[symbol]
+        now = _now_ms()
+        await self.push_user({
+            "e": "ACCOUNT_UPDATE", "E": now, "T": now,
+            "a": {"m": reason,
+                  "B": [{"a": "USDT", "wb": f"{self.balance:.8f}", "cw": f"{self.balance:.8f}", "bc": "0"}],
+                  "P": [{"s": symbol, "pa": f"{position['amount']}", "ep": f"{position['entry']}",
+                         "cr": "0", "up": f"{self._unrealized(symbol):.8f}", "mt": "cross", "iw": "0",
+                         "ps": "BOTH"}]}
+        })
+
+    def _unrealized(self, symbol):
+        position = self.positions[symbol]
+        return (self.markets[symbol].price - position['entry']) * position['amount']
+
+    # ▼ 웹소켓
+    async def handle_stream(self, request):
+        """/stream?streams=a/b/c (combined)"""
+        streams = [s for s in request.query.get('streams', '').split('/') if s]
+        return await self._serve(request, streams, combined=True)
+
+    async def handle_ws(self, request):
+        """/ws/<스트림> 또는 /ws/<listenKey>"""
+        name = request.match_info['name']
+        if name == LISTEN_KEY:
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            self.user_sockets.add(ws)
+            try:
+                async for _ in ws:
+                    pass
+            finally:
+                self.user_sockets.discard(ws)
+            return ws
+        return await self._serve(request, [name], combined=False)
+
+    async def _serve(self, request, streams, combined):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.stats['connections'] += 1
+        for stream in streams:
+            self.subscribers.setdefault(stream, {})[ws] = combined
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                request_data = json.loads(message.data)
+                for stream in request_data.get('params', []):
+                    if request_data.get('method') == 'SUBSCRIBE':
+                        self.subscribers.setdefault(stream, {})[ws] = combined
+                    elif request_data.get('method') == 'UNSUBSCRIBE':
+                        self.subscribers.get(stream, {}).pop(ws, None)
+                await ws.send_str(_dumps({"result": None, "id": request_data.get('id')}))
+        finally:
+            for sockets in self.subscribers.values():
+                sockets.pop(ws, None)
+        return ws
+
+    # ▼ REST
+    def _json(self, data, status=200):
+        self.stats['rest_requests'] += 1
+        return web.Response(text=_dumps(data), status=status, content_type='application/json')
+
+    def _market(self, request):
+        market = self.markets.get(request.query.get('symbol'))
+        if market is None:
+            raise web.HTTPBadRequest(text=_dumps({"code": -1121, "msg": "Invalid symbol."}),
+                                     content_type='application/json')
+        return market
+
+    async def server_time(self, request):
+        return self._json({"serverTime": _now_ms()})
+
+    async def exchange_info(self, request):
+        return self._json({"timezone": "UTC", "serverTime": _now_ms(),
+                           "symbols": [market.symbol_info() for market in self.markets.values()]})
+
+    async def klines(self, request):
+        query = request.query
+        start, end = query.get('startTime'), query.get('endTime')
+        return self._json(self._market(request).klines(
+            query.get('interval', '1m'), int(query.get('limit', 500)),
+            int(start) if start else None, int(end) if end else None))
+
+    async def depth(self, request):
+        return self._json(self._market(request).depth(int(request.query.get('limit', 1000))))
+
+    async def account(self, request):
+        unrealized = sum(self._unrealized(symbol) for symbol in self.positions)
+        margin = sum(abs(p['amount'] * p['entry']) / p['leverage'] for p in self.positions.values())
+        return self._json({
+            "totalWalletBalance": f"{self.balance:.8f}", "totalUnrealizedProfit": f"{unrealized:.8f}",
+            "totalMarginBalance": f"{self.balance + unrealized:.8f}", "totalInitialMargin": f"{margin:.8f}",
+            "availableBalance": f"{self.balance + unrealized - margin:.8f}", "assets": [], "positions": [],
+        })
+
+    async def position_risk(self, request):
+        symbol = request.query.get('symbol')
+        symbols = [symbol] if symbol else list(self.positions)
+        return self._json([{
+            "symbol": s, "positionAmt": f"{self.positions[s]['amount']}", "entryPrice": f"{self.positions[s]['entry']}",
+            "breakEvenPrice": f"{self.positions[s]['entry']}", "markPrice": f"{self.markets[s].price}",
+            "unRealizedProfit": f"{self._unrealized(s):.8f}", "leverage": f"{self.positions[s]['leverage']}",
+            "updateTime": self.positions[s]['updated'],
+        } for s in symbols if s in self.positions])
+
+    async def leverage(self, request):
+        market = self._market(request)
+        self.positions[market.symbol]['leverage'] = int(request.query['leverage'])
+        return self._json({"symbol": market.symbol, "leverage": int(request.query['leverage']),
+                           "maxNotionalValue": "1000000"})
+
+    async def order(self, request):
+        """주문 (TRAILING_STOP_MARKET 은 접수만, 나머지는 즉시 전량 체결)"""
+        response, status = await self._place(self._market(request), request.query)
+        return self._json(response, status)
+
+    async def batch_orders(self, request):
+        """여러 주문 (batchOrders JSON 배열, 최대 5개, 주문별 실패는 200 응답 안의 {'code', 'msg'})"""
+        try:
+            orders = json.loads(request.query['batchOrders'])
+        except (KeyError, ValueError):
+            return self._json({"code": -1130, "msg": "Data sent for parameter 'batchOrders' is not valid."}, 400)
+        if not 0 < len(orders) <= 5:
+            return self._json({"code": -4035, "msg": "Batch order size must be between 1 and 5."}, 400)
+        self.stats['batch_requests'] += 1
+        responses = []
+        for order in orders:
+            market = self.markets.get(order.get('symbol'))
+            if market is None:
+                responses.append({"code": -1121, "msg": "Invalid symbol."})
+                continue
+            responses.append((await self._place(market, {key: str(value) for key, value in order.items()}))[0])
+        return self._json(responses)
+
+    async def _place(self, market, query):
+        """주문 하나 처리 :return: (응답, HTTP 상태 코드)"""
+        side, order_type = query.get('side'), query.get('type', 'LIMIT')
+        quantity = float(query.get('quantity', 0))
+        price = float(query.get('price') or market.price)
+        rejected = None if order_type == 'TRAILING_STOP_MARKET' else market.reject_reason(
+            quantity, price, 'price' in query, query.get('reduceOnly') == 'true')
+        if rejected is not None:
+            self.stats['rejected'] += 1
+            return {"code": rejected[0], "msg": rejected[1]}, 400
+        self.order_id += 1
+        self.stats['orders'] += 1
+        now = _now_ms()
+        status = 'NEW' if order_type == 'TRAILING_STOP_MARKET' else 'FILLED'
+        realized = 0.0
+        if status == 'FILLED':
+            realized = self._fill(market.symbol, quantity if side == 'BUY' else -quantity, price, now)
+        response = {
+            "orderId": self.order_id, "symbol": market.symbol, "status": status,
+            "clientOrderId": query.get('newClientOrderId', f"sim-{self.order_id}"), "price": f"{price}",
+            "origQty": f"{quantity}", "executedQty": f"{quantity if status == 'FILLED' else 0}", "type": order_type,
+            "side": side, "reduceOnly": query.get('reduceOnly') == 'true', "updateTime": now,
+        }
+        if status == 'NEW':
+            self.open_orders[self.order_id] = response  # 트레일링 스탑은 취소될 때까지 미체결
+        await self.push_user(self._order_event(response, 'TRADE' if status == 'FILLED' else 'NEW', now, realized))
+        if status == 'FILLED':
+            await self.push_account_update(market.symbol, 'ORDER')
+        return response, 200
+
+    @staticmethod
+    def _order_event(order, execution, now, realized=0.0):
+        """ORDER_TRADE_UPDATE (수수료 없음, TRADE 면 주문 전량이 한 번에 체결)"""
+        filled = order['origQty'] if execution == 'TRADE' else "0"
+        return {
+            "e": "ORDER_TRADE_UPDATE", "E": now, "T": now,
+            "o": {"s": order['symbol'], "c": order['clientOrderId'], "S": order['side'], "o": order['type'],
+                  "q": order['origQty'], "p": order['price'], "ap": order['price'] if execution == 'TRADE' else "0",
+                  "x": execution, "X": order['status'], "i": order['orderId'], "l": filled, "L": order['price'],
+                  "z": filled, "n": "0", "N": "USDT", "R": order['reduceOnly'], "rp": f"{realized}", "T": now}
+        }
+
+    def _fill(self, symbol, signed_quantity, price, now):
+        """포지션 반영 :return: 실현 손익 (진입이면 0)"""
+        position = self.positions[symbol]
+        position['updated'] = now
+        amount = position['amount']
+        if amount == 0 or (amount > 0) == (signed_quantity > 0):
+            total = amount + signed_quantity
+            position['entry'] = (position['entry'] * amount + price * signed_quantity) / total
+            position['amount'] = total
+            return 0.0
+        closed = min(abs(amount), abs(signed_quantity))
+        realized = (price - position['entry']) * closed * (1 if amount > 0 else -1)
+        self.balance += realized
+        position['amount'] = amount + signed_quantity
+        if abs(signed_quantity) > abs(amount):
+            position['entry'] = price  # 반대 방향으로 넘어감
+        elif position['amount'] == 0:
+            position['entry'] = 0.0
+        return realized
+
+    async def cancel_all(self, request):
+        market = self._market(request)
+        now = _now_ms()
+        for order_id, order in list(self.open_orders.items()):
+            if order['symbol'] == market.symbol:
+                del self.open_orders[order_id]
+                await self.push_user(self._order_event({**order, "status": "CANCELED"}, 'CANCELED', now))
+        return self._json({"code": 200, "msg": "The operation of cancel all open order is done."})
+
+    async def open_orders_list(self, request):
+        symbol = request.query.get('symbol')
+        return self._json([order for order in self.open_orders.values() if symbol in (None, order['symbol'])])
+
+    async def listen_key(self, request):
+        self.stats[f'listen_key_{request.method.lower()}'] += 1
+        return self._json({"listenKey": LISTEN_KEY})
+
+    # ▼ 서버
+    @web.middleware
+    async def _delay(self, request, handler):
+        if self.rest_latency and request.path.startswith('/fapi'):
+            await asyncio.sleep(self.rest_latency)
+        return await handler(request)
+
+    def app(self):
+        app = web.Application(middlewares=[self._delay])
+        app.add_routes([
+            web.get('/fapi/v1/time', self.server_time),
+            web.get('/fapi/v1/exchangeInfo', self.exchange_info),
+            web.get('/fapi/v1/klines', self.klines),
+            web.get('/fapi/v1/depth', self.depth),
+            web.get('/fapi/v2/account', self.account),
+            web.get('/fapi/v2/positionRisk', self.position_risk),
+            web.post('/fapi/v1/leverage', self.leverage),
+            web.post('/fapi/v1/order', self.order),
+            web.post('/fapi/v1/batchOrders', self.batch_orders),
+            web.delete('/fapi/v1/allOpenOrders', self.cancel_all),
+            web.get('/fapi/v1/openOrders', self.open_orders_list),
+            web.post('/fapi/v1/listenKey', self.listen_key),
+            web.put('/fapi/v1/listenKey', self.listen_key),
+            web.get('/stream', self.handle_stream),
+            web.get('/ws/{name}', self.handle_ws),
+        ])
+        return app
+
+    async def start(self, host='127.0.0.1', port=8765):
+        """
+        서버 시작 (시세 생성 태스크 포함)
+        :return: (REST base url, 웹소켓 base url)
+        """
+        self.runner = web.AppRunner(self.app(), access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = self.runner.addresses[0][1]  # port=0 이면 실제 할당된 포트
+        asyncio.create_task(self.market_loop())
+        if self.account_interval:
+            asyncio.create_task(self.account_loop())
+        return f"http://{host}:{port}", f"ws://{host}:{port}"
+
+    def start_in_thread(self, host='127.0.0.1', port=0):
+        """
+        백그라운드 스레드의 이벤트 루프에서 서버 시작 (벤치마크/부하 테스트용)
+        :return: (REST base url, 웹소켓 base url)
+        """
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+        urls = []
+
+        def run():
+            asyncio.set_event_loop(loop)
+            urls.extend(loop.run_until_complete(self.start(host, port)))
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        started.wait()
+        return tuple(urls)
+
+
+async def _serve(args):
+    simulator = ExchangeSimulator(args.symbols, args.rate, args.seed, args.history_bars, args.data_dir,
+                                  account_interval=args.account_interval, rest_latency=args.latency_ms / 1000)
+    base_url, stream_url = await simulator.start(args.host, args.port)
+    print(f"BINANCE_BASE_URL={base_url}")
+    print(f"BINANCE_STREAM_URL={stream_url}")
+    print(f"COIN_LIST={','.join(args.symbols)}")
+    while True:
+        await asyncio.sleep(10)
+        print(f"stats: {dict(simulator.stats)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', nargs='+', default=['XRPUSDT', 'DOGEUSDT', 'HBARUSDT', 'ADAUSDT', 'WIFUSDT'])
+    parser.add_argument('--rate', type=float, default=10.0, help="심볼당 초당 틱 수")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--history-bars', type=int, default=1500)
+    parser.add_argument('--data-dir', default=None, help=f"저장 캔들 재생 (예: {DATA_DIR})")
+    parser.add_argument('--account-interval', type=float, default=0.0, help="ACCOUNT_UPDATE 주기 (초, 0 이면 체결 시만)")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="REST 응답 지연 (ms)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    asyncio.run(_serve(parser.parse_args()))
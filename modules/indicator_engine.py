@@ -0,0 +1,280 @@
+import math
+from collections import deque
+
+NAN = float('nan')
+EPSILON = 2.220446049250313e-16  # sys.float_info.epsilon (pandas_ta non_zero_range/zero 와 동일)
+
+
+def _div(a, b):
+    """pandas 나눗셈과 동일하게 0 나눗셈을 nan/inf 로 처리"""
+    if b == 0:
+        if a == 0 or a != a:
+            return NAN
+        return math.copysign(math.inf, a)
+    return a / b
+
+
+class _Ewm:
+    """pandas Series.ewm(...).mean() (ignore_na=False) 재귀식을 그대로 옮긴 상태 객체"""
+    __slots__ = ('alpha', 'adjust', 'min_periods', 'weighted', 'old_wt', 'nobs')
+
+    def __init__(self, alpha, adjust, min_periods=0):
+        self.alpha = alpha
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self.weighted = NAN
+        self.old_wt = 1.0
+        self.nobs = 0
+
+    def step(self, x, commit=True):
+        weighted, old_wt = self.weighted, self.old_wt
+        is_obs = x == x
+        nobs = self.nobs + is_obs
+        if weighted == weighted:
+            old_wt *= 1.0 - self.alpha
+            if is_obs:
+                new_wt = 1.0 if self.adjust else self.alpha
+                weighted = (old_wt * weighted + new_wt * x) / (old_wt + new_wt)
+                old_wt = old_wt + new_wt if self.adjust else 1.0
+        elif is_obs:
+            weighted = x
+        if commit:
+            self.weighted, self.old_wt, self.nobs = weighted, old_wt, nobs
+        return weighted if nobs >= self.min_periods else NAN
+
+
+class _Ema:
+    """pandas_ta.ema (sma=True, adjust=False): 첫 length 개의 단순평균으로 시작하는 EMA"""
+    __slots__ = ('length', 'count', 'total', 'ewm')
+
+    def __init__(self, length):
+        self.length = length
+        self.count = 0
+        self.total = 0.0
+        self.ewm = _Ewm(2.0 / (length + 1), adjust=False)
+
+    def step(self, x, commit=True):
+        if x != x:  # 선행 NaN 은 pandas_ta 처럼 잘라낸 것으로 취급
+            return NAN
+        count = self.count + 1
+        if count < self.length:
+            if commit:
+                self.count, self.total = count, self.total + x
+            return NAN
+        if count == self.length:
+            x = (self.total + x) / self.length
+        if commit:
+            self.count = count
+        return self.ewm.step(x, commit)
+
+
+def _rma(length):
+    """pandas_ta.rma: ewm(alpha=1/length, min_periods=length).mean()"""
+    return _Ewm(1.0 / length, adjust=True, min_periods=length)
+
+
+class _RollingMean:
+    """rolling(length).mean(): 확정값 length-1 개 + 진행 중 값 1개"""
+    __slots__ = ('length', 'values')
+
+    def __init__(self, length):
+        self.length = length
+        self.values = deque(maxlen=length - 1)
+
+    def step(self, x, commit=True):
+        if x != x:  # 선행 NaN 은 잘라낸 것으로 취급 (stoch k/d)
+            return NAN
+        result = (sum(self.values) + x) / self.length if len(self.values) == self.length - 1 else NAN
+        if commit:
+            self.values.append(x)
+        return result
+
+
+class _RollingMax:
+    """rolling(length).max() (sign=-1 이면 min): 확정 구간은 단조 deque 로 유지"""
+    __slots__ = ('length', 'sign', 'window', 'count')
+
+    def __init__(self, length, sign=1.0):
+        self.length = length
+        self.sign = sign
+        self.window = deque()  # (index, sign * value), 값 내림차순
+        self.count = 0
+
+    def step(self, x, commit=True):
+        v = self.sign * x
+        window = self.window
+        result = max(window[0][1], v) if window else v
+        result = self.sign * result if self.count + 1 >= self.length else NAN
+        if commit:
+            while window and window[-1][1] <= v:
+                window.pop()
+            window.append((self.count, v))
+            self.count += 1
+            # 다음 진행 중 캔들의 윈도우에 들어갈 확정값만 남긴다
+            while window[0][0] <= self.count - self.length:
+                window.popleft()
+        return result
+
+
+class IndicatorState:
+    """
+    심볼/타임프레임 하나에 대한 BasicStrategy 지표 재귀 상태
+
+    확정 캔들까지의 상태만 보관하고, 진행 중 캔들은 그 상태에 한 번 더 적용한
+    결과(latest)로만 계산하므로 캔들 갱신/추가 모두 O(1) 입니다.
+    """
+
+    def __init__(self):
+        self.ema_200 = _Ema(200)
+        self.ema_50 = _Ema(50)
+        self.rsi_up = _rma(14)
+        self.rsi_down = _rma(14)
+        self.stoch_low = _RollingMax(14, sign=-1.0)
+        self.stoch_high = _RollingMax(14)
+        self.stoch_k = _RollingMean(3)
+        self.stoch_d = _RollingMean(3)
+        self.atr = _rma(14)
+        self.dm_plus = _rma(14)
+        self.dm_minus = _rma(14)
+        self.adx = _rma(14)
+        self.macd_fast = _Ema(12)
+        self.macd_slow = _Ema(26)
+        self.macd_signal = _Ema(9)
+        self.fib_high = _RollingMax(50)
+        self.fib_low = _RollingMax(50, sign=-1.0)
+        self.volume_ma = _RollingMean(20)
+        self.prev = None     # 직전 확정 캔들 (high, low, close)
+        self.forming = None  # 진행 중 캔들 (open_time, open, high, low, close, volume)
+        self.latest = None   # 진행 중 캔들 기준 지표 값
+
+    def update(self, open_time, open_, high, low, close, volume):
+        """
+        캔들 갱신. open_time 이 진행 중 캔들보다 크면 기존 캔들을 확정하고 새 캔들을 시작합니다.
+
+        :return: 최신 지표 딕셔너리 (과거 캔들 메시지면 None)
+        """
+        if self.forming is not None:
+            if open_time < self.forming[0]:
+                return None
+            if open_time > self.forming[0]:
+                self._step(*self.forming[1:], commit=True)
+        self.forming = (open_time, open_, high, low, close, volume)
+        row = self._step(open_, high, low, close, volume, commit=False)
+        row['Open time'] = open_time
+        self.latest = row
+        return row
+
+    def _step(self, open_, high, low, close, volume, commit):
+        if self.prev is None:
+            prev_high = prev_low = prev_close = NAN
+        else:
+            prev_high, prev_low, prev_close = self.prev
+
+        # 이동평균선
+        ema_200 = self.ema_200.step(close, commit)
+        ema_50 = self.ema_50.step(close, commit)
+
+        # RSI
+        diff = close - prev_close
+        up_avg = self.rsi_up.step(diff if not diff < 0 else 0.0, commit)
+        down_avg = self.rsi_down.step(diff if not diff > 0 else 0.0, commit)
+        rsi = _div(100.0 * up_avg, up_avg + abs(down_avg))
+
+        # Stochastic (14, 3, 3)
+        lowest = self.stoch_low.step(low, commit)
+        highest = self.stoch_high.step(high, commit)
+        stoch = _div(100.0 * (close - lowest), (highest - lowest) or EPSILON)
+        stoch_k = self.stoch_k.step(stoch, commit)
+        stoch_d = self.stoch_d.step(stoch_k, commit)
+
+        # ATR / ADX (14)
+        true_range = max(abs((high - low) or EPSILON), abs(high - prev_close), abs(prev_close - low))
+        if prev_close != prev_close:
+            true_range = NAN
+        atr = self.atr.step(true_range, commit)
+        up = high - prev_high
+        down = prev_low - low
+        plus = up if (up > down and up > 0) else (NAN if up != up else 0.0)
+        minus = down if (down > up and down > 0) else (NAN if down != down else 0.0)
+        plus = 0.0 if abs(plus) < EPSILON else plus
+        minus = 0.0 if abs(minus) < EPSILON else minus
+        k = _div(100.0, atr)
+        dmp = k * self.dm_plus.step(plus, commit)
+        dmn = k * self.dm_minus.step(minus, commit)
+        dx = _div(100.0 * abs(dmp - dmn), dmp + dmn)
+        adx = self.adx.step(dx, commit)
+
+        # MACD (12, 26, 9)
+        macd = self.macd_fast.step(close, commit) - self.macd_slow.step(close, commit)
+        macd_signal = self.macd_signal.step(macd, commit)
+
+        # 피보나치 되돌림 레벨 (50)
+        recent_high = self.fib_high.step(high, commit)
+        recent_low = self.fib_low.step(low, commit)
+        fib_range = recent_high - recent_low
+
+        volume_ma = self.volume_ma.step(volume, commit)
+
+        if commit:
+            self.prev = (high, low, close)
+
+        return {
+            'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume,
+            'ema_200': round(ema_200, 4), 'ema_50': round(ema_50, 4), 'rsi': round(rsi, 4),
+            'STOCHk_14_3_3': stoch_k, 'STOCHd_14_3_3': stoch_d,
+            'ADX_14': adx, 'DMP_14': dmp, 'DMN_14': dmn,
+            'atr': atr,
+            'MACD_12_26_9': macd, 'MACDh_12_26_9': macd - macd_signal, 'MACDs_12_26_9': macd_signal,
+            'fib_0.236': recent_high - fib_range * 0.236,
+            'fib_0.5': recent_high - fib_range * 0.5,
+            'fib_0.786': recent_high - fib_range * 0.786,
+            'volume_ma_20': volume_ma,
+        }
+
+
+class IncrementalIndicators:
+    """
+    BasicStrategy.calculate_indicators 의 증분 버전 (심볼/타임프레임별 상태 유지)
+
+    같은 캔들 이력을 넣었을 때 pandas_ta(0.3.x, TA-Lib 미사용) 결과와 상대오차 1e-9 이내로
+    일치합니다. 단, 1000봉 슬라이딩 윈도우로 매번 재계산하는 기존 방식은 EMA 시작값이
+    윈도우 첫 구간 평균으로 바뀌므로, 그 차이는 (1 - alpha) ** (윈도우 길이 - length)
+    비율로 감쇠된 만큼 남습니다 (EMA200, 1000봉 기준 약 3e-4 배).
+    """
+
+    def __init__(self, timeframes=None):
+        self.states = {}
+        self.timeframes = timeframes  # 계산할 타임프레임 (None 이면 전부)
+
+    def seed(self, symbol, timeframe, candles):
+        """과거 캔들(CandleBuffer)로 상태 초기화 (마지막 캔들은 진행 중 캔들로 취급)"""
+        if self.timeframes is not None and timeframe not in self.timeframes:
+            return
+        state = self.states[(symbol, timeframe)] = IndicatorState()
+        for row in candles.rows():
+            state.update(*row)
+
+    def update(self, symbol, timeframe, open_time, open_, high, low, close, volume):
+        """웹소켓 캔들 메시지 반영 (O(1))"""
+        if self.timeframes is not None and timeframe not in self.timeframes:
+            return None
+        state = self.states.get((symbol, timeframe))
+        if state is None:
+            state = self.states[(symbol, timeframe)] = IndicatorState()
+        return state.update(open_time, open_, high, low, close, volume)
+
+    def latest(self, symbol, timeframe):
+        """
+        진행 중 캔들 기준 최신 지표 값
+
+        :return: 지표 딕셔너리, 워밍업이 끝나지 않았으면 None (calculate_indicators 의 dropna 와 동일)
+        """
+        if self.timeframes is not None and timeframe not in self.timeframes:
+            return None
+        state = self.states.get((symbol, timeframe))
+        if state is None or state.latest is None:
+            return None
+        row = state.latest
+        if any(value != value for value in row.values()):
+            return None
+        return row
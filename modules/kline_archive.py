@@ -0,0 +1,161 @@
+"""
+심볼/타임프레임별 확정 캔들 아카이브 (DATA_DIR/klines_{symbol}_{timeframe}.bin)
+
+persistence.AsyncWriter 가 append 하는 고정 폭 레코드 파일(KLINE_DTYPE)을 np.memmap 으로 열고,
+open time 순으로 정렬된 레코드를 이분 탐색해 구간을 자르므로 (O(log n) 페이지 접근)
+몇 년치 1분봉도 텍스트 파싱이나 파일 전체 적재 없이 필요한 구간만 읽습니다.
+load_historical_data 가 예전에 저장한 탭 구분 CSV(klines_*.csv)는 import 로 아카이브에 합칩니다.
+
+    python -m modules.kline_archive import          # DATA_DIR 의 klines_*.csv 를 아카이브로 (봇을 멈춘 상태에서)
+    python -m modules.kline_archive info
+"""
+import argparse
+import glob
+import os
+import re
+from bisect import bisect_left
+import numpy as np
+import pandas as pd
+from config.settings import DATA_DIR, KST
+from modules.candle_buffer import CandleBuffer, KST_OFFSET, TIMEFRAME_MS
+from modules.persistence import KLINE_DTYPE, kline_path, read_records
+
+_CSV_NAME = re.compile(r'klines_(?P<symbol>[^_]+)_(?P<timeframe>[^_]+)\.csv$')
+
+
+def to_ms(value):
+    """epoch ms / 문자열 / datetime -> epoch ms (시간대가 없으면 KST)"""
+    if value is None or isinstance(value, (int, np.integer)):
+        return value
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize(KST)
+    return int(timestamp.value // 1_000_000)
+
+
+def read_klines(symbol, timeframe, start=None, end=None, data_dir=DATA_DIR):
+    """
+    아카이브에서 open time 이 [start, end) 인 캔들 (np.memmap 레코드 구간, 읽을 때 필요한 페이지만 적재)
+    :param start, end: epoch ms 또는 KST 시각 (None 이면 처음/끝까지)
+    """
+    records = read_records(kline_path(symbol, timeframe, data_dir), KLINE_DTYPE)
+    times = records['open_time']
+    first = bisect_left(times, to_ms(start)) if start is not None else 0
+    last = bisect_left(times, to_ms(end)) if end is not None else len(records)
+    return records[first:last]
+
+
+def last_open_time(symbol, timeframe, data_dir=DATA_DIR):
+    """아카이브의 마지막 캔들 open time (epoch ms, 비어 있으면 None)"""
+    records = read_records(kline_path(symbol, timeframe, data_dir), KLINE_DTYPE)
+    return int(records['open_time'][-1]) if len(records) else None
+
+
+def to_arrays(records):
+    """캔들 레코드 -> (open time int64[N] epoch ms, OHLCV float64[5, N]) (구간만 메모리로 복사)"""
+    if not len(records):
+        return np.empty(0, dtype=np.int64), np.empty((len(CandleBuffer.COLUMNS), 0))
+    return (np.array(records['open_time']),
+            np.stack([records[name] for name in ('open', 'high', 'low', 'close', 'volume')]))
+
+
+def to_frame(records):
+    """캔들 레코드 -> load_historical_data 형식 DataFrame ('Open time' 은 KST datetime)"""
+    times, values = to_arrays(records)
+    return pd.DataFrame({
+        'Open time': pd.to_datetime(times, unit='ms') + KST_OFFSET,
+        **{column: values[i] for i, column in enumerate(CandleBuffer.COLUMNS)}
+    })
+
+
+def merge_klines(symbol, timeframe, records, data_dir=DATA_DIR):
+    """
+    캔들 레코드를 아카이브에 합치기 (같은 open time 은 아카이브 값 유지)
+    모두 마지막 저장 캔들 이후면 이어 붙이고, 아니면 정렬/중복 제거한 파일로 교체합니다.
+    교체하는 동안 AsyncWriter 가 같은 파일에 쓰면 그 기록이 사라지므로 실행 중인 봇에서는 쓰지 않습니다.
+    :return: 새로 추가된 캔들 수
+    """
+    path = kline_path(symbol, timeframe, data_dir)
+    stored = read_records(path, KLINE_DTYPE)
+    records = np.sort(np.asarray(records, dtype=KLINE_DTYPE), order='open_time', kind='stable')
+    if not len(records):
+        return 0
+    if not len(stored) or records['open_time'][0] > stored['open_time'][-1]:
+        _, index = np.unique(records['open_time'], return_index=True)
+        with open(path, 'ab') as f:
+            records[index].tofile(f)
+        return len(index)
+
+    combined = np.concatenate([stored, records])
+    _, index = np.unique(combined['open_time'], return_index=True)  # 처음 나온 값 (아카이브) 유지
+    added = len(index) - len(stored)
+    merged = combined[index]
+    del stored  # 교체 전에 memmap 닫기
+    tmp_path = f"{path}.tmp"
+    merged.tofile(tmp_path)
+    os.replace(tmp_path, path)
+    return added
+
+
+def read_csv_klines(path, timeframe):
+    """
+    load_historical_data 가 저장한 탭 구분 CSV -> 캔들 레코드
+    마지막 줄은 저장 시점에 진행 중이던 캔들일 수 있으므로 파일 수정 시각 이전에 끝난 캔들만 남깁니다.
+    """
+    df = pd.read_csv(path, sep='\t', usecols=['Open time', *CandleBuffer.COLUMNS])
+    open_time = (pd.to_datetime(df['Open time']) - KST_OFFSET).to_numpy().astype('datetime64[ms]').astype(np.int64)
+    records = np.empty(len(df), dtype=KLINE_DTYPE)
+    records['open_time'] = open_time
+    for name, column in zip(('open', 'high', 'low', 'close', 'volume'), CandleBuffer.COLUMNS):
+        records[name] = df[column].to_numpy(dtype=np.float64)
+    saved = int(os.path.getmtime(path) * 1000)
+    return records[open_time + TIMEFRAME_MS.get(timeframe, 0) <= saved]
+
+
+def import_csv(data_dir=DATA_DIR, remove=False):
+    """
+    data_dir 의 klines_{symbol}_{timeframe}.csv 를 아카이브에 합치기
+    :param remove: True 면 합친 CSV 삭제
+    :return: {(심볼, 타임프레임): 추가된 캔들 수}
+    """
+    imported = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, 'klines_*.csv'))):
+        match = _CSV_NAME.search(os.path.basename(path))
+        if match is None:
+            continue
+        symbol, timeframe = match['symbol'], match['timeframe']
+        imported[(symbol, timeframe)] = merge_klines(symbol, timeframe, read_csv_klines(path, timeframe), data_dir)
+        if remove:
+            os.remove(path)
+    return imported
+
+
+def archive_info(data_dir=DATA_DIR):
+    """아카이브 파일별 (캔들 수, 첫/마지막 open time epoch ms, 빠진 캔들 수)"""
+    info = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, 'klines_*.bin'))):
+        symbol, timeframe = os.path.basename(path)[len('klines_'):-len('.bin')].rsplit('_', 1)
+        records = read_records(path, KLINE_DTYPE)
+        if not len(records):
+            continue
+        first, last = int(records['open_time'][0]), int(records['open_time'][-1])
+        interval = TIMEFRAME_MS.get(timeframe)
+        missing = (last - first) // interval + 1 - len(records) if interval else 0
+        info[(symbol, timeframe)] = (len(records), first, last, missing)
+    return info
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['import', 'info'])
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--remove-csv', action='store_true', help="아카이브로 합친 CSV 삭제")
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        for (symbol, timeframe), added in import_csv(args.data_dir, args.remove_csv).items():
+            print(f"{symbol:12s} {timeframe:4s} +{added} bars")
+    for (symbol, timeframe), (count, first, last, missing) in archive_info(args.data_dir).items():
+        print(f"{symbol:12s} {timeframe:4s} {count:9d} bars  "
+              f"{pd.Timestamp(first, unit='ms') + KST_OFFSET} ~ {pd.Timestamp(last, unit='ms') + KST_OFFSET}  "
+              f"missing={missing}")
@@ -0,0 +1,196 @@
+"""
+BasicStrategy 파라미터 탐색 (그리드 전체 또는 랜덤 샘플)
+
+    python -m modules.optimizer --symbols XRPUSDT DOGEUSDT --samples 2000 --rank-by sharpe_ratio
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config.settings import COIN_LIST, DATA_DIR
+from modules.backtest import Backtester, load_klines
+from modules.batch_indicators import calculate_indicators_batch, ema_rows, rolling_rows
+from modules.candle_buffer import CandleBuffer
+from strategies.basic_strategy import BasicStrategy
+
+# 기본 탐색 범위 (5 x 5 x 3 x 3 x 4 = 900 조합)
+DEFAULT_GRID = {
+    'adx_threshold': [15, 20, 25, 30, 35],
+    'ema_length': [50, 100, 150, 200, 300],
+    'volume_window': [10, 20, 40],
+    'fib_level': [0.382, 0.5, 0.618],
+    'atr_stop': [1.0, 1.5, 2.0, 3.0],
+}
+
+# max_drawdown 만 작을수록 좋음
+ASCENDING_METRICS = {'max_drawdown'}
+
+_worker = {}  # 프로세스 워커별 IndicatorCache 와 백테스트 옵션
+
+
+def grid_configs(grid=DEFAULT_GRID):
+    """그리드의 모든 파라미터 조합"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def random_configs(grid=DEFAULT_GRID, samples=100, seed=0):
+    """그리드에서 중복 없이 samples 개 조합을 무작위 추출 (조합 수보다 많으면 전체)"""
+    configs = grid_configs(grid)
+    if samples >= len(configs):
+        return configs
+    return random.Random(seed).sample(configs, samples)
+
+
+class IndicatorCache:
+    """
+    심볼별 지표 배열 캐시
+
+    파라미터와 무관한 지표(ADX, MACD, RSI, ATR, Stochastic 등)는 심볼마다 한 번만 계산하고,
+    파라미터에 따라 바뀌는 컬럼(ema_200, volume_ma_20, fib_0.5)은 값별로 한 번씩 계산해 둔 뒤
+    조합마다 배열 복사 없이 dict 만 새로 구성합니다.
+    """
+
+    def __init__(self, candles):
+        """:param candles: 심볼 -> (open time int64[N], OHLCV float64[5, N])"""
+        self.candles = candles
+        self.base = {}
+        self.variants = {}
+
+    def times(self, symbol):
+        return self.candles[symbol][0]
+
+    def indicators(self, symbol, params):
+        """params 를 적용한 심볼의 지표 배열 (컬럼 -> float64[N])"""
+        if symbol not in self.base:
+            values = self.candles[symbol][1]
+            stacked = calculate_indicators_batch({column: values[i][np.newaxis]
+                                                  for i, column in enumerate(CandleBuffer.COLUMNS)})
+            self.base[symbol] = {column: series[0] for column, series in stacked.items()}
+        base = self.base[symbol]
+        recent_high, recent_range = self._variant(symbol, 'fib_range', None)
+        return {
+            **base,
+            'ema_200': self._variant(symbol, 'ema', params['ema_length']),
+            'volume_ma_20': self._variant(symbol, 'volume_ma', params['volume_window']),
+            'fib_0.5': recent_high - recent_range * params['fib_level'],
+        }
+
+    def _variant(self, symbol, kind, value):
+        key = (symbol, kind, value)
+        if key not in self.variants:
+            base = self.base[symbol]
+            if kind == 'ema':
+                self.variants[key] = np.round(ema_rows(base['Close'][np.newaxis], (value,))[0][0], 4)
+            elif kind == 'volume_ma':
+                self.variants[key] = rolling_rows(base['Volume'][np.newaxis], value, np.mean)[0]
+            else:
+                recent_high = rolling_rows(base['High'][np.newaxis], 50, np.max)[0]
+                recent_low = rolling_rows(base['Low'][np.newaxis], 50, np.min)[0]
+                self.variants[key] = (recent_high, recent_high - recent_low)
+        return self.variants[key]
+
+
+def evaluate_config(cache, params, options=None):
+    """
+    파라미터 조합 하나를 모든 심볼에 대해 백테스트
+    :return: {'params', 'metrics' (performance_metrics), 'trades', 'net_profit'}
+    """
+    strategy = BasicStrategy(**params)
+    backtester = Backtester(strategy, **(options or {}))
+    trades = []
+    for symbol in cache.candles:
+        trades.extend(backtester.replay(symbol, cache.times(symbol), cache.indicators(symbol, params))['trades'])
+    strategy.trade_history = sorted(trades, key=lambda t: t['exit_time'])
+    return {
+        'params': params,
+        'metrics': strategy.performance_metrics(),
+        'trades': len(trades),
+        'net_profit': sum(t['profit'] for t in trades)
+    }
+
+
+def _init_worker(candles, options):
+    _worker['cache'] = IndicatorCache(candles)
+    _worker['options'] = options
+
+
+def _evaluate(params):
+    return evaluate_config(_worker['cache'], params, _worker['options'])
+
+
+class ParameterSweep:
+    """
+    BasicStrategy 파라미터 조합을 과거 캔들로 백테스트해 순위 매기기
+
+    캔들은 한 번만 읽고, 각 워커 프로세스가 IndicatorCache 로 지표를 공유하며 조합을 나눠 실행합니다.
+    결과는 BasicStrategy.performance_metrics 지표 중 rank_by 기준으로 정렬합니다.
+    """
+
+    def __init__(self, symbols=None, timeframe='1m', data_dir=DATA_DIR, workers=None, candles=None, **options):
+        """
+        :param candles: 심볼 -> (open time, OHLCV) 배열 (생략하면 data_dir 의 저장 파일에서 읽음)
+        :param options: Backtester 옵션 (balance, leverage, trade_rate, maker_fee, taker_fee)
+        """
+        if candles is None:
+            candles = {symbol: load_klines(symbol, timeframe, data_dir) for symbol in (symbols or COIN_LIST)}
+        self.candles = candles
+        self.workers = workers or os.cpu_count()
+        self.options = options
+
+    def run(self, configs, rank_by='sharpe_ratio'):
+        """
+        :param configs: 파라미터 dict 목록 (grid_configs / random_configs)
+        :return: rank_by 기준으로 정렬된 evaluate_config 결과 목록 (거래가 없는 조합은 맨 뒤)
+        """
+        if self.workers > 1 and len(configs) > 1:
+            chunksize = max(1, len(configs) // (self.workers * 4))
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.candles, self.options)) as pool:
+                results = list(pool.map(_evaluate, configs, chunksize=chunksize))
+        else:
+            cache = IndicatorCache(self.candles)
+            results = [evaluate_config(cache, params, self.options) for params in configs]
+        return rank_results(results, rank_by)
+
+
+def rank_results(results, rank_by='sharpe_ratio'):
+    """rank_by 기준 정렬 (거래가 없거나 값이 NaN 인 조합, 예: 손익 변동이 없어 샤프 지수가 NaN 이면 맨 뒤)"""
+    sign = 1 if rank_by in ASCENDING_METRICS else -1
+
+    def key(result):
+        value = result['metrics'].get(rank_by)
+        if value is None or math.isnan(value):
+            return True, 0.0
+        return False, sign * value
+    return sorted(results, key=key)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--symbols', nargs='+', default=COIN_LIST)
+    parser.add_argument('--timeframe', default='1m')
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--samples', type=int, default=None, help="랜덤 샘플 수 (생략하면 그리드 전체)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--rank-by', default='sharpe_ratio',
+                        choices=['sharpe_ratio', 'profit_factor', 'win_rate', 'max_drawdown', 'total_trades'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    configs = grid_configs() if args.samples is None else random_configs(samples=args.samples, seed=args.seed)
+    start = time.perf_counter()
+    sweep = ParameterSweep(args.symbols, args.timeframe, args.data_dir, args.workers)
+    ranked = sweep.run(configs, args.rank_by)
+    elapsed = time.perf_counter() - start
+
+    for result in ranked[:args.top]:
+        metrics = result['metrics']
+        print(f"{result['params']}  trades={result['trades']:6d}  net={result['net_profit']:10.2f}  "
+              f"{args.rank_by}={metrics.get(args.rank_by, float('nan')):.4f}")
+    print(f"{len(configs)} configs in {elapsed:.1f}s ({len(configs) / elapsed:.1f} configs/s)")
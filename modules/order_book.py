@@ -0,0 +1,159 @@
+from bisect import bisect_left, insort
+from collections import deque
+
+
+class OrderBookSide:
+    """
+    호가 한쪽 (가격 정렬 리스트 + 가격별 수량)
+
+    최우선 호가가 항상 리스트 끝에 오도록 bid 는 가격, ask 는 -가격을 키로 정렬합니다.
+    가격 탐색은 O(log n), 최우선 호가 조회/제거는 O(1) 이고, 대부분의 갱신이 일어나는
+    최우선 호가 근처의 삽입/삭제는 이동량이 작습니다.
+    """
+
+    def __init__(self, is_bid):
+        self.sign = 1.0 if is_bid else -1.0
+        self.keys = []
+        self.levels = {}  # 가격 -> 수량
+
+    def __len__(self):
+        return len(self.keys)
+
+    def clear(self):
+        self.keys.clear()
+        self.levels.clear()
+
+    def update(self, price, quantity):
+        """호가 수량 갱신 (수량 0 이면 레벨 제거)"""
+        if quantity == 0:
+            if self.levels.pop(price, None) is not None:
+                key = self.sign * price
+                if self.keys[-1] == key:
+                    self.keys.pop()
+                else:
+                    del self.keys[bisect_left(self.keys, key)]
+        else:
+            if price not in self.levels:
+                key = self.sign * price
+                if not self.keys or key > self.keys[-1]:
+                    self.keys.append(key)
+                else:
+                    insort(self.keys, key)
+            self.levels[price] = quantity
+
+    def best(self):
+        """최우선 (가격, 수량), 비어 있으면 None"""
+        if not self.keys:
+            return None
+        price = self.sign * self.keys[-1]
+        return price, self.levels[price]
+
+    def top(self, n):
+        """최우선부터 n 개 [(가격, 수량), ...]"""
+        return [(self.sign * key, self.levels[self.sign * key]) for key in reversed(self.keys[-n:])]
+
+
+class LocalOrderBook:
+    """
+    REST 스냅샷 + @depth 차분 스트림으로 유지하는 심볼별 로컬 오더북
+
+    Binance 선물 절차를 따릅니다:
+      1. 스냅샷 전에 받은 이벤트는 버퍼에 보관 (최근 max_pending 개만, 오래된 이벤트는 버려도
+         스냅샷 이전 이벤트이거나 첫 이벤트 검사에서 불연속으로 걸러짐)
+      2. 스냅샷 적용 후 u < lastUpdateId 인 이벤트는 버리고,
+         첫 이벤트는 U <= lastUpdateId <= u 여야 함
+      3. 이후 이벤트는 pu == 직전 u 여야 하며, 어긋나면 다시 스냅샷부터 동기화
+    """
+
+    MAX_PENDING = 1000
+
+    def __init__(self, symbol, max_pending=MAX_PENDING):
+        self.symbol = symbol
+        self.bids = OrderBookSide(is_bid=True)
+        self.asks = OrderBookSide(is_bid=False)
+        self.synced = False
+        self.awaiting_first = False  # 스냅샷 직후 첫 이벤트 대기 중
+        self.last_update_id = None
+        self.event_time = 0
+        self.pending = deque(maxlen=max_pending)  # 동기화 전 버퍼링된 차분 이벤트 (스냅샷 요청이 늦어져도 상한 유지)
+        self.resyncs = 0   # 시퀀스 불연속으로 재동기화한 횟수
+
+    def apply_snapshot(self, snapshot):
+        """
+        REST 스냅샷(/fapi/v1/depth) 적용 후 버퍼링된 이벤트 재생
+        :return: 동기화 성공 여부 (실패 시 새 스냅샷 필요)
+        """
+        self.bids.clear()
+        self.asks.clear()
+        for price, quantity in snapshot['bids']:
+            self.bids.update(float(price), float(quantity))
+        for price, quantity in snapshot['asks']:
+            self.asks.update(float(price), float(quantity))
+        self.last_update_id = snapshot['lastUpdateId']
+        self.synced = True
+        self.awaiting_first = True
+
+        pending, self.pending = self.pending, deque(maxlen=self.pending.maxlen)
+        for event in pending:
+            if not self.apply_diff(event):
+                return False
+        return True
+
+    def apply_diff(self, event):
+        """
+        차분 이벤트 적용
+        :return: True (적용 또는 스냅샷 이전 이벤트라 무시), False (동기화 전이거나 불연속 → 스냅샷 필요)
+        """
+        if not self.synced:
+            self.pending.append(event)
+            return False
+        if self.awaiting_first:
+            if event['u'] < self.last_update_id:
+                return True  # 스냅샷에 이미 반영된 이벤트
+            if event['U'] > self.last_update_id:
+                return self._desync(event)  # 스냅샷 이후 이벤트가 비어 있음
+            self.awaiting_first = False
+        elif event['pu'] != self.last_update_id:
+            return self._desync(event)
+        self._apply(event)
+        return True
+
+    def _apply(self, event):
+        for price, quantity in event['b']:
+            self.bids.update(float(price), float(quantity))
+        for price, quantity in event['a']:
+            self.asks.update(float(price), float(quantity))
+        self.last_update_id = event['u']
+        self.event_time = event.get('E', self.event_time)
+
+    def _desync(self, event):
+        self.synced = False
+        self.resyncs += 1
+        self.pending.clear()
+        self.pending.append(event)
+        return False
+
+    # ▼ 조회 (O(1), top-N 은 O(N))
+    def best_bid(self):
+        best = self.bids.best()
+        return best[0] if best else None
+
+    def best_ask(self):
+        best = self.asks.best()
+        return best[0] if best else None
+
+    def spread(self):
+        bid, ask = self.best_bid(), self.best_ask()
+        return None if bid is None or ask is None else ask - bid
+
+    def mid(self):
+        bid, ask = self.best_bid(), self.best_ask()
+        return None if bid is None or ask is None else (bid + ask) / 2
+
+    def depth(self, n=20):
+        """상위 n 호가 {'bids': [(가격, 수량), ...], 'asks': [...]}"""
+        return {'bids': self.bids.top(n), 'asks': self.asks.top(n)}
+
+    def snapshot(self, n=20):
+        """저장용 상위 n 호가 (웹소켓 depth 메시지와 같은 형식)"""
+        return {'E': self.event_time, 'b': self.bids.top(n), 'a': self.asks.top(n)}
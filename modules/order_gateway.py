@@ -0,0 +1,159 @@
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from config.settings import ORDER_WORKERS, ORDER_BATCH_SIZE
+from modules.rest_client import RestAPIError, shared_client
+from utils.logger import logger, log_trade
+from utils.tracing import TRACER
+
+BATCH_LIMIT = 5  # /fapi/v1/batchOrders 요청 하나의 최대 주문 수
+
+
+class SymbolLocks:
+    """
+    심볼별 락 (한 심볼의 취소 -> 주문 순서는 지키고, 다른 심볼 주문은 서로 기다리지 않도록)
+    """
+
+    def __init__(self):
+        self.locks = {}
+        self._guard = threading.Lock()  # 락 생성 경합 방지
+
+    def __call__(self, symbol):
+        lock = self.locks.get(symbol)
+        if lock is None:
+            with self._guard:
+                lock = self.locks.setdefault(symbol, threading.Lock())
+        return lock
+
+    def hold(self, symbols):
+        """여러 심볼 락을 심볼 이름 순서로 잡기 (batchOrders 용, 순서를 고정해 교착 방지)"""
+        stack = ExitStack()
+        for symbol in sorted(set(symbols)):
+            stack.enter_context(self(symbol))
+        return stack
+
+
+class OrderRequest:
+    """
+    보낼 주문 하나 (OrderHandler.plan_order 결과)
+    future: 거래소 주문 응답 (NEW/FILLED 등 접수 결과) 또는 RestAPIError
+    fill:   주문이 끝난 상태(FILLED/CANCELED/EXPIRED)의 ORDER_TRADE_UPDATE 주문 dict (OrderTracker 가 설정),
+            접수에 실패하면 future 와 같은 예외
+    """
+    __slots__ = ('symbol', 'params', 'cancel_first', 'future', 'fill')
+
+    def __init__(self, symbol, params, cancel_first=False):
+        self.symbol = symbol
+        self.params = params
+        # 응답보다 먼저 도착하는 계정 스트림 이벤트와도 맞출 수 있도록 clientOrderId 를 미리 정해 보냄
+        self.params.setdefault('newClientOrderId', uuid.uuid4().hex)
+        self.cancel_first = cancel_first  # 주문 전에 미체결 주문 전부 취소 (청산)
+        self.future = Future()
+        self.fill = Future()
+
+    @property
+    def client_order_id(self):
+        return self.params['newClientOrderId']
+
+    def fail(self, error):
+        self.future.set_exception(error)
+        self.fill.set_exception(error)
+
+
+class OrderGateway:
+    """
+    여러 심볼 주문을 동시에 전송 (trade_cycle 에서 한 번에 나온 신호들)
+
+    - 취소가 필요 없는 신규 주문은 batchOrders 로 최대 ORDER_BATCH_SIZE 개씩 묶어 REST 왕복 하나로 보냅니다
+      (주문이 하나뿐이면 /fapi/v1/order).
+    - 청산처럼 취소 -> 주문 순서가 필요한 주문은 심볼별로 스레드 풀에서 병렬로 이어 보냅니다.
+    - 같은 심볼의 요청은 심볼 락으로 순서대로, 응답을 기다리는 심볼(in_flight)에는 새 주문을 받지 않습니다.
+    - 청산 전 취소가 실패하면 취소되지 않은 주문 위에 청산 주문을 쌓지 않고 그 요청을 실패로 끝냅니다.
+    submit() 은 바로 반환하고, 주문별 OrderRequest.future 로 거래소 접수 응답을,
+    OrderRequest.fill 로 체결/취소 결과(tracker 가 있을 때, 계정 스트림 ORDER_TRADE_UPDATE)를 받습니다.
+    """
+
+    def __init__(self, rest=None, locks=None, workers=ORDER_WORKERS, batch_size=ORDER_BATCH_SIZE, tracker=None):
+        self.rest = rest or shared_client()
+        self.locks = locks or SymbolLocks()
+        self.tracker = tracker  # OrderTracker (fill Future 설정)
+        self.batch_size = max(1, min(batch_size, BATCH_LIMIT))
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='order')
+        self.in_flight = set()  # 주문 응답을 기다리는 심볼
+        self._guard = threading.Lock()
+
+    def busy(self, symbol):
+        return symbol in self.in_flight
+
+    def submit(self, requests):
+        """
+        주문 전송 시작 (응답을 기다리지 않음)
+        :param requests: [OrderRequest] (심볼당 하나)
+        :return: 심볼 -> OrderRequest (future: 접수 응답, fill: 체결/취소 결과)
+        """
+        with self._guard:
+            self.in_flight.update(request.symbol for request in requests)
+        if self.tracker is not None:
+            for request in requests:
+                self.tracker.watch(request.client_order_id, request.fill)
+        batchable = [request for request in requests if not request.cancel_first]
+        for request in requests:
+            if request.cancel_first:
+                self.pool.submit(self._send, [request])
+        for i in range(0, len(batchable), self.batch_size):
+            self.pool.submit(self._send, batchable[i:i + self.batch_size])
+        return {request.symbol: request for request in requests}
+
+    def _send(self, requests):
+        with self.locks.hold(request.symbol for request in requests):
+            try:
+                for request in requests:
+                    if request.cancel_first:
+                        self._cancel(request.symbol)
+                sent = time.monotonic_ns()
+                if len(requests) == 1:
+                    responses = [self.rest.create_order(requests[0].params)]
+                else:
+                    responses = self.rest.create_orders([request.params for request in requests])
+                acked = time.monotonic_ns()
+            except Exception as e:
+                for request in requests:
+                    logger.error(f"{request.symbol} {request.params['side']} 주문 실패: {e}")
+                    self._fail(request, e)
+                return
+            finally:
+                with self._guard:
+                    self.in_flight.difference_update(request.symbol for request in requests)
+        for request, response in zip(requests, responses):
+            self._complete(request, response, sent, acked)
+
+    def _cancel(self, symbol):
+        """미체결 주문 전부 취소 (실패하면 예외를 그대로 올려 뒤따르는 청산 주문을 보내지 않음)"""
+        try:
+            self.rest.cancel_all_orders(symbol)
+        except RestAPIError as e:
+            logger.error(f"{symbol} 오더 취소 실패 (청산 주문 생략): {e}")
+            raise
+        logger.info(f"{symbol} 모든 오더 취소 완료")
+
+    def _fail(self, request, error):
+        if self.tracker is not None:
+            self.tracker.unwatch(request.client_order_id)
+        request.fail(error)
+
+    def _complete(self, request, response, sent, acked):
+        params = request.params
+        if isinstance(response, dict) and 'code' in response and 'orderId' not in response:
+            error = RestAPIError(400, response)  # batchOrders 는 주문별 실패를 200 응답 안에 돌려줌
+            logger.error(f"{request.symbol} {params['side']} 주문 실패: {error}")
+            self._fail(request, error)
+            return
+        TRACER.order(request.symbol, sent, acked)
+        log_trade(request.symbol, params['side'], params.get('price') or 'MARKET', params['quantity'],
+                  latency_ms=round((acked - sent) / 1e6, 3))
+        request.future.set_result(response)
+
+    def close(self, wait=True):
+        self.pool.shutdown(wait=wait)
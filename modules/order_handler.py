@@ -1,83 +1,186 @@
-from binance.client import Client
-from binance.exceptions import BinanceAPIException
+import logging
 from decimal import Decimal
-from config.settings import API_KEY, SECRET_KEY, TARGET_LEVERAGE, TRADE_RATE
-from utils.logger import log_trade
-import threading
+from config.settings import TARGET_LEVERAGE, TRADE_RATE, ORDER_PRICE_SOURCE
+from modules.order_gateway import OrderGateway, OrderRequest, SymbolLocks
+from modules.rest_client import RestAPIError, shared_client
+from modules.symbol_filters import OrderValidationError
+from utils.logger import logger, log_event, log_trade
+from utils.tracing import TRACER
+import time
 
 class OrderHandler:
     def __init__(self, data_handler):
-        self.client = Client(API_KEY, SECRET_KEY)
+        self.rest = shared_client()  # 공용 REST 클라이언트 (DataHandler 와 같은 연결 풀/rate limit)
         self.data_handler = data_handler
-        self.lock = threading.Lock()
+        self.symbol_lock = SymbolLocks()  # 심볼별 락 (다른 심볼 주문끼리는 기다리지 않음)
+        self.gateway = OrderGateway(self.rest, self.symbol_lock, tracker=getattr(data_handler, 'orders', None))
 
     def set_leverage(self, symbol):
         """레버리지 설정 (기존 로직 유지)"""
         try:
-            self.client.futures_change_leverage(
-                symbol=symbol, 
-                leverage=TARGET_LEVERAGE
-            )
-        except BinanceAPIException as e:
-            print(f"{symbol} 레버리지 설정 실패: {e}")
+            response = self.rest.change_leverage(symbol, TARGET_LEVERAGE)
+            self.data_handler.account.set_position(symbol, leverage=TARGET_LEVERAGE)
+            return response
+        except RestAPIError as e:
+            logger.error(f"{symbol} 레버리지 설정 실패: {e}")
+
+    def sync_leverage(self, positions):
+        """
+        레버리지가 TARGET_LEVERAGE 와 다른 심볼만 변경
+        :param positions: 심볼 -> 포지션 정보 (DataHandler.refresh_positions 결과)
+        :return: 변경 요청한 심볼 목록
+        """
+        symbols = [symbol for symbol, position in positions.items() if position['leverage'] != TARGET_LEVERAGE]
+        for symbol in symbols:
+            self.set_leverage(symbol)
+        return symbols
 
     def cancel_all_orders(self, symbol):
         """모든 오더 취소 (기존 로직 유지)"""
         try:
-            self.client.futures_cancel_all_open_orders(symbol=symbol)
-            print(f"{symbol} 모든 오더 취소 완료")
-        except BinanceAPIException as e:
-            print(f"{symbol} 오더 취소 실패: {e}")
+            self.rest.cancel_all_orders(symbol)
+            logger.info(f"{symbol} 모든 오더 취소 완료")
+        except RestAPIError as e:
+            logger.error(f"{symbol} 오더 취소 실패: {e}")
 
     def calculate_order_amount(self, symbol):
-        """주문 금액 계산 (기존 트레이드 레이트 적용)"""
+        """주문 수량 계산 (기존 트레이드 레이트 적용, 심볼 LOT_SIZE stepSize 로 내림)"""
         balance = float(self.data_handler.balance_data['wallet'])
-        price = self.data_handler.coin_data[symbol]['1m']['Close'].iloc[-1]
-        return round((balance * TRADE_RATE * TARGET_LEVERAGE) / price, 4)
+        price = self.data_handler.coin_data[symbol]['1m'].last('Close')
+        quantity = (balance * TRADE_RATE * TARGET_LEVERAGE) / price
+        filters = self.data_handler.exchange_info.get(symbol)
+        return filters.quantize_quantity(quantity) if filters is not None else round(quantity, 4)
+
+    def limit_price(self, symbol, side, price=None):
+        """
+        지정가 주문 가격 (ORDER_PRICE_SOURCE 가 "book" 이면 로컬 오더북 최우선 호가)
+        BUY 는 최우선 매수호가, SELL 은 최우선 매도호가에 걸어 메이커로 체결되도록 합니다.
+        오더북이 동기화되지 않았으면 주어진 가격을 그대로 사용합니다.
+        """
+        if ORDER_PRICE_SOURCE != "book":
+            return price
+        book = self.data_handler.order_books.get(symbol)
+        if book is None or not book.synced:
+            return price
+        best = book.best_bid() if side == 'BUY' else book.best_ask()
+        return price if best is None else best
+
+    def order_params(self, symbol, side, order_type, quantity, price=None, **kwargs):
+        """
+        주문 요청 파라미터 생성 (exchangeInfo 필터가 있으면 가격/수량을 tickSize/stepSize 로 보정)
+        :raises OrderValidationError: 보정 후에도 최소 수량/주문 금액 등을 만족하지 않는 경우 (요청 불필요)
+        """
+        filters = self.data_handler.exchange_info.get(symbol)
+        if filters is not None:
+            candles = self.data_handler.coin_data.get(symbol, {}).get('1m')
+            reference = price or (candles.last('Close') if candles is not None and not candles.empty else None)
+            quantity, price = filters.prepare(side, order_type, quantity, price or None, reference,
+                                              reduce_only=str(kwargs.get('reduceOnly')).lower() == 'true')
+        elif price:
+            price = str(Decimal(price).normalize())
+        params = {
+            'symbol': symbol,
+            'side': side,
+            'type': order_type,
+            'quantity': quantity,
+            'timeInForce': 'GTC' if order_type == 'LIMIT' else None
+        }
+        if price: 
+            params['price'] = price
+        params.update(kwargs)
+        return params
 
     def create_order(self, symbol, side, order_type, quantity, price=None, **kwargs):
         """기본 주문 생성 (기존 로직 확장)"""
         try:
-            params = {
-                'symbol': symbol,
-                'side': side,
-                'type': order_type,
-                'quantity': quantity,
-                'timeInForce': 'GTC' if order_type == 'LIMIT' else None
-            }
-            if price: 
-                params['price'] = str(Decimal(price).normalize())
-            params.update(kwargs)
-            
-            order = self.client.futures_create_order(**params)
-            log_trade(symbol, side, price or 'MARKET', quantity)
+            params = self.order_params(symbol, side, order_type, quantity, price, **kwargs)
+            sent = time.monotonic_ns()
+            order = self.rest.create_order(params)
+            acked = time.monotonic_ns()
+            TRACER.order(symbol, sent, acked)
+            log_trade(symbol, side, params.get('price') or 'MARKET', params['quantity'],  # 보정 후 보낸 값
+                      latency_ms=round((acked - sent) / 1e6, 3))
             return order
-        except BinanceAPIException as e:
-            print(f"{symbol} {side} 주문 실패: {e}")
+        except OrderValidationError as e:
+            self.log_rejected(symbol, side, e)
+            return None
+        except RestAPIError as e:
+            logger.error(f"{symbol} {side} 주문 실패: {e}")
             return None
 
+    @staticmethod
+    def log_rejected(symbol, side, error):
+        log_event('order_rejected', f"{symbol} {side} 주문 검증 실패 (요청 생략): {error.reason}", logging.WARNING,
+                  symbol=symbol, side=side, reason=error.reason)
+
+    def plan_order(self, symbol, signals):
+        """
+        전략 신호 -> 보낼 주문 (enter_*/exit_* 와 같은 규칙: 포지션이 없을 때 BUY/SELL 진입, 있을 때 EXIT 청산)
+        같은 방향 진입 주문(reduceOnly 아님)이 이미 미체결이면 진입하지 않습니다 (체결 전 매 주기 중복 주문 방지).
+        :return: OrderRequest (보낼 주문이 없으면 None)
+        :raises OrderValidationError: 주문이 거래소 필터를 만족하지 않는 경우
+        """
+        amount = self.data_handler.position(symbol)['position_amount']
+        action = signals['action']
+        if action in ('BUY', 'SELL') and amount == 0:
+            if self.pending_entry(symbol, action):
+                return None
+            side, quantity, cancel_first = action, self.calculate_order_amount(symbol), False
+        elif action == 'EXIT' and amount != 0:
+            side, quantity, cancel_first = ('SELL' if amount > 0 else 'BUY'), abs(amount), True
+        else:
+            return None
+        price = self.limit_price(symbol, side, signals['price'])
+        return OrderRequest(symbol, self.order_params(symbol, side, 'LIMIT', quantity, price), cancel_first)
+
+    def pending_entry(self, symbol, side):
+        """계정 스트림 기준 같은 방향의 미체결 진입 주문이 있는지"""
+        orders = getattr(self.data_handler, 'orders', None)
+        return orders is not None and any(order.side == side and not order.reduce_only
+                                          for order in orders.open_orders(symbol))
+
+    def submit_signals(self, signals):
+        """
+        여러 심볼의 신호를 한 번에 주문 (OrderGateway: 신규 주문은 batchOrders, 청산은 심볼별 병렬 취소 -> 주문)
+        응답을 기다리지 않고 바로 반환합니다. 이전 주문 응답을 기다리는 심볼은 건너뜁니다.
+        :param signals: 심볼 -> 전략 신호
+        :return: 심볼 -> OrderRequest (future: 거래소 접수 응답, fill: 체결/취소 결과)
+        """
+        requests = []
+        for symbol, signal in signals.items():
+            if signal is None or self.gateway.busy(symbol):
+                continue
+            try:
+                request = self.plan_order(symbol, signal)
+            except OrderValidationError as e:
+                self.log_rejected(symbol, signal['action'], e)
+                continue
+            if request is not None:
+                requests.append(request)
+        return self.gateway.submit(requests)
+
     #▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼
     # 기존 longstart/longend/shortstart/shortend 함수 리팩토링
     #▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
 
     def enter_long(self, symbol, coin_low):
         """롱 포지션 진입 (기존 longstart 함수 대체)"""
-        with self.lock:
-            position = self.data_handler.position_data[symbol]
-            if position['position_amount'] == 0:
+        with self.symbol_lock(symbol):
+            position = self.data_handler.position(symbol)
+            if position['position_amount'] == 0 and not self.pending_entry(symbol, 'BUY'):
                 qty = self.calculate_order_amount(symbol)
                 return self.create_order(
                     symbol=symbol,
                     side='BUY',
                     order_type='LIMIT',
                     quantity=qty,
-                    price=coin_low
+                    price=self.limit_price(symbol, 'BUY', coin_low)
                 )
 
     def exit_long(self, symbol, coin_high):
         """롱 포지션 청산 (기존 longend 함수 대체)"""
-        with self.lock:
-            position = self.data_handler.position_data[symbol]
+        with self.symbol_lock(symbol):
+            position = self.data_handler.position(symbol)
             if position['position_amount'] > 0:
                 self.cancel_all_orders(symbol)
                 return self.create_order(
@@ -85,27 +188,27 @@ class OrderHandler:
                     side='SELL',
                     order_type='LIMIT',
                     quantity=abs(position['position_amount']),
-                    price=coin_high
+                    price=self.limit_price(symbol, 'SELL', coin_high)
                 )
 
     def enter_short(self, symbol, coin_high):
         """숏 포지션 진입 (기존 shortstart 함수 대체)"""
-        with self.lock:
-            position = self.data_handler.position_data[symbol]
-            if position['position_amount'] == 0:
+        with self.symbol_lock(symbol):
+            position = self.data_handler.position(symbol)
+            if position['position_amount'] == 0 and not self.pending_entry(symbol, 'SELL'):
                 qty = self.calculate_order_amount(symbol)
                 return self.create_order(
                     symbol=symbol,
                     side='SELL',
                     order_type='LIMIT',
                     quantity=qty,
-                    price=coin_high
+                    price=self.limit_price(symbol, 'SELL', coin_high)
                 )
 
     def exit_short(self, symbol, coin_low):
         """숏 포지션 청산 (기존 shortend 함수 대체)"""
-        with self.lock:
-            position = self.data_handler.position_data[symbol]
+        with self.symbol_lock(symbol):
+            position = self.data_handler.position(symbol)
             if position['position_amount'] < 0:
                 self.cancel_all_orders(symbol)
                 return self.create_order(
@@ -113,23 +216,24 @@ class OrderHandler:
                     side='BUY',
                     order_type='LIMIT',
                     quantity=abs(position['position_amount']),
-                    price=coin_low
+                    price=self.limit_price(symbol, 'BUY', coin_low)
                 )
 
     def set_trailing_stop(self, symbol, activationPrice, callbackRate):
         """트레일링 스탑 오더 설정 (신규 추가)"""
+        position = self.data_handler.position(symbol)
         try:
-            order = self.client.futures_create_order(
-                symbol=symbol,
-                side='SELL' if self.data_handler.position_data[symbol]['position_amount'] > 0 else 'BUY',
-                type='TRAILING_STOP_MARKET',
-                activationPrice=activationPrice,
-                callbackRate=callbackRate,
-                quantity=abs(self.data_handler.position_data[symbol]['position_amount'])
-            )
-            print(f"{symbol} 트레일링 스탑 설정 완료: {order}")
+            order = self.rest.create_order({
+                'symbol': symbol,
+                'side': 'SELL' if position['position_amount'] > 0 else 'BUY',
+                'type': 'TRAILING_STOP_MARKET',
+                'activationPrice': activationPrice,
+                'callbackRate': callbackRate,
+                'quantity': abs(position['position_amount'])
+            })
+            logger.info(f"{symbol} 트레일링 스탑 설정 완료: {order}")
             return order
-        except BinanceAPIException as e:
-            print(f"{symbol} 트레일링 스탑 설정 실패: {e}")
+        except RestAPIError as e:
+            logger.error(f"{symbol} 트레일링 스탑 설정 실패: {e}")
             return None
         
@@ -0,0 +1,184 @@
+import threading
+import time
+from collections import Counter
+from modules.account_state import Order
+from utils.logger import logger
+
+OPEN_STATUSES = ('NEW', 'PARTIALLY_FILLED')  # 미체결로 유지하는 주문 상태
+FINAL_STATUSES = ('FILLED', 'CANCELED', 'EXPIRED', 'EXPIRED_IN_MATCH', 'REJECTED')  # 주문이 끝난 상태
+_QUANTITY_DECIMALS = 8  # 부분 체결 수량 합의 부동소수 오차 정리 (거래소 수량 소수 자릿수 이하)
+
+
+class _RoundTrip:
+    """열린 포지션 하나의 체결 누적 (진입 체결 ~ 수량 0, 청산되면 거래 한 건)"""
+    __slots__ = ('amount', 'entry_price', 'entry_time', 'fee', 'realized', 'closed', 'exit_value')
+
+    def __init__(self, amount, entry_price, entry_time, fee=0.0):
+        self.amount = amount            # 부호 있는 수량 (롱 +, 숏 -)
+        self.entry_price = entry_price  # 진입 체결 평균 가격
+        self.entry_time = entry_time    # 첫 진입 체결 시각 (epoch ms)
+        self.fee = fee
+        self.realized = 0.0             # 청산 체결 실현 손익 합 (수수료 제외)
+        self.closed = 0.0               # 청산된 수량
+        self.exit_value = 0.0           # 청산 체결 가격 x 수량 합 (평균 청산 가격용)
+
+
+def _order_from_rest(item):
+    """/fapi/v1/openOrders 응답 항목 -> Order"""
+    return Order(order_id=int(item['orderId']), client_order_id=item.get('clientOrderId', ''), symbol=item['symbol'],
+                 side=item['side'], type=item['type'], status=item['status'], price=float(item.get('price') or 0),
+                 quantity=float(item.get('origQty') or 0), filled=float(item.get('executedQty') or 0),
+                 reduce_only=bool(item.get('reduceOnly', False)), update_time=int(item.get('updateTime') or 0))
+
+
+class OrderTracker:
+    """
+    유저 데이터 스트림(ORDER_TRADE_UPDATE) 기반 미체결 주문 / 체결 추적
+
+    - 심볼별 미체결 주문(NEW, PARTIALLY_FILLED)을 주문 이벤트만으로 유지합니다 (REST 폴링 없음).
+      심볼별 주문 dict 는 통째로 교체하므로 open_orders() 는 락 없이 읽습니다.
+    - 체결(x=TRADE)은 심볼별로 첫 진입부터 수량이 0 이 될 때까지 누적하고, 청산되면 거래 한 건을
+      trade_history 에 남깁니다 (BasicStrategy.performance_metrics / 백테스트 거래 기록과 같은 형식).
+      손익은 체결별 실현 손익(rp)의 합에서 USDT 수수료를 뺀 값입니다.
+    - 계정 스트림이 (재)연결되면 reconcile() 로 REST 미체결 주문/포지션과 맞춰 끊긴 동안 놓친 이벤트를 보정합니다.
+    - watch() 로 등록한 clientOrderId 의 주문이 끝나면(FILLED/CANCELED/EXPIRED 등) 그 Future 에 주문 dict 를 설정합니다
+      (OrderGateway 의 OrderRequest.fill).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()  # 웹소켓 스레드(apply)와 재연결 대조(reconcile) 직렬화
+        self._open = {}               # 심볼 -> {주문 ID: Order}
+        self.round_trips = {}         # 심볼 -> _RoundTrip (열린 포지션)
+        self.synced = {}              # 심볼 -> reconcile 한 포지션의 updateTime (이전 체결은 이미 반영됨)
+        self.trade_history = []       # 청산된 거래
+        self.stats = Counter()        # 실행 타입(x)별 이벤트 수
+        self.watched = {}             # clientOrderId -> 주문이 끝나면 설정할 Future
+
+    def open_orders(self, symbol=None):
+        """미체결 주문 목록 (symbol 이 없으면 전 심볼)"""
+        if symbol is not None:
+            return list(self._open.get(symbol, {}).values())
+        return [order for orders in list(self._open.values()) for order in orders.values()]
+
+    def watch(self, client_order_id, future):
+        """주문이 끝나면 future 에 ORDER_TRADE_UPDATE 주문 dict 설정 (주문 전송 전에 등록)"""
+        self.watched[client_order_id] = future
+
+    def unwatch(self, client_order_id):
+        self.watched.pop(client_order_id, None)
+
+    def apply(self, event):
+        """
+        ORDER_TRADE_UPDATE 하나 반영 (ws_codec 주문 dict)
+        :return: 이 체결로 청산된 거래 (없으면 None)
+        """
+        symbol, order_id = event['symbol'], event['order_id']
+        with self.lock:
+            self.stats[event['execution']] += 1
+            trade = None
+            if event['execution'] == 'TRADE' and event['last_quantity'] \
+                    and event['time'] > self.synced.get(symbol, 0):
+                trade = self._fill(event)
+            orders = dict(self._open.get(symbol, {}))
+            if event['status'] in OPEN_STATUSES:
+                orders[order_id] = Order(
+                    order_id=order_id, client_order_id=event['client_order_id'], symbol=symbol, side=event['side'],
+                    type=event['type'], status=event['status'], price=event['price'], quantity=event['quantity'],
+                    filled=event['filled'], reduce_only=event['reduce_only'], update_time=event['time'])
+            else:
+                orders.pop(order_id, None)  # FILLED / CANCELED / EXPIRED / REJECTED
+            self._open[symbol] = orders
+            future = self.watched.pop(event['client_order_id'], None) \
+                if event['status'] in FINAL_STATUSES else None
+        if future is not None and not future.done():
+            future.set_result(event)
+        if trade is not None:
+            logger.info(f"거래 청산 - {symbol} {trade['side']} {trade['quantity']} "
+                        f"{trade['entry_price']:.6g} -> {trade['exit_price']:.6g}, 손익 {trade['profit']:.4f}")
+        return trade
+
+    def _fill(self, event):
+        symbol, quantity, price = event['symbol'], event['last_quantity'], event['last_price']
+        signed = quantity if event['side'] == 'BUY' else -quantity
+        fee = event['fee'] if event['fee_asset'] in ('USDT', '') else 0.0  # BNB 등 다른 자산 수수료는 제외
+        trip = self.round_trips.get(symbol)
+        if trip is None:
+            self.round_trips[symbol] = _RoundTrip(signed, price, event['time'], fee)
+            return None
+        trip.fee += fee
+        if (trip.amount > 0) == (signed > 0):
+            # 같은 방향 추가 진입 (평균 진입 가격 갱신)
+            total = trip.amount + signed
+            trip.entry_price = (trip.entry_price * abs(trip.amount) + price * quantity) / abs(total)
+            trip.amount = total
+            return None
+        closed = min(abs(trip.amount), quantity)
+        realized = event['realized']
+        if realized is None:  # rp 가 없는 이벤트: 평균 진입 가격으로 계산
+            realized = (price - trip.entry_price) * closed * (1 if trip.amount > 0 else -1)
+        trip.realized += realized
+        trip.closed += closed
+        trip.exit_value += price * closed
+        remaining = round(trip.amount + signed, _QUANTITY_DECIMALS)
+        if remaining and (remaining > 0) == (trip.amount > 0):
+            trip.amount = remaining  # 부분 청산
+            return None
+        trade = self._close(symbol, trip, event['time'], event['type'])
+        if remaining:
+            self.round_trips[symbol] = _RoundTrip(remaining, price, event['time'])  # 반대 방향으로 넘어감
+        else:
+            del self.round_trips[symbol]
+        return trade
+
+    def _close(self, symbol, trip, exit_time, reason):
+        trade = {
+            'symbol': symbol,
+            'side': 'LONG' if trip.amount > 0 else 'SHORT',
+            'entry_time': trip.entry_time,
+            'exit_time': exit_time,
+            'entry_price': trip.entry_price,
+            'exit_price': trip.exit_value / trip.closed,
+            'quantity': trip.closed,
+            'fee': trip.fee,
+            'profit': trip.realized - trip.fee,
+            'reason': reason,  # 청산 주문 타입 (LIMIT, MARKET, TRAILING_STOP_MARKET 등)
+        }
+        self.trade_history.append(trade)
+        return trade
+
+    def reconcile(self, open_orders, positions=None, position_times=None):
+        """
+        REST 응답으로 미체결 주문을 교체하고 체결 누적을 포지션과 맞춤 (계정 스트림 (재)연결 시)
+        연결 직후 도착해 대기 중인 체결 이벤트 중 포지션 updateTime 이전 것은 이미 포지션에 반영된 것으로 보고
+        누적하지 않습니다 (오더북 스냅샷 이전 차분을 버리는 것과 같은 방식).
+        :param open_orders: /fapi/v1/openOrders 응답 (전 심볼)
+        :param positions: 심볼 -> Position (REST 로 갱신한 현재 포지션)
+        :param position_times: 심볼 -> positionRisk updateTime (epoch ms)
+        :return: (REST 에만 있던 주문 수, 로컬에만 있던 주문 수)
+        """
+        book = {}
+        for item in open_orders:
+            order = _order_from_rest(item)
+            book.setdefault(order.symbol, {})[order.order_id] = order
+        with self.lock:
+            before = {(order.symbol, order.order_id) for order in self.open_orders()}
+            after = {(symbol, order_id) for symbol, orders in book.items() for order_id in orders}
+            self._open = book
+            self.synced.update(position_times or {})
+            for symbol, position in (positions or {}).items():
+                amount = position['position_amount']
+                trip = self.round_trips.get(symbol)
+                if round((trip.amount if trip else 0.0) - amount, _QUANTITY_DECIMALS) == 0:
+                    continue
+                if trip is not None:
+                    logger.warning(f"{symbol} 체결 누적 {trip.amount} 이 포지션 {amount} 과 다름 "
+                                   f"(연결이 끊긴 동안 놓친 체결, 이 거래는 기록되지 않음)")
+                if amount == 0:
+                    self.round_trips.pop(symbol, None)
+                else:
+                    opened = position['entry_time']
+                    entry_time = int(opened.timestamp() * 1000) if opened else int(time.time() * 1000)
+                    self.round_trips[symbol] = _RoundTrip(amount, position['avg_price'], entry_time)
+        added, removed = len(after - before), len(before - after)
+        logger.info(f"주문 대조: 미체결 {len(after)}개 (추가 {added}, 정리 {removed})")
+        return added, removed
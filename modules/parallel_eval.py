@@ -0,0 +1,141 @@
+import atexit
+import os
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from modules.candle_buffer import CandleBuffer, KST_OFFSET
+from strategies.basic_strategy import BasicStrategy
+
+_worker = {}  # 프로세스 워커별 전략 객체
+
+
+def _snapshot_views(buf, slots, capacity):
+    """공유 메모리 블록을 (open time int64[slots, capacity], OHLCV float64[slots, 5, capacity]) 로 해석"""
+    times = np.ndarray((slots, capacity), dtype=np.int64, buffer=buf)
+    values = np.ndarray((slots, len(CandleBuffer.COLUMNS), capacity), dtype=np.float64,
+                        buffer=buf, offset=times.nbytes)
+    return times, values
+
+
+def evaluate_candles(strategy, times, values, position):
+    """
+    캔들 배열로 지표를 전부 다시 계산해 매매 신호 생성 (직렬/스레드/프로세스 공통)
+    :return: 매매 신호, 지표 워밍업 전이면 None
+    """
+    df = pd.DataFrame({
+        'Open time': pd.to_datetime(times, unit='ms') + KST_OFFSET,
+        **{column: values[i] for i, column in enumerate(CandleBuffer.COLUMNS)}
+    })
+    df = strategy.calculate_indicators(df)
+    if df.empty:
+        return None
+    return strategy.generate_trading_signals(df, position)
+
+
+def _init_worker():
+    _worker['strategy'] = BasicStrategy()
+
+
+def _evaluate_slot(shm_name, slots, capacity, slot, size, position):
+    """공유 메모리 스냅샷의 슬롯 하나 평가 (매번 연결하고 끝나면 닫아 워커에 매핑이 쌓이지 않게 함)"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        times, values = _snapshot_views(shm.buf, slots, capacity)
+        return evaluate_candles(_worker['strategy'], times[slot, :size], values[slot, :, :size], position)
+    finally:
+        times = values = None
+        shm.close()
+
+
+class SignalEvaluator:
+    """
+    심볼별 신호 생성(전체 지표 재계산)을 병렬로 실행하는 실행기
+
+    executor:
+      'serial'  - 현재 스레드에서 순서대로 (lock 안에서 심볼별 배열로 복사)
+      'thread'  - 스레드 풀 (serial 과 같은 스냅샷, NumPy 연산이 GIL 을 푸는 구간만 병렬)
+      'process' - 프로세스 풀. 매 주기 lock 안에서 캔들을 공유 메모리 스냅샷에 한 번 복사하고,
+                  워커는 슬롯 번호만 받아 복사 없이 읽습니다.
+    모든 모드가 같은 스냅샷에 같은 evaluate_candles 를 적용하므로 결과는 직렬 모드와 동일합니다.
+    """
+
+    def __init__(self, strategy=None, executor='serial', workers=None):
+        self.strategy = strategy or BasicStrategy()
+        self.executor = executor
+        self.workers = workers or os.cpu_count()
+        self.pool = None
+        self.shm = None
+        self.slots = 0
+        self.capacity = 0
+        atexit.register(self.close)
+
+    def _ensure_pool(self, slots, capacity):
+        if self.executor == 'thread':
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=self.workers)
+            return
+        if self.executor != 'process':
+            return
+        if slots <= self.slots and capacity <= self.capacity:
+            return
+        # 스냅샷 블록이 부족하면 더 크게 만들고 워커를 다시 띄움
+        self.close()
+        self.slots, self.capacity = slots, capacity
+        nbytes = slots * capacity * (1 + len(CandleBuffer.COLUMNS)) * 8
+        self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.times, self.values = _snapshot_views(self.shm.buf, slots, capacity)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+    def evaluate(self, candles, positions, symbols, lock=None):
+        """
+        :param candles: 심볼 -> CandleBuffer
+        :param positions: 심볼 -> 포지션 정보
+        :param symbols: 평가할 심볼 목록
+        :param lock: 캔들 스냅샷 동안 잡을 lock (data_handler.lock)
+        :return: 심볼 -> 매매 신호 (symbols 순서)
+        """
+        if not symbols:
+            return {}
+        capacity = max(candles[symbol].capacity for symbol in symbols)
+        self._ensure_pool(len(symbols), capacity)
+
+        if self.executor != 'process':
+            # 같은 프로세스에서 평가하므로 lock 안에서 심볼별로 복사만 해 둔다 (공유 메모리 불필요)
+            with lock or nullcontext():
+                snapshots = [(candles[s]['Open time'].copy(), np.stack([candles[s][c] for c in CandleBuffer.COLUMNS]))
+                             for s in symbols]
+            if self.executor == 'thread':
+                futures = [self.pool.submit(evaluate_candles, self.strategy, times, values, positions[s])
+                           for s, (times, values) in zip(symbols, snapshots)]
+                return {s: f.result() for s, f in zip(symbols, futures)}
+            return {s: evaluate_candles(self.strategy, times, values, positions[s])
+                    for s, (times, values) in zip(symbols, snapshots)}
+
+        sizes = []
+        with lock or nullcontext():
+            for slot, symbol in enumerate(symbols):
+                buffer = candles[symbol]
+                size = len(buffer)
+                self.times[slot, :size] = buffer['Open time']
+                for i, column in enumerate(CandleBuffer.COLUMNS):
+                    self.values[slot, i, :size] = buffer[column]
+                sizes.append(size)
+
+        futures = [self.pool.submit(_evaluate_slot, self.shm.name, self.slots, self.capacity, slot, size,
+                                    positions[symbol])
+                   for slot, (symbol, size) in enumerate(zip(symbols, sizes))]
+        return {symbol: future.result() for symbol, future in zip(symbols, futures)}
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+        if self.shm is not None:
+            self.times = self.values = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+            self.slots = self.capacity = 0
+
@@ -0,0 +1,145 @@
+import atexit
+import os
+import queue
+import threading
+import time
+import numpy as np
+from config.settings import DATA_DIR, PERSIST_FLUSH_INTERVAL, PERSIST_FSYNC
+from utils.logger import logger
+
+# 확정 캔들 레코드 (append-only, np.memmap 으로 바로 읽을 수 있는 고정 폭 바이너리)
+KLINE_DTYPE = np.dtype([
+    ('open_time', '<i8'), ('open', '<f8'), ('high', '<f8'),
+    ('low', '<f8'), ('close', '<f8'), ('volume', '<f8')
+])
+
+# 오더북 스냅샷 레코드 (레벨별 [가격, 수량], 빈 레벨은 NaN)
+ORDERBOOK_DEPTH = 20
+ORDERBOOK_DTYPE = np.dtype([
+    ('event_time', '<i8'),
+    ('bids', '<f8', (ORDERBOOK_DEPTH, 2)),
+    ('asks', '<f8', (ORDERBOOK_DEPTH, 2))
+])
+
+_STOP = object()
+
+
+def kline_path(symbol, timeframe, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f"klines_{symbol}_{timeframe}.bin")
+
+
+def orderbook_path(symbol, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f"orderbook_{symbol}.bin")
+
+
+def read_records(path, dtype):
+    """append-only 레코드 파일을 메모리 매핑으로 읽기 (파일이 없으면 빈 배열)"""
+    if not os.path.exists(path) or os.path.getsize(path) < dtype.itemsize:
+        return np.empty(0, dtype=dtype)
+    count = os.path.getsize(path) // dtype.itemsize
+    return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+
+class AsyncWriter:
+    """
+    웹소켓 콜백 대신 디스크 저장을 맡는 백그라운드 writer
+
+    콜백은 submit_* 으로 큐에 넣기만 하고, writer 스레드가 flush_interval 마다
+    모인 데이터를 합쳐(같은 캔들은 마지막 값, 오더북은 심볼별 최신 스냅샷)
+    심볼/타임프레임별 append-only 바이너리 파일에 한 번에 기록합니다.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, flush_interval=PERSIST_FLUSH_INTERVAL, fsync=PERSIST_FSYNC):
+        self.data_dir = data_dir
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.queue = queue.SimpleQueue()
+        self.last_open_time = {}  # (symbol, timeframe) -> 파일에 기록된 마지막 open time
+        self.thread = None
+        os.makedirs(data_dir, exist_ok=True)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+            atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        """남은 데이터를 모두 기록하고 writer 스레드 종료"""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join()
+
+    def submit_kline(self, symbol, timeframe, open_time, open_, high, low, close, volume):
+        """확정 캔들 저장 요청 (디스크 I/O 없음)"""
+        self.queue.put(('kline', (symbol, timeframe), (open_time, open_, high, low, close, volume)))
+
+    def submit_orderbook(self, symbol, data):
+        """오더북 상위 호가({E, b, a} 형식) 저장 요청 (디스크 I/O 없음)"""
+        self.queue.put(('orderbook', symbol, data))
+
+    def _run(self):
+        klines, orderbooks = {}, {}
+        next_flush = time.monotonic() + self.flush_interval
+        stopping = False
+        while not stopping:
+            try:
+                item = self.queue.get(timeout=max(0.0, next_flush - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                stopping = True
+            elif item is not None:
+                kind, key, payload = item
+                if kind == 'kline':
+                    klines.setdefault(key, {})[payload[0]] = payload
+                else:
+                    orderbooks[key] = payload
+            if stopping or time.monotonic() >= next_flush:
+                try:
+                    self._flush(klines, orderbooks)
+                except Exception as e:
+                    logger.error(f"데이터 저장 실패: {e}")
+                klines, orderbooks = {}, {}
+                next_flush = time.monotonic() + self.flush_interval
+
+    def _flush(self, klines, orderbooks):
+        for (symbol, timeframe), rows in klines.items():
+            path = kline_path(symbol, timeframe, self.data_dir)
+            last = self.last_open_time.get((symbol, timeframe))
+            if last is None:
+                last = self._last_stored_open_time(path)
+            rows = [rows[t] for t in sorted(rows) if last is None or t > last]
+            if rows:
+                self._append(path, np.array(rows, dtype=KLINE_DTYPE))
+                self.last_open_time[(symbol, timeframe)] = rows[-1][0]
+
+        for symbol, data in orderbooks.items():
+            record = np.zeros(1, dtype=ORDERBOOK_DTYPE)
+            record['event_time'] = data.get('E', 0)
+            for side, key in (('bids', 'b'), ('asks', 'a')):
+                levels = np.asarray(data.get(key, [])[:ORDERBOOK_DEPTH], dtype=np.float64).reshape(-1, 2)
+                record[side] = np.nan
+                record[side][0, :len(levels)] = levels
+            self._append(orderbook_path(symbol, self.data_dir), record)
+
+    def _append(self, path, records):
+        with open(path, 'ab') as f:
+            records.tofile(f)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _last_stored_open_time(self, path):
+        """파일의 마지막 캔들 open time (중단으로 잘린 마지막 레코드는 잘라냄)"""
+        if not os.path.exists(path):
+            return None
+        size = os.path.getsize(path)
+        if size % KLINE_DTYPE.itemsize:
+            size -= size % KLINE_DTYPE.itemsize
+            os.truncate(path, size)
+        if size == 0:
+            return None
+        last = np.fromfile(path, dtype=KLINE_DTYPE, count=1, offset=size - KLINE_DTYPE.itemsize)
+        return int(last['open_time'][0])
@@ -0,0 +1,258 @@
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import (API_KEY, SECRET_KEY, BASE_URL, REST_POOL_SIZE, REST_TIMEOUT,
+                             REST_WEIGHT_LIMIT, REST_ORDER_LIMIT_10S, REST_ORDER_LIMIT_1M)
+from utils.latency import LatencyHistogram
+from utils.logger import logger
+
+# 엔드포인트별 요청 weight (klines/depth 는 limit, openOrders 는 symbol 유무에 따라 request_costs 에서 계산)
+ENDPOINT_WEIGHTS = {
+    ('GET', '/fapi/v2/account'): 5,
+    ('GET', '/fapi/v2/positionRisk'): 5,
+    ('GET', '/fapi/v1/exchangeInfo'): 1,
+    ('POST', '/fapi/v1/batchOrders'): 5,
+}
+ORDER_ENDPOINTS = {('POST', '/fapi/v1/order'), ('POST', '/fapi/v1/batchOrders')}
+
+# 응답 헤더의 거래소 집계 사용량 -> WeightLimiter 버킷 이름
+USAGE_HEADERS = {
+    'X-MBX-USED-WEIGHT-1M': 'weight',
+    'X-MBX-ORDER-COUNT-10S': 'orders_10s',
+    'X-MBX-ORDER-COUNT-1M': 'orders_1m',
+}
+
+
+class RestAPIError(Exception):
+    """REST 요청 실패 (HTTP 상태 코드와 거래소 응답 보관)"""
+    def __init__(self, status, payload):
+        super().__init__(f"{status}: {payload}")
+        self.status = status
+        self.payload = payload
+
+
+def request_costs(method, path, params=None):
+    """요청 하나가 소비하는 rate limit 토큰 {'weight': n, 'orders_10s': n, 'orders_1m': n}"""
+    limit = int((params or {}).get('limit') or 500)
+    if path == '/fapi/v1/klines':
+        weight = 1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10
+    elif path == '/fapi/v1/depth':
+        weight = 2 if limit <= 50 else 5 if limit <= 100 else 10 if limit <= 500 else 20
+    elif path == '/fapi/v1/openOrders':
+        weight = 1 if (params or {}).get('symbol') else 40
+    else:
+        weight = ENDPOINT_WEIGHTS.get((method, path), 1)
+    costs = {'weight': weight}
+    if (method, path) in ORDER_ENDPOINTS:
+        orders = len((params or {}).get('batchOrders') or ()) or 1
+        costs.update(orders_10s=orders, orders_1m=orders)
+    return costs
+
+
+class WeightLimiter:
+    """
+    거래소 rate limit 토큰 버킷 (IP weight / 주문 수)
+
+    요청 전 reserve 로 토큰을 예약하고, 부족하면 채워질 때까지의 대기 시간을 돌려줍니다
+    (토큰이 음수가 되도록 예약해 두므로 몰린 요청은 도착 순서대로 줄을 섭니다).
+    응답의 X-MBX-USED-WEIGHT-1M / X-MBX-ORDER-COUNT-* 헤더로 남은 토큰을 거래소 집계에 맞추고,
+    429/418 응답을 받으면 Retry-After 동안 모든 요청을 멈춥니다. 동기/비동기 클라이언트가 함께 씁니다.
+    """
+
+    def __init__(self, limits=None):
+        """:param limits: 버킷 이름 -> (한도, 주기 초)"""
+        limits = limits or {
+            'weight': (REST_WEIGHT_LIMIT, 60),
+            'orders_10s': (REST_ORDER_LIMIT_10S, 10),
+            'orders_1m': (REST_ORDER_LIMIT_1M, 60),
+        }
+        now = time.monotonic()
+        self.lock = threading.Lock()
+        self.buckets = {name: {'limit': limit, 'rate': limit / interval, 'tokens': float(limit), 'updated': now}
+                        for name, (limit, interval) in limits.items()}
+        self.blocked_until = 0.0
+        self.waits = 0  # 한도 때문에 대기한 요청 수
+
+    def _refill(self, bucket, now):
+        bucket['tokens'] = min(bucket['limit'], bucket['tokens'] + (now - bucket['updated']) * bucket['rate'])
+        bucket['updated'] = now
+
+    def reserve(self, costs):
+        """
+        costs 만큼 토큰 예약
+        :return: 요청 전에 기다려야 할 시간 (초)
+        """
+        with self.lock:
+            now = time.monotonic()
+            wait = max(0.0, self.blocked_until - now)
+            for name, cost in costs.items():
+                bucket = self.buckets[name]
+                self._refill(bucket, now)
+                bucket['tokens'] -= cost
+                if bucket['tokens'] < 0:
+                    wait = max(wait, -bucket['tokens'] / bucket['rate'])
+            if wait > 0:
+                self.waits += 1
+            return wait
+
+    def update(self, headers, status):
+        """응답 헤더/상태 코드로 남은 토큰 보정"""
+        with self.lock:
+            now = time.monotonic()
+            for header, name in USAGE_HEADERS.items():
+                used = headers.get(header)
+                if used is not None and name in self.buckets:
+                    bucket = self.buckets[name]
+                    self._refill(bucket, now)
+                    bucket['tokens'] = min(bucket['tokens'], bucket['limit'] - int(used))
+            if status in (418, 429):
+                retry_after = int(headers.get('Retry-After') or 60)
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+                logger.warning(f"REST rate limit 응답 {status}, {retry_after}초 동안 요청 중지")
+
+
+def _param(value):
+    """쿼리 값 (batchOrders 같은 list 는 None 필드를 뺀 JSON 문자열)"""
+    if isinstance(value, list):
+        value = [{key: item for key, item in order.items() if item is not None} for order in value]
+        return json.dumps(value, separators=(',', ':'))
+    return value
+
+
+class RequestSigner:
+    """요청 쿼리 생성 + HMAC-SHA256 서명 (비밀키를 적용한 HMAC 객체를 한 번 만들어 두고 요청마다 copy)"""
+
+    def __init__(self, secret_key=SECRET_KEY):
+        self.hmac = hmac.new(secret_key.encode('utf-8'), digestmod=hashlib.sha256)
+
+    def query(self, params=None, signed=False):
+        params = {key: _param(value) for key, value in (params or {}).items() if value is not None}
+        if signed:
+            params['timestamp'] = int(time.time() * 1000)
+        query = urlencode(params)
+        if signed:
+            mac = self.hmac.copy()
+            mac.update(query.encode('utf-8'))
+            query = f"{query}&signature={mac.hexdigest()}"
+        return query
+
+
+class RestClient:
+    """
+    동기 Binance Futures REST 클라이언트 (DataHandler / OrderHandler / TimeSync 공용, shared_client())
+
+    requests.Session 연결 풀로 keep-alive 연결(TCP/TLS)을 재사용하고, 요청마다 WeightLimiter 에
+    weight/주문 수를 예약해 한도를 넘기 전에 대기합니다. 엔드포인트별 지연 시간은 latency_stats() 로 확인합니다.
+    """
+
+    def __init__(self, base_url=BASE_URL, api_key=API_KEY, secret_key=SECRET_KEY, limiter=None,
+                 pool_size=REST_POOL_SIZE, timeout=REST_TIMEOUT):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['X-MBX-APIKEY'] = api_key or ''
+        self.signer = RequestSigner(secret_key or '')
+        self.limiter = limiter or LIMITER
+        self.latency = defaultdict(LatencyHistogram)
+
+    def request(self, method, path, params=None, signed=False):
+        """
+        REST 요청
+        :param signed: True 면 timestamp/signature 추가
+        :return: JSON 응답
+        :raises RestAPIError: 거래소 오류 응답 또는 연결 실패/타임아웃 (status 0)
+        """
+        wait = self.limiter.reserve(request_costs(method, path, params))
+        if wait > 0:
+            time.sleep(wait)
+        query = self.signer.query(params, signed)
+        url = f"{self.base_url}{path}?{query}" if query else f"{self.base_url}{path}"
+
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, timeout=self.timeout)
+        except requests.RequestException as e:
+            # 연결 오류/타임아웃도 호출부의 RestAPIError 처리 경로로 (HTTP 응답이 없으므로 상태 코드 0)
+            raise RestAPIError(0, f"{type(e).__name__}: {e}") from e
+        self.latency[f"{method} {path}"].record((time.perf_counter() - start) * 1000)
+        self.limiter.update(response.headers, response.status_code)
+        try:
+            data = response.json()
+        except ValueError:
+            data = response.text
+        if response.status_code != 200:
+            raise RestAPIError(response.status_code, data)
+        return data
+
+    def latency_stats(self):
+        """엔드포인트별 지연 시간 요약 (ms)"""
+        return {endpoint: histogram.summary() for endpoint, histogram in self.latency.items()}
+
+    # ▼ 엔드포인트
+    def server_time(self):
+        return self.request('GET', '/fapi/v1/time')['serverTime']
+
+    def exchange_info(self):
+        return self.request('GET', '/fapi/v1/exchangeInfo')
+
+    def klines(self, symbol, interval, limit=500, start_time=None, end_time=None):
+        return self.request('GET', '/fapi/v1/klines', {'symbol': symbol, 'interval': interval, 'limit': limit,
+                                                       'startTime': start_time, 'endTime': end_time})
+
+    def depth(self, symbol, limit=1000):
+        return self.request('GET', '/fapi/v1/depth', {'symbol': symbol, 'limit': limit})
+
+    def account(self):
+        return self.request('GET', '/fapi/v2/account', signed=True)
+
+    def position_risk(self, symbol=None):
+        """포지션 정보 (symbol 이 없으면 전체 심볼)"""
+        return self.request('GET', '/fapi/v2/positionRisk', {'symbol': symbol}, signed=True)
+
+    def open_orders(self, symbol=None):
+        """미체결 주문 (symbol 이 없으면 전체 심볼, weight 40)"""
+        return self.request('GET', '/fapi/v1/openOrders', {'symbol': symbol}, signed=True)
+
+    def change_leverage(self, symbol, leverage):
+        return self.request('POST', '/fapi/v1/leverage', {'symbol': symbol, 'leverage': leverage}, signed=True)
+
+    def create_order(self, params):
+        return self.request('POST', '/fapi/v1/order', params, signed=True)
+
+    def create_orders(self, orders):
+        """
+        여러 주문을 한 요청으로 (/fapi/v1/batchOrders, 최대 5개)
+        :return: 주문별 응답 list (실패한 주문은 {'code', 'msg'})
+        """
+        return self.request('POST', '/fapi/v1/batchOrders', {'batchOrders': orders}, signed=True)
+
+    def cancel_all_orders(self, symbol):
+        return self.request('DELETE', '/fapi/v1/allOpenOrders', {'symbol': symbol}, signed=True)
+
+    def new_listen_key(self):
+        return self.request('POST', '/fapi/v1/listenKey')['listenKey']
+
+    def keepalive_listen_key(self):
+        return self.request('PUT', '/fapi/v1/listenKey')
+
+
+LIMITER = WeightLimiter()  # 프로세스 전체 공용 rate limit (동기/비동기 클라이언트 공유)
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def shared_client():
+    """프로세스 공용 RestClient (처음 호출 시 생성)"""
+    with _shared_lock:
+        if 'client' not in _shared:
+            _shared['client'] = RestClient()
+        return _shared['client']
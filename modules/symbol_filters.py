@@ -0,0 +1,212 @@
+"""
+심볼별 거래 규칙(exchangeInfo 필터) 캐시와 주문 가격/수량 보정
+
+/fapi/v1/exchangeInfo 는 시작 시 한 번 받아 DATA_DIR/exchange_info.json 에 저장하고 (EXCHANGE_INFO_TTL 동안
+재시작해도 다시 받지 않음), EXCHANGE_INFO_REFRESH 주기로 다시 받아 교체합니다.
+필터 값은 심볼별로 미리 float/소수 자릿수로 풀어 두어 주문마다 Decimal 파싱 없이 보정/검증합니다.
+  PRICE_FILTER  - tickSize 배수, minPrice ~ maxPrice
+  LOT_SIZE      - stepSize 배수, minQty ~ maxQty (MARKET 주문은 MARKET_LOT_SIZE)
+  MIN_NOTIONAL  - 가격 x 수량 최소 금액 (reduceOnly 주문은 제외)
+거래소에서 거절될 주문은 요청 전에 OrderValidationError 로 걸러 REST 왕복과 rate limit 을 아낍니다.
+"""
+import json
+import math
+import os
+import threading
+import time
+from config.settings import DATA_DIR, EXCHANGE_INFO_TTL
+from modules.rest_client import shared_client
+from utils.logger import logger
+
+EXCHANGE_INFO_FILE = os.path.join(DATA_DIR, "exchange_info.json")
+_EPSILON = 1e-9  # 부동소수 나눗셈 오차 (0.3 / 0.1 = 2.9999999999999996) 보정
+
+
+class OrderValidationError(ValueError):
+    """거래소 필터를 만족하지 않는 주문 (요청 전 로컬 검증 실패)"""
+
+    def __init__(self, symbol, reason):
+        super().__init__(f"{symbol}: {reason}")
+        self.symbol = symbol
+        self.reason = reason
+
+
+def _decimals(step):
+    """'0.00100000' -> 3 (문자열 그대로 세어 float 표현 오차 없이)"""
+    step = step.rstrip('0')
+    return len(step.split('.')[1]) if '.' in step else 0
+
+
+class SymbolFilters:
+    """심볼 하나의 필터 (exchangeInfo symbols[] 항목에서 생성)"""
+    __slots__ = ('symbol', 'tick_size', 'price_decimals', 'min_price', 'max_price',
+                 'step_size', 'quantity_decimals', 'min_qty', 'max_qty',
+                 'market_step_size', 'market_quantity_decimals', 'market_min_qty', 'market_max_qty',
+                 'min_notional')
+
+    def __init__(self, info):
+        filters = {item['filterType']: item for item in info.get('filters', [])}
+        price = filters.get('PRICE_FILTER', {})
+        lot = filters.get('LOT_SIZE', {})
+        market_lot = filters.get('MARKET_LOT_SIZE', lot)
+        self.symbol = info['symbol']
+        tick = price.get('tickSize', '0')
+        self.tick_size = float(tick)
+        self.price_decimals = _decimals(tick) if self.tick_size else int(info.get('pricePrecision', 8))
+        self.min_price = float(price.get('minPrice', 0))
+        self.max_price = float(price.get('maxPrice', 0))
+        step = lot.get('stepSize', '0')
+        self.step_size = float(step)
+        self.quantity_decimals = _decimals(step) if self.step_size else int(info.get('quantityPrecision', 8))
+        self.min_qty = float(lot.get('minQty', 0))
+        self.max_qty = float(lot.get('maxQty', 0))
+        market_step = market_lot.get('stepSize', step)
+        self.market_step_size = float(market_step)
+        self.market_quantity_decimals = _decimals(market_step) if self.market_step_size else self.quantity_decimals
+        self.market_min_qty = float(market_lot.get('minQty', self.min_qty))
+        self.market_max_qty = float(market_lot.get('maxQty', self.max_qty))
+        self.min_notional = float(filters.get('MIN_NOTIONAL', {}).get('notional', 0))
+
+    def quantize_price(self, price, side=None):
+        """
+        tickSize 배수로 보정 (BUY 는 내림, SELL 은 올림: 지정가가 불리한 쪽으로 넘어가지 않도록)
+        side 가 없으면 가장 가까운 값
+        """
+        if not self.tick_size:
+            return round(price, self.price_decimals)
+        ticks = price / self.tick_size
+        if side == 'BUY':
+            ticks = math.floor(ticks + _EPSILON)
+        elif side == 'SELL':
+            ticks = math.ceil(ticks - _EPSILON)
+        else:
+            ticks = round(ticks)
+        return round(ticks * self.tick_size, self.price_decimals)
+
+    def quantize_quantity(self, quantity, market=False):
+        """stepSize 배수로 내림 (주문 금액이 계산값을 넘지 않도록)"""
+        step = self.market_step_size if market else self.step_size
+        decimals = self.market_quantity_decimals if market else self.quantity_decimals
+        if not step:
+            return round(quantity, decimals)
+        return round(math.floor(quantity / step + _EPSILON) * step, decimals)
+
+    def check(self, quantity, price=None, market=False, reduce_only=False):
+        """
+        보정된 가격/수량 검증
+        :param price: 지정가 (MARKET 이면 최소 주문 금액 확인용 참고 가격, 없으면 금액 확인 생략)
+        :return: 거절 사유 (통과하면 None)
+        """
+        min_qty, max_qty = (self.market_min_qty, self.market_max_qty) if market else (self.min_qty, self.max_qty)
+        if quantity <= 0 or quantity < min_qty:
+            return f"수량 {quantity} < 최소 {min_qty}"
+        if max_qty and quantity > max_qty:
+            return f"수량 {quantity} > 최대 {max_qty}"
+        if price is not None:
+            if not market and (price < self.min_price or (self.max_price and price > self.max_price)):
+                return f"가격 {price} 범위 밖 ({self.min_price} ~ {self.max_price})"
+            if not reduce_only and price * quantity < self.min_notional:
+                return f"주문 금액 {price * quantity:.4f} < 최소 {self.min_notional}"
+        return None
+
+    def prepare(self, side, order_type, quantity, price=None, reference_price=None, reduce_only=False):
+        """
+        주문 가격/수량 보정 + 검증
+        :return: (수량 문자열, 가격 문자열 또는 None)
+        :raises OrderValidationError: 보정 후에도 필터를 만족하지 않는 경우
+        """
+        market = order_type == 'MARKET'
+        quantity = self.quantize_quantity(quantity, market)
+        if price is not None:
+            price = self.quantize_price(price, side)
+        reason = self.check(quantity, reference_price if price is None else price, market, reduce_only)
+        if reason is not None:
+            raise OrderValidationError(self.symbol, reason)
+        decimals = self.market_quantity_decimals if market else self.quantity_decimals
+        return (f"{quantity:.{decimals}f}",
+                None if price is None else f"{price:.{self.price_decimals}f}")
+
+
+class ExchangeInfoCache:
+    """
+    심볼 -> SymbolFilters 캐시 (로컬 파일 + TTL, 갱신 시 dict 를 통째로 교체하므로 읽을 때 락 없음)
+    """
+
+    def __init__(self, rest=None, path=EXCHANGE_INFO_FILE, ttl=EXCHANGE_INFO_TTL):
+        self.rest = rest or shared_client()
+        self.path = path
+        self.ttl = ttl
+        self.filters = {}
+        self.updated = 0.0  # 필터를 받은 시각 (epoch 초)
+        self._lock = threading.Lock()  # 동시 갱신 방지
+        self.stop_event = threading.Event()  # start_refresh 스레드 종료
+
+    def get(self, symbol):
+        """심볼 필터 (모르는 심볼이면 None)"""
+        return self.filters.get(symbol)
+
+    def __contains__(self, symbol):
+        return symbol in self.filters
+
+    @property
+    def fresh(self):
+        return bool(self.filters) and time.time() - self.updated < self.ttl
+
+    def load(self):
+        """메모리 -> 로컬 파일 -> REST 순으로 TTL 안의 필터 적재"""
+        if self.fresh:
+            return self
+        try:
+            with open(self.path, encoding='utf-8') as fp:
+                cached = json.load(fp)
+            if time.time() - cached['updated'] < self.ttl:
+                self.apply(cached['symbols'], cached['updated'])
+                return self
+        except (OSError, ValueError, KeyError):
+            pass
+        self.refresh()
+        return self
+
+    def refresh(self, info=None):
+        """
+        exchangeInfo 를 받아 필터 교체 + 로컬 파일 저장 (실패 시 기존 필터 유지)
+        :param info: 이미 받은 응답 (비동기 런타임), 없으면 동기 REST 요청
+        """
+        with self._lock:
+            try:
+                info = info or self.rest.exchange_info()
+            except Exception as e:
+                logger.error(f"exchangeInfo 갱신 실패 (기존 필터 {len(self.filters)}개 유지): {e}")
+                return False
+            symbols = [{'symbol': item['symbol'], 'status': item.get('status'),
+                        'pricePrecision': item.get('pricePrecision'), 'quantityPrecision': item.get('quantityPrecision'),
+                        'filters': item.get('filters', [])}
+                       for item in info.get('symbols', [])]
+            updated = time.time()
+            self.apply(symbols, updated)
+            self._save(symbols, updated)
+        logger.info(f"exchangeInfo 갱신: {len(self.filters)}개 심볼")
+        return True
+
+    def start_refresh(self, interval):
+        """interval 초마다 백그라운드 스레드에서 refresh (REST 요청/파일 저장이 매매 루프를 막지 않음)"""
+        def run():
+            while not self.stop_event.wait(interval):
+                self.refresh()
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def apply(self, symbols, updated):
+        self.filters = {item['symbol']: SymbolFilters(item) for item in symbols}
+        self.updated = updated
+
+    def _save(self, symbols, updated):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp = f"{self.path}.tmp"
+        try:
+            with open(temp, 'w', encoding='utf-8') as fp:
+                json.dump({'updated': updated, 'symbols': symbols}, fp)
+            os.replace(temp, self.path)
+        except OSError as e:
+            logger.warning(f"exchangeInfo 저장 실패: {e}")
@@ -0,0 +1,224 @@
+"""
+웹소켓 메시지 디코더 (kline / depthUpdate / ACCOUNT_UPDATE / ORDER_TRADE_UPDATE / combined stream envelope)
+
+백엔드는 WS_JSON_BACKEND 로 고르며 "auto" 면 설치된 것 중 msgspec > orjson > json 순으로 사용합니다.
+  msgspec - 스키마(Struct)로 바로 디코딩, 숫자 문자열을 float/int 로 변환하며 필요 없는 필드는 건너뜀
+  orjson  - dict/list 로 디코딩 (stdlib json 보다 빠름)
+  json    - stdlib (추가 의존성 없음)
+어느 백엔드든 핸들러에는 같은 형태(KlineTick, depth dict, 포지션/주문 dict)로 넘깁니다.
+캔들 open time 은 epoch ms 정수 그대로 두고, 화면/파일 출력 시에만 시간 형식으로 바꿉니다.
+"""
+import json
+from collections import namedtuple
+from config.settings import WS_JSON_BACKEND
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# 캔들 틱 하나 (event_time/open_time: epoch ms, closed: 캔들 확정 여부)
+KlineTick = namedtuple('KlineTick', ['symbol', 'event_time', 'open_time', 'open', 'high', 'low', 'close', 'volume',
+                                     'closed'])
+
+
+def _position(symbol, avg_price, position_amount, leverage, unrealized, breakeven=None):
+    position = {'symbol': symbol, 'avg_price': avg_price, 'position_amount': position_amount,
+                'unrealizedProfit': unrealized}
+    if leverage is not None:  # 거래소 이벤트에는 레버리지(l)가 없음 (기존 값 유지)
+        position['leverage'] = leverage
+    if breakeven is not None:
+        position['breakeven_price'] = breakeven
+    return position
+
+
+def _order(symbol, order_id, client_order_id, side, order_type, execution, status, price, quantity, filled,
+           last_quantity, last_price, fee, fee_asset, realized, reduce_only, time):
+    return {'symbol': symbol, 'order_id': order_id, 'client_order_id': client_order_id, 'side': side,
+            'type': order_type, 'execution': execution, 'status': status, 'price': price, 'quantity': quantity,
+            'filled': filled, 'last_quantity': last_quantity, 'last_price': last_price, 'fee': fee,
+            'fee_asset': fee_asset, 'realized': realized, 'reduce_only': reduce_only, 'time': time}
+
+
+class JsonCodec:
+    """dict 기반 디코더 (stdlib json / orjson)"""
+
+    def __init__(self, backend='json'):
+        self.backend = backend
+        self.loads = orjson.loads if backend == 'orjson' else json.loads
+
+    def envelope(self, message):
+        """combined stream 메시지 -> (스트림 이름, data) (구독 응답이면 스트림 이름이 None)"""
+        envelope = self.loads(message)
+        return envelope.get('stream'), envelope.get('data')
+
+    def kline(self, payload):
+        """kline 이벤트 -> KlineTick"""
+        data = self.loads(payload) if isinstance(payload, (str, bytes)) else payload
+        kline = data['k']
+        return KlineTick(data['s'], data.get('E', 0), kline['t'], float(kline['o']), float(kline['h']),
+                         float(kline['l']), float(kline['c']), float(kline['v']), kline['x'])
+
+    def depth(self, payload):
+        """depthUpdate 이벤트 -> {'E', 's', 'U', 'u', 'pu', 'b', 'a'} (LocalOrderBook.apply_diff 입력)"""
+        return self.loads(payload) if isinstance(payload, (str, bytes)) else payload
+
+    def account(self, payload):
+        """
+        계정 이벤트 -> (이벤트 타입, 내용)
+        ACCOUNT_UPDATE: 포지션 목록 [{'symbol', 'avg_price', 'position_amount', 'unrealizedProfit'}]
+          (+ 이벤트에 bep 가 있으면 'breakeven_price', l 이 있으면 'leverage')
+        ORDER_TRADE_UPDATE: 주문 dict {'symbol', 'order_id', 'side', 'type', 'execution'(x), 'status'(X), 'price',
+          'quantity', 'filled'(누적), 'last_quantity'/'last_price'(이번 체결), 'fee', 'fee_asset', 'realized'(rp), ...}
+        그 외: None
+        """
+        data = self.loads(payload) if isinstance(payload, (str, bytes)) else payload
+        event_type = data.get('e')
+        if event_type == 'ORDER_TRADE_UPDATE':
+            order = data['o']
+            return event_type, _order(
+                order['s'], int(order['i']), order.get('c', ''), order['S'], order['o'], order['x'], order['X'],
+                float(order.get('p', 0)), float(order.get('q', 0)), float(order.get('z', 0)),
+                float(order.get('l', 0)), float(order.get('L', 0)), float(order.get('n', 0)), order.get('N', ''),
+                float(order['rp']) if 'rp' in order else None, bool(order.get('R', False)),
+                int(order.get('T') or data.get('T') or data.get('E', 0)))
+        if event_type != 'ACCOUNT_UPDATE':
+            return event_type, None
+        return event_type, [
+            _position(pos['s'], float(pos['ep']), float(pos['pa']), int(pos['l']) if 'l' in pos else None,
+                      float(pos['up']), float(pos['bep']) if 'bep' in pos else None)
+            for pos in data['a']['P']
+        ]
+
+
+if msgspec is not None:
+    class _Kline(msgspec.Struct):
+        t: int
+        o: float
+        h: float
+        l: float
+        c: float
+        v: float
+        x: bool
+
+    class _KlineEvent(msgspec.Struct):
+        s: str
+        k: _Kline
+        E: int = 0
+
+    class _DepthEvent(msgspec.Struct):
+        s: str
+        U: int
+        u: int
+        pu: int
+        b: list[tuple[float, float]]
+        a: list[tuple[float, float]]
+        E: int = 0
+
+    class _Position(msgspec.Struct):
+        s: str
+        ep: float
+        pa: float
+        up: float
+        l: int | None = None
+        bep: float | None = None
+
+    class _AccountData(msgspec.Struct):
+        P: list[_Position] = []
+
+    class _Order(msgspec.Struct):
+        s: str
+        i: int
+        S: str
+        o: str
+        x: str
+        X: str
+        c: str = ''
+        p: float = 0.0
+        q: float = 0.0
+        z: float = 0.0
+        l: float = 0.0
+        L: float = 0.0
+        n: float = 0.0
+        N: str = ''
+        rp: float | None = None
+        R: bool = False
+        T: int = 0
+
+    class _AccountEvent(msgspec.Struct):
+        e: str = ''
+        E: int = 0
+        T: int = 0
+        a: _AccountData = msgspec.field(default_factory=_AccountData)
+        o: _Order | None = None
+
+    class _Envelope(msgspec.Struct):
+        stream: str | None = None
+        data: msgspec.Raw = msgspec.Raw(b'null')
+
+
+class MsgspecCodec(JsonCodec):
+    """msgspec 스키마 디코더 (이미 dict 로 파싱된 입력은 JsonCodec 경로로 처리)"""
+
+    def __init__(self):
+        super().__init__('json')
+        self.backend = 'msgspec'
+        # strict=False: 거래소가 문자열로 보내는 가격/수량을 float 로 변환
+        self.kline_decoder = msgspec.json.Decoder(_KlineEvent, strict=False)
+        self.depth_decoder = msgspec.json.Decoder(_DepthEvent, strict=False)
+        self.account_decoder = msgspec.json.Decoder(_AccountEvent, strict=False)
+        self.envelope_decoder = msgspec.json.Decoder(_Envelope)
+
+    def envelope(self, message):
+        envelope = self.envelope_decoder.decode(message)
+        return envelope.stream, envelope.data
+
+    def kline(self, payload):
+        if isinstance(payload, dict):
+            return super().kline(payload)
+        event = self.kline_decoder.decode(payload)
+        kline = event.k
+        return KlineTick(event.s, event.E, kline.t, kline.o, kline.h, kline.l, kline.c, kline.v, kline.x)
+
+    def depth(self, payload):
+        if isinstance(payload, dict):
+            return payload
+        event = self.depth_decoder.decode(payload)
+        return {'E': event.E, 's': event.s, 'U': event.U, 'u': event.u, 'pu': event.pu,
+                'b': event.b, 'a': event.a}
+
+    def account(self, payload):
+        if isinstance(payload, dict):
+            return super().account(payload)
+        event = self.account_decoder.decode(payload)
+        if event.e == 'ORDER_TRADE_UPDATE' and event.o is not None:
+            order = event.o
+            return event.e, _order(order.s, order.i, order.c, order.S, order.o, order.x, order.X, order.p, order.q,
+                                   order.z, order.l, order.L, order.n, order.N, order.rp, order.R,
+                                   order.T or event.T or event.E)
+        if event.e != 'ACCOUNT_UPDATE':
+            return event.e, None
+        return event.e, [_position(pos.s, pos.ep, pos.pa, pos.l, pos.up, pos.bep) for pos in event.a.P]
+
+
+def available_backends():
+    """설치되어 있는 백엔드 (빠른 순)"""
+    return [name for name, module in (('msgspec', msgspec), ('orjson', orjson), ('json', json))
+            if module is not None]
+
+
+def make_codec(backend=WS_JSON_BACKEND):
+    """
+    :param backend: "auto", "msgspec", "orjson", "json"
+    :raises ValueError: 설치되지 않았거나 알 수 없는 백엔드
+    """
+    if backend == 'auto':
+        backend = available_backends()[0]
+    if backend not in available_backends():
+        raise ValueError(f"사용할 수 없는 JSON 백엔드: {backend} (가능: {available_backends()})")
+    return MsgspecCodec() if backend == 'msgspec' else JsonCodec(backend)
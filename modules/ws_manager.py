@@ -1,16 +1,47 @@
-import os
 import time
-import pandas as pd
 import websocket
 import json
 import threading
-from config.settings import COIN_LIST, API_KEY , DATA_DIR
+from collections import Counter
+from config.settings import COIN_LIST, API_KEY , WS_COMBINED_STREAMS, WS_STREAMS_PER_CONNECTION, \
+    ORDERBOOK_UPDATE_SPEED, ORDERBOOK_SNAPSHOT_LIMIT, STREAM_URL, LISTEN_KEY_KEEPALIVE
 from modules.data_handler import DataHandler
-from utils.logger import logger
+from modules.candle_aggregator import BASE_TIMEFRAME
+from modules.ws_codec import make_codec
+from utils.logger import logger, log_sampled
+from utils.tracing import TRACER, stamp
+
+STREAM_BASE_URL = STREAM_URL
+
+
+class CombinedConnection:
+    """combined stream 연결 하나 (구독 중인 스트림 목록과 현재 WebSocketApp)"""
+    def __init__(self, streams):
+        self.streams = list(streams)
+        self.ws = None
+        self.request_id = 0
+
+    @property
+    def url(self):
+        return f"{STREAM_BASE_URL}/stream?streams={'/'.join(self.streams)}"
+
+    def send(self, method, streams):
+        """SUBSCRIBE/UNSUBSCRIBE 요청 (연결이 끊겨 있으면 재연결 시 url 에 반영됨)"""
+        if self.ws is None or not streams:
+            return
+        self.request_id += 1
+        try:
+            self.ws.send(json.dumps({"method": method, "params": streams, "id": self.request_id}))
+        except Exception as e:
+            logger.error(f"웹소켓 {method} 실패: {e}")
+
 
 class WebSocketManager:
+    SNAPSHOT_RETRIES = 3  # 오더북 스냅샷 동기화 실패 시 재요청 횟수
+
     def __init__(self, data_handler: DataHandler):
         self.data_handler = data_handler
+        self.codec = make_codec()  # 메시지 디코더 (WS_JSON_BACKEND)
         self.ws_connections = []
         self.coin_high = {symbol: {} for symbol in COIN_LIST}
         self.coin_low = {symbol: {} for symbol in COIN_LIST}
@@ -18,17 +49,29 @@ class WebSocketManager:
         
         # 계정 업데이트 웹소켓 별도 관리
         self.account_ws = None
+        self.listen_key = None
+
+        # combined stream 모드: 연결 목록, 스트림 이름 -> 핸들러, 스트림별 수신/누락 카운터
+        self.combined_connections = []
+        self.stream_routes = {}
+        self.stream_counts = Counter()
+        self.stream_gaps = Counter()
+        self.last_update_id = {}
+
+        # 로컬 오더북 스냅샷 요청이 진행 중인 심볼
+        self.snapshot_requests = set()
 
-    def _start_single_websocket(self, url, on_message):
-        """개별 웹소켓 연결 관리"""
+    def _start_single_websocket(self, url, on_message, on_open=None):
+        """개별 웹소켓 연결 관리 (url 이 callable 이면 재연결마다 다시 계산)"""
         def run():
             while not self.stop_event.is_set():
                 try:
                     ws = websocket.WebSocketApp(
-                        url,
+                        url() if callable(url) else url,
                         on_message=on_message,
                         on_error=self.on_error,
-                        on_close=self.on_close
+                        on_close=self.on_close,
+                        on_open=on_open
                     )
                     ws.run_forever()
                 except Exception as e:
@@ -41,109 +84,261 @@ class WebSocketManager:
 
     # 기존 on_message_account_update 로직 완전 재현
     def _on_account_update(self, ws, message):
-        data = json.loads(message)
-        event_type = data.get('e')
-        
+        event_type, data = self.codec.account(message)
+
         if event_type == 'ACCOUNT_UPDATE':
-            positions = data['a']['P']
-            for pos in positions:
-                symbol = pos['s']
-                self.data_handler.position_data[symbol] = {
-                    'avg_price': float(pos['ep']),
-                    'position_amount': float(pos['pa']),
-                    'leverage': int(pos['l']),
-                    'unrealizedProfit': float(pos['up'])
-                }
+            # 이벤트에 없는 필드(breakeven_price 등)와 entry_time 은 기존 포지션 값을 이어 받음
+            self.data_handler.account.apply_positions({pos.pop('symbol'): pos for pos in data})
             logger.info("포지션 업데이트 완료")
+        elif event_type == 'ORDER_TRADE_UPDATE':
+            # 주문 접수/체결/취소 -> 미체결 주문, 청산된 거래 기록
+            self.data_handler.orders.apply(data)
+
+    # 오더북: @depth 차분 스트림으로 로컬 오더북 유지 (기존 depth20 스냅샷 저장 대체)
+    def _on_depth(self, ws, message):
+        return self._handle_depth(message, stamp())
 
-    # 기존 on_message_orderbook 로직 재현
-    def _on_orderbook(self, ws, message):
-        data = json.loads(message)
+    def _handle_depth(self, data, received=None):
+        """
+        :param data: depthUpdate 메시지 (원본 또는 codec.depth 결과)
+        :param received: 수신 시각 (tracing.stamp(), 지연 시간 기록용)
+        """
+        received = received or stamp()
+        data = self.codec.depth(data)
         symbol = data['s']
         with self.data_handler.lock:
-            self.data_handler.orderbook_data[symbol] = data
+            book = self.data_handler.order_books.get(symbol)
+            if book is None:
+                return
+            if not book.apply_diff(data):
+                self._request_snapshot(symbol)  # 아직 동기화 전이거나 시퀀스 불연속
+                return
+            self.coin_low[symbol] = book.best_bid()   # 최우선 매수호가
+            self.coin_high[symbol] = book.best_ask()  # 최우선 매도호가
+            self.data_handler.orderbook_data[symbol] = book.snapshot(20)
             self.data_handler.save_orderbook_data(symbol)
-        self.coin_low[symbol] = float(data["b"][-1][0])  # bids 리스트의 마지막 가격
-        self.coin_high[symbol]  = float(data["a"][-1][0])  # asks 리스트의 마지막 가격
-        print(self.coin_low[symbol],self.coin_high[symbol])
-        return self.coin_low , self.coin_high
-    # 기존 on_message_1m/1h 캔들 처리 재현
-    def _on_kline(self, ws, message, timeframe, save_to_file=True):
-        data = json.loads(message)
-        kline = data['k']
-        symbol = data['s']
-        # open_time = pd.to_datetime(candle['t'], unit='ms') + pd.Timedelta(hours=9)  # UTC+9로 변환
-        # open_time_str = open_time.strftime('%Y-%m-%d %H:%M')  # 형식 변환
+        TRACER.depth(data.get('E'), received)
+        log_sampled(f"depth:{symbol}", 'depth', "오더북 갱신", symbol=symbol,
+                    bid=self.coin_low[symbol], ask=self.coin_high[symbol], update_id=data['u'])
+        return self.coin_low, self.coin_high
+
+    def _request_snapshot(self, symbol):
+        """REST 오더북 스냅샷을 백그라운드로 받아 로컬 오더북 동기화 (심볼별 요청 1개)"""
+        if symbol in self.snapshot_requests:
+            return
+        self.snapshot_requests.add(symbol)
+
+        def run():
+            try:
+                for _ in range(self.SNAPSHOT_RETRIES):
+                    snapshot = self.data_handler.rest.depth(symbol, ORDERBOOK_SNAPSHOT_LIMIT)
+                    with self.data_handler.lock:
+                        book = self.data_handler.order_books.get(symbol)
+                        if book is None or book.apply_snapshot(snapshot):
+                            return
+                    logger.warning(f"{symbol} 오더북 스냅샷 이후 이벤트 불연속, 다시 요청")
+            except Exception as e:
+                logger.error(f"{symbol} 오더북 스냅샷 요청 실패: {e}")
+            finally:
+                self.snapshot_requests.discard(symbol)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    # 기존 on_message_1m 캔들 처리 재현 (상위 타임프레임은 1분봉에서 집계)
+    def _on_kline(self, ws, message, timeframe=BASE_TIMEFRAME, save_to_file=True):
+        self._handle_kline(message, timeframe, save_to_file, stamp())
+
+    def _handle_kline(self, data, timeframe=BASE_TIMEFRAME, save_to_file=True, received=None):
+        """
+        :param data: kline 메시지 (원본 또는 파싱된 dict)
+        :param received: 수신 시각 (tracing.stamp(), 지연 시간 기록용)
+        """
+        received = received or stamp()
+        tick = self.codec.kline(data)
+        parsed = time.monotonic_ns()
+        symbol = tick.symbol
+
+        # 신규 데이터 생성 (open time 은 epoch ms 그대로 사용)
+        open_time = tick.open_time
+        ohlcv = (tick.open, tick.high, tick.low, tick.close, tick.volume)
 
         with self.data_handler.lock:
-            if self.data_handler.coin_data[symbol][timeframe].empty:
-                self.data_handler.coin_data[symbol][timeframe] = pd.DataFrame(columns=[
-                    'Open time', 'Open', 'High', 'Low', 'Close', 'Volume'
-                ])
-                
-            df = self.data_handler.coin_data[symbol][timeframe]
-
-            # 신규 데이터 생성
-            new_row = {
-                'Open time': pd.to_datetime(kline['t'], unit='ms') + pd.Timedelta(hours=9),
-                'Open': float(kline['o']),
-                'High': float(kline['h']),
-                'Low': float(kline['l']),
-                'Close': float(kline['c']),
-                'Volume': float(kline['v'])
-            }
-            
-            # 데이터 업데이트
-            if kline['x']:  # 캔들 종료
-                df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-                if len(df) > 1000:
-                    df = df.iloc[1:]  # 80개의 최신 데이터 유지
-
-            else:  # 캔들 업데이트
-                # if not df.empty:
-                #     df.iloc[-1] = list(new_row.values())
-                # 캔들 진행 중: OHLCV만 업데이트
-                if not df.empty:
-                    df.loc[df.index[-1], ['Open', 'High', 'Low', 'Close', 'Volume']] = [
-                        new_row['Open'], new_row['High'], new_row['Low'], 
-                        new_row['Close'], new_row['Volume']
-                    ]
- 
-            self.data_handler.coin_data[symbol][timeframe] = df
-
-            # 파일로 저장 (옵션)
-            if save_to_file:
-                file_path = os.path.join(DATA_DIR, f"klines_{symbol}_{timeframe}.csv")
-                df.to_csv(file_path, index=False, sep='\t')
+            candles = self.data_handler.coin_data[symbol][timeframe]
+
+            # 데이터 업데이트: 같은 open time 이면 진행 중 캔들 갱신, 새 open time 이면 추가 (링버퍼, O(1))
+            if candles.upsert(open_time, *ohlcv) is None:
+                return  # 이미 지난 캔들 메시지
+
+            self.data_handler.data_version[(symbol, timeframe)] += 1
+            updated = time.monotonic_ns()
+
+            # 증분 지표 갱신 (O(1)) + 1분봉이면 상위 타임프레임 캔들/지표 집계
+            self.data_handler.indicators.update(symbol, timeframe, open_time, *ohlcv)
+            if timeframe == BASE_TIMEFRAME:
+                self.data_handler.aggregate_kline(symbol, open_time, *ohlcv)
+        TRACER.kline(symbol, tick.event_time, received, parsed, updated, time.monotonic_ns())
+        log_sampled(f"kline:{symbol}:{timeframe}", 'kline', "캔들 갱신", symbol=symbol, timeframe=timeframe,
+                    open_time=open_time, close=tick.close)
+
+        # 파일로 저장 (옵션): 확정 캔들만 백그라운드 writer 에 전달
+        if save_to_file and tick.closed:
+            self.data_handler.writer.submit_kline(symbol, timeframe, open_time, *ohlcv)
 
     def start_account_websocket(self):
-        """계정 업데이트 웹소켓 (기존 start_account_update_websocket 재현)"""
-        listen_key = self.data_handler.client.futures_stream_get_listen_key()
-        url = f"wss://fstream.binance.com/ws/{listen_key}"
-        self.account_ws = self._start_single_websocket(url, self._on_account_update)
+        """
+        계정 업데이트 웹소켓 (기존 start_account_update_websocket 재현)
+        연결할 때마다 listen key 를 받고 (만료됐으면 새 키), 연결되면 REST 로 포지션/미체결 주문을 대조합니다.
+        listen key 는 백그라운드 스레드가 LISTEN_KEY_KEEPALIVE 주기로 연장합니다.
+        """
+        self.account_ws = self._start_single_websocket(self._account_url, self._on_account_update,
+                                                       on_open=lambda ws: self.data_handler.reconcile_orders())
+        threading.Thread(target=self._keepalive_listen_key, daemon=True).start()
+
+    def _account_url(self):
+        self.listen_key = self.data_handler.rest.new_listen_key()
+        return f"{STREAM_BASE_URL}/ws/{self.listen_key}"
+
+    def _keepalive_listen_key(self):
+        while not self.stop_event.wait(LISTEN_KEY_KEEPALIVE):
+            try:
+                self.data_handler.rest.keepalive_listen_key()
+            except Exception as e:  # REST 오류 / 연결 오류 / 타임아웃: 스레드를 유지하고 다음 주기에 다시 연장
+                logger.error(f"listen key 연장 실패 (재연결 시 새로 발급): {e}")
 
     def start_coin_websockets(self):
-        """코인별 웹소켓 3개씩 생성 (기존 start_websocket 함수 재현)"""
+        """코인별 웹소켓 2개씩 생성 (기존 start_websocket 함수 재현, 1시간 캔들은 1분봉에서 집계)"""
+        if WS_COMBINED_STREAMS:
+            return self.start_combined_websockets(COIN_LIST)
+
         for symbol in COIN_LIST:
             symbol_lower = symbol.lower()
             
             # 1. 오더북 웹소켓
             self._start_single_websocket(
-                f"wss://fstream.binance.com/ws/{symbol_lower}@depth20@500ms",
-                self._on_orderbook
+                f"{STREAM_BASE_URL}/ws/{symbol_lower}@depth@{ORDERBOOK_UPDATE_SPEED}",
+                self._on_depth
             )
             
             # 2. 1분 캔들 웹소켓
             self._start_single_websocket(
-                f"wss://fstream.binance.com/ws/{symbol_lower}@kline_1m",
-                lambda ws, msg: self._on_kline(ws, msg, '1m')
+                f"{STREAM_BASE_URL}/ws/{symbol_lower}@kline_{BASE_TIMEFRAME}",
+                lambda ws, msg: self._on_kline(ws, msg)
             )
-            
-            # 3. 1시간 캔들 웹소켓
-            self._start_single_websocket(
-                f"wss://fstream.binance.com/ws/{symbol_lower}@kline_1h",
-                lambda ws, msg: self._on_kline(ws, msg, '1h')
+
+    # ▼ combined stream 모드: 모든 심볼/스트림을 소수의 연결로 다중화
+    def _symbol_streams(self, symbol):
+        """심볼별 구독 스트림 이름과 핸들러 (개별 연결 모드와 같은 오더북 + 1분봉 스트림)"""
+        symbol_lower = symbol.lower()
+        return {
+            f"{symbol_lower}@depth@{ORDERBOOK_UPDATE_SPEED}": self._handle_depth,
+            f"{symbol_lower}@kline_{BASE_TIMEFRAME}": self._handle_kline,
+        }
+
+    def register_streams(self, symbols):
+        """
+        심볼들의 스트림 라우팅 등록
+        :return: 연결 단위(최대 WS_STREAMS_PER_CONNECTION 개)로 나눈 스트림 이름 목록
+        """
+        routes = {}
+        for symbol in symbols:
+            routes.update(self._symbol_streams(symbol))
+        self.stream_routes.update(routes)
+
+        streams = list(routes)
+        return [streams[i:i + WS_STREAMS_PER_CONNECTION] for i in range(0, len(streams), WS_STREAMS_PER_CONNECTION)]
+
+    def start_combined_websockets(self, symbols):
+        """/stream?streams= 엔드포인트로 연결당 최대 WS_STREAMS_PER_CONNECTION 개 스트림 구독"""
+        for streams in self.register_streams(symbols):
+            self._start_combined_connection(streams)
+
+    def _start_combined_connection(self, streams):
+        connection = CombinedConnection(streams)
+        self.combined_connections.append(connection)
+
+        def on_open(ws):
+            connection.ws = ws
+
+        self._start_single_websocket(lambda: connection.url, self._on_combined_message, on_open=on_open)
+        return connection
+
+    def _on_combined_message(self, ws, message):
+        """combined stream 메시지를 스트림 이름으로 기존 핸들러에 전달"""
+        self.dispatch_stream(message, stamp())
+
+    def dispatch_stream(self, message, received=None):
+        """
+        combined stream 메시지 처리
+        :param received: 수신 시각 (tracing.stamp())
+        :return: 처리한 스트림 이름 (구독 응답이면 None)
+        """
+        received = received or stamp()
+        stream, data = self.codec.envelope(message)
+        if stream is None:
+            return  # SUBSCRIBE/UNSUBSCRIBE 응답
+        self.stream_counts[stream] += 1
+
+        # 오더북은 pu(직전 메시지의 u) 로 누락 여부 확인
+        if '@depth' in stream:
+            data = self.codec.depth(data)
+            last = self.last_update_id.get(stream)
+            if last is not None and data['pu'] != last:
+                self.stream_gaps[stream] += 1
+            self.last_update_id[stream] = data['u']
+
+        handler = self.stream_routes.get(stream)
+        if handler is not None:
+            handler(data, received=received)
+        return stream
+
+    def subscribe(self, symbols):
+        """심볼 추가 구독 (과거 데이터 로드 후 여유 있는 연결에 SUBSCRIBE, 없으면 새 연결)"""
+        for symbol in symbols:
+            if f"{symbol.lower()}@kline_{BASE_TIMEFRAME}" in self.stream_routes:
+                continue
+            self.data_handler.add_symbol(symbol)
+            self.coin_high.setdefault(symbol, {})
+            self.coin_low.setdefault(symbol, {})
+
+            routes = self._symbol_streams(symbol)
+            self.stream_routes.update(routes)
+            streams = list(routes)
+            connection = next(
+                (c for c in self.combined_connections
+                 if len(c.streams) + len(streams) <= WS_STREAMS_PER_CONNECTION),
+                None
             )
+            if connection is None:
+                self._start_combined_connection(streams)
+            else:
+                connection.streams.extend(streams)
+                connection.send("SUBSCRIBE", streams)
+
+    def unsubscribe(self, symbols):
+        """심볼 구독 해제 (UNSUBSCRIBE 후 데이터 제거)"""
+        for symbol in symbols:
+            streams = list(self._symbol_streams(symbol))
+            for connection in self.combined_connections:
+                removed = [stream for stream in streams if stream in connection.streams]
+                if removed:
+                    connection.streams = [s for s in connection.streams if s not in removed]
+                    connection.send("UNSUBSCRIBE", removed)
+            for stream in streams:
+                self.stream_routes.pop(stream, None)
+            self.data_handler.remove_symbol(symbol)
+
+    def update_symbols(self, symbols):
+        """구독 심볼 목록을 symbols 로 맞춤"""
+        current = {stream.split('@')[0].upper() for stream in self.stream_routes}
+        self.unsubscribe([symbol for symbol in current if symbol not in symbols])
+        self.subscribe([symbol for symbol in symbols if symbol not in current])
+
+    def stream_stats(self):
+        """스트림별 수신 메시지 수와 감지된 누락(시퀀스 불연속) 수"""
+        return {
+            stream: {'messages': self.stream_counts[stream], 'gaps': self.stream_gaps[stream]}
+            for stream in self.stream_routes
+        }
 
     def on_error(self, ws, error):
         logger.error(f"웹소켓 에러: {error}")
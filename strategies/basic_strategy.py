@@ -8,7 +8,22 @@ import logging
 logger = logging.getLogger(__name__)
 
 class BasicStrategy:
-    def __init__(self):
+    timeframes = ('1m',)  # 신호 생성에 사용하는 타임프레임
+    # 전략 파라미터 기본값 (optimizer 탐색 대상). 지표 컬럼 이름은 기본값 기준으로 고정
+    # (예: ema_length 가 100 이어도 컬럼 이름은 ema_200). 실거래 증분/배치 지표 엔진은 기본값만 지원
+    DEFAULT_PARAMS = {
+        'adx_threshold': 25,   # 추세 판단 ADX 하한
+        'ema_length': 200,     # 추세 기준 EMA 길이
+        'volume_window': 20,   # 거래량 평균 캔들 수
+        'fib_level': 0.5,      # 진입 확인 피보나치 되돌림 레벨
+        'atr_stop': 2.0,       # 동적 손절 ATR 배수
+    }
+
+    def __init__(self, **params):
+        unknown = set(params) - set(self.DEFAULT_PARAMS)
+        if unknown:
+            raise ValueError(f"알 수 없는 전략 파라미터: {sorted(unknown)}")
+        self.params = {**self.DEFAULT_PARAMS, **params}
         self.trade_history = []  # 거래 내역 저장
 
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -18,7 +33,7 @@ class BasicStrategy:
         :return: 지표가 추가된 데이터프레임
         """
         # 이동평균선
-        df['ema_200'] = round(ta.ema(df['Close'], length=200),4)
+        df['ema_200'] = round(ta.ema(df['Close'], length=self.params['ema_length']),4)
         df['ema_50'] = round(ta.ema(df['Close'], length=50),4)
         
         # 모멘텀 지표
@@ -41,8 +56,11 @@ class BasicStrategy:
         recent_high = df['High'].rolling(50).max()
         recent_low = df['Low'].rolling(50).min()
         df['fib_0.236'] = recent_high - (recent_high - recent_low) * 0.236
-        df['fib_0.5'] = recent_high - (recent_high - recent_low) * 0.5
+        df['fib_0.5'] = recent_high - (recent_high - recent_low) * self.params['fib_level']
         df['fib_0.786'] = recent_high - (recent_high - recent_low) * 0.786
+
+        # 거래량 평균 (진입 2차 확인용)
+        df['volume_ma_20'] = df['Volume'].rolling(self.params['volume_window']).mean()
         
         return df.dropna()
 
@@ -53,26 +71,34 @@ class BasicStrategy:
         :param position: 현재 포지션 정보
         :return: 매매 신호 (action, price, reason)
         """
+        return self.generate_signals_from_latest(df.iloc[-1], position)
+
+    def generate_signals_from_latest(self, latest, position: Dict) -> Dict:
+        """
+        최신 캔들 한 줄의 지표 값으로 매매 신호 생성 (IncrementalIndicators.latest 결과도 사용 가능)
+        :param latest: 지표가 포함된 최신 행 (Series 또는 딕셔너리)
+        :param position: 현재 포지션 정보
+        :return: 매매 신호 (action, price, reason)
+        """
         # signals = {'action': 'HOLD', 'price': None, 'reason': None}
-        latest = df.iloc[-1]
         signals = {'action': 'HOLD', 'price': latest['Close'], 'reason': None}
 
         # 상승 추세 조건
         bull_condition = (
             latest['Close'] > latest['ema_200'] and
-            latest['ADX_14'] > 25 and
+            latest['ADX_14'] > self.params['adx_threshold'] and
             latest['MACD_12_26_9'] > latest['MACDs_12_26_9']
         )
         
         # 하락 추세 조건
         bear_condition = (
             latest['Close'] < latest['ema_200'] and
-            latest['ADX_14'] > 25 and
+            latest['ADX_14'] > self.params['adx_threshold'] and
             latest['MACD_12_26_9'] < latest['MACDs_12_26_9']
         )
 
         # 매수 신호 (3단계 확인)
-        if bull_condition and self._confirm_long_entry(df):
+        if bull_condition and self._confirm_long_entry(latest):
             signals.update({
                 'action': 'BUY',
                 'price': latest['Close'],
@@ -80,7 +106,7 @@ class BasicStrategy:
             })
         
         # 매도 신호 (3단계 확인)
-        elif bear_condition and self._confirm_short_entry(df):
+        elif bear_condition and self._confirm_short_entry(latest):
             signals.update({
                 'action': 'SELL',
                 'price': latest['Close'],
@@ -89,37 +115,88 @@ class BasicStrategy:
         
         # 청산 신호 (동적 익절/손절)
         elif position['position_amount'] != 0:
-            signals.update(self._check_exit_conditions(df, position))
+            signals.update(self._check_exit_conditions(latest, position))
         
         return signals
 
-    def _confirm_long_entry(self, df: pd.DataFrame) -> bool:
+    def generate_signals_batch(self, indicators: Dict, symbols: List[str], positions: Dict) -> Dict:
+        """
+        여러 심볼의 매매 신호를 한 번에 생성 (조건을 심볼 축 boolean mask 로 평가)
+        :param indicators: calculate_indicators_batch 결과 (컬럼 -> (심볼, 캔들) 배열)
+        :param symbols: indicators 행 순서의 심볼 목록
+        :param positions: 심볼 -> 포지션 정보
+        :return: 심볼 -> 매매 신호 (최신 캔들 지표가 모두 준비되지 않은 심볼은 None)
+        """
+        latest = {column: values[:, -1] for column, values in indicators.items()}
+        ready, long_entry, short_entry = self.entry_masks(latest)
+
+        results = {}
+        for i, symbol in enumerate(symbols):
+            if not ready[i]:
+                results[symbol] = None
+                continue
+            close, rsi = float(latest['Close'][i]), float(latest['rsi'][i])
+            if long_entry[i]:
+                results[symbol] = {'action': 'BUY', 'price': close,
+                                   'reason': f"EMA200 상승돌파 | RSI:{rsi:.1f} | MACD 양수확대"}
+            elif short_entry[i]:
+                results[symbol] = {'action': 'SELL', 'price': close,
+                                   'reason': f"EMA200 하락이탈 | RSI:{rsi:.1f} | MACD 음수확대"}
+            elif positions[symbol]['position_amount'] != 0:
+                signals = {'action': 'HOLD', 'price': close, 'reason': None}
+                signals.update(self._check_exit_conditions(
+                    {column: float(values[i]) for column, values in latest.items()}, positions[symbol]))
+                results[symbol] = signals
+            else:
+                results[symbol] = {'action': 'HOLD', 'price': close, 'reason': None}
+        return results
+
+    def entry_masks(self, indicators: Dict):
+        """
+        매수/매도 진입 조건을 배열 전체에 대해 boolean mask 로 평가 (generate_signals_from_latest 와 같은 규칙)
+        :param indicators: 컬럼 -> 같은 모양의 지표 배열 (심볼 축, 시간 축 모두 가능)
+        :return: (ready, long_entry, short_entry) - ready 는 모든 지표 값이 준비된 위치
+        """
+        ready = np.all([~np.isnan(values) for values in indicators.values()], axis=0)
+
+        trend = indicators['ADX_14'] > self.params['adx_threshold']
+        macd_up = indicators['MACD_12_26_9'] > indicators['MACDs_12_26_9']
+        macd_down = indicators['MACD_12_26_9'] < indicators['MACDs_12_26_9']
+        volume_up = indicators['Volume'] > indicators['volume_ma_20']
+        bull = (indicators['Close'] > indicators['ema_200']) & trend & macd_up
+        bear = (indicators['Close'] < indicators['ema_200']) & trend & macd_down
+        long_entry = ready & bull & volume_up & (indicators['Close'] > indicators['fib_0.5']) & \
+            (indicators['STOCHk_14_3_3'] > indicators['STOCHd_14_3_3'])
+        short_entry = ready & ~long_entry & bear & volume_up & (indicators['Close'] < indicators['fib_0.5']) & \
+            (indicators['STOCHk_14_3_3'] < indicators['STOCHd_14_3_3'])
+        return ready, long_entry, short_entry
+
+    def _confirm_long_entry(self, latest) -> bool:
         """매수 신호 2차 확인"""
-        latest = df.iloc[-1]
         return (
-            latest['Volume'] > df['Volume'].rolling(20).mean().iloc[-1] and
+            latest['Volume'] > latest['volume_ma_20'] and
             latest['Close'] > latest['fib_0.5'] and
             latest['STOCHk_14_3_3'] > latest['STOCHd_14_3_3']
         )
 
-    def _confirm_short_entry(self, df: pd.DataFrame) -> bool:
+    def _confirm_short_entry(self, latest) -> bool:
         """매도 신호 2차 확인"""
-        latest = df.iloc[-1]
         return (
-            latest['Volume'] > df['Volume'].rolling(20).mean().iloc[-1] and
+            latest['Volume'] > latest['volume_ma_20'] and
             latest['Close'] < latest['fib_0.5'] and
             latest['STOCHk_14_3_3'] < latest['STOCHd_14_3_3']
         )
 
-    def _check_exit_conditions(self, df: pd.DataFrame, position: Dict) -> Dict:
+    def _check_exit_conditions(self, latest, position: Dict) -> Dict:
         """동적 청산 조건 계산"""
-        current_price = df['Close'].iloc[-1]
+        current_price = latest['Close']
         entry_price = position['avg_price']
         position_type = 'LONG' if position['position_amount'] > 0 else 'SHORT'
         
         # 변동성 기반 손절매 계산
-        atr = df['atr'].iloc[-1]
-        dynamic_stop_loss = current_price - (2 * atr) if position_type == 'LONG' else current_price + (2 * atr)
+        atr = latest['atr']
+        stop = self.params['atr_stop'] * atr
+        dynamic_stop_loss = current_price - stop if position_type == 'LONG' else current_price + stop
         
         # 시간 기반 청산 조건 (최대 24시간 보유)
         time_in_position = pd.Timestamp.now() - position['entry_time']
@@ -142,11 +219,12 @@ class BasicStrategy:
         
         win_trades = [t for t in self.trade_history if t['profit'] > 0]
         loss_trades = [t for t in self.trade_history if t['profit'] <= 0]
+        gross_loss = abs(sum(t['profit'] for t in loss_trades))  # 손익 0 거래만 있으면 0
         
         return {
             'total_trades': len(self.trade_history),
             'win_rate': len(win_trades) / len(self.trade_history) if self.trade_history else 0,
-            'profit_factor': sum(t['profit'] for t in win_trades) / abs(sum(t['profit'] for t in loss_trades)) if loss_trades else float('inf'),
+            'profit_factor': sum(t['profit'] for t in win_trades) / gross_loss if gross_loss else (float('inf') if win_trades else 0.0),
             'max_drawdown': self._calculate_drawdown(),
             'sharpe_ratio': self._calculate_sharpe()
         }
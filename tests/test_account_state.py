@@ -0,0 +1,33 @@
+from datetime import datetime
+import pytest
+from modules.account_state import AccountState
+
+pytest.importorskip('pandas_ta')
+from modules.data_handler import DataHandler  # noqa: E402
+
+OPENED = 1_700_000_000_000
+
+
+def risk(symbol, amount, update_time):
+    return {'symbol': symbol, 'entryPrice': '0.6', 'positionAmt': str(amount), 'leverage': '5',
+            'unRealizedProfit': '0', 'breakEvenPrice': '0.6', 'updateTime': update_time}
+
+
+def test_position_risks_keep_exchange_update_time():
+    """positionRisk 일괄 반영 시 이미 열린 포지션의 entry_time 은 응답의 updateTime (최대 보유 시간 기준)"""
+    handler = DataHandler.__new__(DataHandler)
+    handler.account = AccountState(['XRPUSDT', 'ADAUSDT', 'DOGEUSDT'])
+    handler.apply_position_risks([risk('XRPUSDT', 10, OPENED), risk('ADAUSDT', -5, OPENED + 60_000),
+                                  risk('DOGEUSDT', 0, 0)])
+
+    assert handler.account.position('XRPUSDT')['entry_time'] == datetime.fromtimestamp(OPENED / 1000)
+    assert handler.account.position('ADAUSDT')['entry_time'] == datetime.fromtimestamp(OPENED / 1000 + 60)
+    assert handler.account.position('DOGEUSDT')['entry_time'] is None
+
+
+def test_apply_positions_uses_per_symbol_times():
+    account = AccountState(['XRPUSDT', 'ADAUSDT'])
+    account.apply_positions({'XRPUSDT': {'position_amount': 1.0}, 'ADAUSDT': {'position_amount': 2.0}},
+                            time_ms=OPENED, times={'ADAUSDT': OPENED + 1_000})
+    assert account.position('XRPUSDT')['entry_time'] == datetime.fromtimestamp(OPENED / 1000)
+    assert account.position('ADAUSDT')['entry_time'] == datetime.fromtimestamp(OPENED / 1000 + 1)
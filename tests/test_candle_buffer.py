@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from modules.candle_buffer import CandleBuffer, KST_OFFSET
+
+MINUTE = 60_000
+
+
+def bar(i):
+    return i * MINUTE, float(i), i + 0.5, i - 0.5, i + 0.25, 10.0 * i
+
+
+def test_wraparound_keeps_contiguous_view():
+    buffer = CandleBuffer(capacity=4)
+    for i in range(1, 8):
+        buffer.append(*bar(i))
+
+    assert len(buffer) == 4 and buffer.start == 3
+    assert buffer['Open time'].tolist() == [4 * MINUTE, 5 * MINUTE, 6 * MINUTE, 7 * MINUTE]
+    assert buffer['Close'].tolist() == [4.25, 5.25, 6.25, 7.25]
+    assert buffer['Close'].flags['C_CONTIGUOUS'] and buffer['Close'].base is buffer.values
+    assert buffer.rows()[0] == bar(4)
+
+
+def test_upsert_updates_appends_and_ignores_stale():
+    buffer = CandleBuffer(capacity=3)
+    assert buffer.upsert(*bar(1)) == 'append'
+    assert buffer.upsert(*bar(2)) == 'append'
+    assert buffer.upsert(2 * MINUTE, 2.0, 3.0, 1.0, 2.75, 30.0) == 'update'
+    assert buffer.upsert(*bar(1)) is None
+
+    assert buffer.last('Close') == 2.75 and buffer.last('High') == 3.0
+    assert len(buffer) == 2 and buffer.last_open_time == 2 * MINUTE
+
+
+def test_update_last_after_wrap_writes_both_mirrors():
+    buffer = CandleBuffer(capacity=2)
+    for i in range(1, 4):
+        buffer.append(*bar(i))
+    buffer.update_last(3.0, 9.0, 2.0, 8.0, 1.0)
+    assert buffer['Close'].tolist() == [2.25, 8.0]
+
+    buffer.append(*bar(4))
+    assert buffer['Close'].tolist() == [8.0, 4.25]
+
+
+def test_from_arrays_and_frame_round_trip():
+    open_time = np.arange(1, 6, dtype=np.int64) * MINUTE
+    values = np.vstack([np.arange(1, 6, dtype=np.float64) + k for k in range(5)])
+    buffer = CandleBuffer.from_arrays(open_time, values, capacity=3)
+    assert buffer['Open time'].tolist() == [3 * MINUTE, 4 * MINUTE, 5 * MINUTE]
+
+    frame = buffer.to_frame()
+    assert frame['Open time'].iloc[0] == pd.Timestamp(3 * MINUTE, unit='ms') + KST_OFFSET
+    assert frame is not buffer.to_frame()  # 호출자는 얕은 복사본을 받음
+    restored = CandleBuffer.from_frame(frame, capacity=3)
+    assert restored.rows() == buffer.rows()
+
+    buffer.append(6 * MINUTE, 1.0, 1.0, 1.0, 1.0, 1.0)
+    assert buffer.to_frame()['Open time'].iloc[-1] == pd.Timestamp(6 * MINUTE, unit='ms') + KST_OFFSET
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from modules import kline_archive
+from modules.persistence import AsyncWriter
+
+pytest.importorskip('pandas_ta')
+from modules import data_handler  # noqa: E402
+
+START = 1_700_000_000_000
+
+
+def raw_klines(first, count):
+    """/fapi/v1/klines 응답 형식 1분봉 (모두 확정 캔들)"""
+    return [[START + i * 60_000, f"{100 + i}", f"{101 + i}", f"{99 + i}", f"{100.5 + i}", "10",
+             START + i * 60_000 + 59_999, "0", 1, "0", "0", "0"] for i in range(first, first + count)]
+
+
+@pytest.fixture
+def handler(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_handler, 'DATA_DIR', str(tmp_path))
+    handler = data_handler.DataHandler.__new__(data_handler.DataHandler)
+    handler.rest = SimpleNamespace()
+    handler.writer = AsyncWriter(str(tmp_path), flush_interval=0.01).start()
+    yield handler
+    handler.writer.stop()
+
+
+def save(handler, raw):
+    handler.rest.klines = lambda symbol, interval, limit: raw
+    assert len(handler.load_historical_data('TESTUSDT', '1m', len(raw), save_to_file=True)) == len(raw)
+
+
+def test_saving_same_window_twice_stores_each_bar_once(handler, tmp_path):
+    save(handler, raw_klines(0, 100))
+    save(handler, raw_klines(0, 100))      # 기록 전 같은 구간
+    handler.writer.stop()
+    handler.writer = AsyncWriter(str(tmp_path)).start()
+    save(handler, raw_klines(0, 100))      # 기록 후 같은 구간
+    save(handler, raw_klines(50, 100))     # 겹치는 구간
+    handler.writer.stop()
+
+    records = kline_archive.read_klines('TESTUSDT', '1m', data_dir=str(tmp_path))
+    times = np.array(records['open_time'])
+    assert len(times) == 150
+    assert (np.diff(times) == 60_000).all()
+    assert len(kline_archive.read_klines('TESTUSDT', '1m', START + 10 * 60_000, START + 20 * 60_000,
+                                         str(tmp_path))) == 10
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('pandas_ta')
+from modules.optimizer import rank_results  # noqa: E402
+from strategies.basic_strategy import BasicStrategy  # noqa: E402
+
+
+def metrics(profits):
+    strategy = BasicStrategy()
+    strategy.trade_history = [{'profit': profit} for profit in profits]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return strategy.performance_metrics()
+
+
+def test_flat_equity_curve_ranks_last():
+    flat = {'params': 'flat', 'metrics': metrics([0.0, 0.0, 0.0])}
+    assert np.isnan(flat['metrics']['sharpe_ratio'])
+    results = [
+        {'params': 'low', 'metrics': metrics([1.0, -1.0, 0.5])},
+        flat,
+        {'params': 'none', 'metrics': {}},
+        {'params': 'high', 'metrics': metrics([2.0, 1.0, 1.5])},
+    ]
+    ranked = [result['params'] for result in rank_results(results)]
+    assert ranked[:2] == ['high', 'low']
+    assert set(ranked[2:]) == {'flat', 'none'}
+    assert [r['params'] for r in rank_results(results[::-1])][:2] == ['high', 'low']
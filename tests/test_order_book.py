@@ -0,0 +1,64 @@
+from modules.order_book import LocalOrderBook
+
+SNAPSHOT = {'lastUpdateId': 100, 'bids': [['1.00', '5'], ['0.99', '3']], 'asks': [['1.01', '4'], ['1.02', '2']]}
+
+
+def diff(first, last, previous, bids=(), asks=()):
+    return {'E': last, 's': 'XRPUSDT', 'U': first, 'u': last, 'pu': previous, 'b': list(bids), 'a': list(asks)}
+
+
+def test_buffered_events_replay_after_snapshot():
+    book = LocalOrderBook('XRPUSDT')
+    assert not book.apply_diff(diff(90, 95, 89, bids=[['1.00', '9']]))      # 스냅샷에 이미 반영
+    assert not book.apply_diff(diff(96, 105, 95, bids=[['1.00', '6']]))     # U <= lastUpdateId <= u
+    assert not book.apply_diff(diff(106, 110, 105, asks=[['1.01', '0']]))
+
+    assert book.apply_snapshot(SNAPSHOT)
+    assert book.last_update_id == 110 and not book.pending
+    assert book.bids.best() == (1.00, 6.0)
+    assert book.best_ask() == 1.02
+    assert book.depth(2) == {'bids': [(1.00, 6.0), (0.99, 3.0)], 'asks': [(1.02, 2.0)]}
+
+
+def test_first_event_after_snapshot_must_cover_last_update_id():
+    book = LocalOrderBook('XRPUSDT')
+    book.apply_snapshot(SNAPSHOT)
+    assert book.apply_diff(diff(80, 99, 79))          # 스냅샷 이전 이벤트는 무시
+    assert book.last_update_id == 100
+    assert not book.apply_diff(diff(102, 105, 101))   # 101 이 빠짐 → 재동기화
+    assert not book.synced and book.resyncs == 1
+    assert list(book.pending) == [diff(102, 105, 101)]
+
+
+def test_pu_gap_triggers_resync():
+    book = LocalOrderBook('XRPUSDT')
+    book.apply_snapshot(SNAPSHOT)
+    assert book.apply_diff(diff(100, 104, 99, bids=[['0.98', '1']]))
+    assert book.apply_diff(diff(105, 108, 104, bids=[['0.99', '0']]))
+    assert book.bids.top(3) == [(1.00, 5.0), (0.98, 1.0)]
+
+    assert not book.apply_diff(diff(112, 115, 111))   # pu != 직전 u
+    assert not book.synced and book.resyncs == 1
+    assert not book.apply_diff(diff(116, 118, 115))   # 재동기화 전까지 버퍼링
+    assert len(book.pending) == 2
+
+    assert book.apply_snapshot({'lastUpdateId': 113, 'bids': [['1.00', '1']], 'asks': [['1.01', '1']]})
+    assert book.last_update_id == 118 and book.synced
+
+
+def test_stale_snapshot_is_rejected():
+    book = LocalOrderBook('XRPUSDT')
+    book.apply_diff(diff(120, 125, 119))
+    assert not book.apply_snapshot(SNAPSHOT)          # 스냅샷(100) 과 첫 이벤트(120) 사이가 비어 있음
+    assert not book.synced and book.resyncs == 1
+
+
+def test_pending_buffer_is_capped():
+    book = LocalOrderBook('XRPUSDT', max_pending=3)
+    for update_id in range(1, 11):
+        book.apply_diff(diff(update_id, update_id, update_id - 1))
+    assert [event['u'] for event in book.pending] == [8, 9, 10]
+
+    assert book.apply_snapshot({'lastUpdateId': 8, 'bids': [], 'asks': []})
+    assert book.last_update_id == 10
+    assert book.pending.maxlen == 3
@@ -0,0 +1,98 @@
+import threading
+import pytest
+from modules.order_gateway import OrderGateway, OrderRequest
+from modules.order_tracker import OrderTracker
+from modules.rest_client import RestAPIError
+
+
+class FakeRest:
+    """주문 요청을 기록하는 REST 대역 (cancel_error 가 있으면 취소 실패)"""
+
+    def __init__(self, cancel_error=None):
+        self.calls = []
+        self.cancel_error = cancel_error
+        self.lock = threading.Lock()
+        self.order_id = 0
+
+    def _ack(self, params):
+        self.order_id += 1
+        return {'orderId': self.order_id, 'clientOrderId': params['newClientOrderId'], 'symbol': params['symbol'],
+                'status': 'NEW'}
+
+    def create_order(self, params):
+        with self.lock:
+            self.calls.append(('order', params['symbol']))
+            return self._ack(params)
+
+    def create_orders(self, orders):
+        with self.lock:
+            self.calls.append(('batch', tuple(order['symbol'] for order in orders)))
+            return [{'code': -4164, 'msg': "Order's notional must be no smaller than 5"}
+                    if order['symbol'] == 'BADUSDT' else self._ack(order) for order in orders]
+
+    def cancel_all_orders(self, symbol):
+        with self.lock:
+            self.calls.append(('cancel', symbol))
+        if self.cancel_error is not None:
+            raise self.cancel_error
+
+
+def request(symbol, side='BUY', cancel_first=False):
+    return OrderRequest(symbol, {'symbol': symbol, 'side': side, 'type': 'LIMIT', 'quantity': '1',
+                                 'price': '1.0', 'timeInForce': 'GTC'}, cancel_first)
+
+
+def order_event(req, status, execution='TRADE', order_id=1):
+    return {'symbol': req.symbol, 'order_id': order_id, 'client_order_id': req.client_order_id,
+            'side': req.params['side'], 'type': 'LIMIT', 'execution': execution, 'status': status, 'price': 1.0,
+            'quantity': 1.0, 'filled': 1.0 if status == 'FILLED' else 0.0,
+            'last_quantity': 1.0 if execution == 'TRADE' else 0.0, 'last_price': 1.0, 'fee': 0.0,
+            'fee_asset': 'USDT', 'realized': None, 'reduce_only': False, 'time': 1}
+
+
+@pytest.fixture
+def gateway():
+    gateways = []
+
+    def make(rest, **kwargs):
+        gateways.append(OrderGateway(rest, workers=2, **kwargs))
+        return gateways[-1]
+    yield make
+    for gateway in gateways:
+        gateway.close()
+
+
+def test_entries_are_batched_and_item_errors_fail_only_their_order(gateway):
+    rest = FakeRest()
+    requests = [request(symbol) for symbol in ('AUSDT', 'BADUSDT', 'CUSDT', 'DUSDT', 'EUSDT', 'FUSDT')]
+    results = gateway(rest, batch_size=5).submit(requests)
+    for req in requests:
+        req.future.exception(timeout=5)
+
+    assert sorted(kind for kind, _ in rest.calls) == ['batch', 'order']
+    assert results['AUSDT'].future.result()['status'] == 'NEW'
+    error = results['BADUSDT'].future.exception()
+    assert isinstance(error, RestAPIError) and error.payload['code'] == -4164
+    assert isinstance(results['BADUSDT'].fill.exception(), RestAPIError)
+
+
+def test_failed_cancel_skips_exit_order(gateway):
+    rest = FakeRest(cancel_error=RestAPIError(0, 'connection reset'))
+    exit_request = request('AUSDT', side='SELL', cancel_first=True)
+    gateway(rest).submit([exit_request])
+
+    assert isinstance(exit_request.future.exception(timeout=5), RestAPIError)
+    assert rest.calls == [('cancel', 'AUSDT')]
+
+
+def test_fill_future_resolves_from_order_updates(gateway):
+    tracker = OrderTracker()
+    entry = request('AUSDT')
+    gateway(FakeRest(), tracker=tracker).submit([entry])
+    entry.future.result(timeout=5)
+
+    tracker.apply(order_event(entry, 'NEW', execution='NEW'))
+    assert not entry.fill.done()
+    tracker.apply(order_event(entry, 'FILLED'))
+    assert entry.fill.result(timeout=1)['status'] == 'FILLED'
+    assert not tracker.watched
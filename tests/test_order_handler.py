@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+import pytest
+from modules.account_state import AccountState
+from modules.order_handler import OrderHandler
+from modules.order_tracker import OrderTracker
+
+
+def order_event(order_id, side, status='NEW', reduce_only=False):
+    return {'symbol': 'XRPUSDT', 'order_id': order_id, 'client_order_id': f"c{order_id}", 'side': side,
+            'type': 'LIMIT', 'execution': 'NEW', 'status': status, 'price': 0.6, 'quantity': 10.0, 'filled': 0.0,
+            'last_quantity': 0.0, 'last_price': 0.0, 'fee': 0.0, 'fee_asset': 'USDT', 'realized': None,
+            'reduce_only': reduce_only, 'time': 1}
+
+
+@pytest.fixture
+def handler():
+    account = AccountState(['XRPUSDT'])
+    data_handler = SimpleNamespace(account=account, position=account.position, orders=OrderTracker(),
+                                   exchange_info={}, coin_data={}, order_books={})
+    handler = OrderHandler.__new__(OrderHandler)
+    handler.data_handler = data_handler
+    handler.calculate_order_amount = lambda symbol: 10.0
+    return handler
+
+
+def test_open_entry_blocks_same_side_entry(handler):
+    assert handler.plan_order('XRPUSDT', {'action': 'BUY', 'price': 0.6}) is not None
+
+    handler.data_handler.orders.apply(order_event(1, 'BUY'))
+    assert handler.plan_order('XRPUSDT', {'action': 'BUY', 'price': 0.61}) is None
+    assert handler.plan_order('XRPUSDT', {'action': 'SELL', 'price': 0.61}).params['side'] == 'SELL'
+
+    handler.data_handler.orders.apply(order_event(1, 'BUY', status='CANCELED'))
+    assert handler.plan_order('XRPUSDT', {'action': 'BUY', 'price': 0.61}) is not None
+
+
+def test_reduce_only_order_does_not_block_entry(handler):
+    handler.data_handler.orders.apply(order_event(2, 'BUY', reduce_only=True))
+    assert handler.plan_order('XRPUSDT', {'action': 'BUY', 'price': 0.6}) is not None
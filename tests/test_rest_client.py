@@ -0,0 +1,16 @@
+import pytest
+import requests
+from modules.rest_client import RestAPIError, RestClient, WeightLimiter
+
+
+def test_connection_errors_raise_rest_api_error(monkeypatch):
+    client = RestClient(base_url='http://127.0.0.1:9', limiter=WeightLimiter())
+
+    def refuse(*args, **kwargs):
+        raise requests.ConnectionError('connection refused')
+    monkeypatch.setattr(client.session, 'request', refuse)
+
+    with pytest.raises(RestAPIError) as error:
+        client.position_risk()
+    assert error.value.status == 0
+    assert 'ConnectionError' in str(error.value.payload)
@@ -0,0 +1,62 @@
+import pytest
+from modules.symbol_filters import ExchangeInfoCache, OrderValidationError, SymbolFilters
+
+XRP = {
+    'symbol': 'XRPUSDT', 'pricePrecision': 4, 'quantityPrecision': 1,
+    'filters': [
+        {'filterType': 'PRICE_FILTER', 'tickSize': '0.0001', 'minPrice': '0.0143', 'maxPrice': '100000'},
+        {'filterType': 'LOT_SIZE', 'stepSize': '0.1', 'minQty': '0.1', 'maxQty': '10000000'},
+        {'filterType': 'MARKET_LOT_SIZE', 'stepSize': '1', 'minQty': '1', 'maxQty': '2000000'},
+        {'filterType': 'MIN_NOTIONAL', 'notional': '5'},
+    ]
+}
+
+
+@pytest.fixture
+def filters():
+    return SymbolFilters(XRP)
+
+
+def test_price_rounds_away_from_crossing(filters):
+    assert filters.quantize_price(0.60017, 'BUY') == 0.6001
+    assert filters.quantize_price(0.60011, 'SELL') == 0.6002
+    assert filters.quantize_price(0.60016) == 0.6002
+    assert filters.quantize_price(0.6003, 'BUY') == 0.6003   # 이미 tick 배수면 그대로 (부동소수 오차 무시)
+    assert filters.quantize_price(0.6003, 'SELL') == 0.6003
+
+
+def test_quantity_floors_to_step(filters):
+    assert filters.quantize_quantity(12.39) == 12.3
+    assert filters.quantize_quantity(0.3) == 0.3
+    assert filters.quantize_quantity(12.9, market=True) == 12.0
+
+
+def test_check_limits(filters):
+    assert filters.check(0.0, 0.6) is not None
+    assert filters.check(0.5, market=True) is not None     # MARKET_LOT_SIZE minQty
+    assert filters.check(20.0, 0.01) is not None           # minPrice 미만
+    assert filters.check(8.0, 0.6) is not None             # 4.8 < MIN_NOTIONAL
+    assert filters.check(8.0, 0.6, reduce_only=True) is None
+    assert filters.check(9.0, 0.6) is None
+
+
+def test_prepare_formats_and_rejects(filters):
+    assert filters.prepare('BUY', 'LIMIT', 12.39, 0.60017) == ('12.3', '0.6001')
+    assert filters.prepare('SELL', 'MARKET', 12.9, reference_price=0.6) == ('12', None)
+    with pytest.raises(OrderValidationError) as error:
+        filters.prepare('BUY', 'LIMIT', 8.05, 0.6)
+    assert error.value.symbol == 'XRPUSDT'
+
+
+def test_failed_refresh_keeps_filters(tmp_path):
+    class Rest:
+        def exchange_info(self):
+            raise ConnectionError('down')
+
+    cache = ExchangeInfoCache(rest=Rest(), path=str(tmp_path / 'exchange_info.json'), ttl=60)
+    assert cache.refresh({'symbols': [XRP]})
+    assert not cache.refresh()
+    assert 'XRPUSDT' in cache and cache.get('XRPUSDT').min_notional == 5.0
+
+    reloaded = ExchangeInfoCache(rest=Rest(), path=cache.path, ttl=60).load()
+    assert reloaded.get('XRPUSDT').tick_size == 0.0001
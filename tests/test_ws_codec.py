@@ -0,0 +1,69 @@
+import json
+import pytest
+from modules.ws_codec import JsonCodec, make_codec
+
+pytest.importorskip('msgspec')
+
+KLINE = {
+    "e": "kline", "E": 1700000060123, "s": "XRPUSDT",
+    "k": {"t": 1700000000000, "T": 1700000059999, "s": "XRPUSDT", "i": "1m", "o": "0.6012", "c": "0.6020",
+          "h": "0.6025", "l": "0.6008", "v": "123456.7", "n": 321, "x": True, "q": "74210.1", "B": "0"}
+}
+
+ACCOUNT_UPDATE = {
+    "e": "ACCOUNT_UPDATE", "E": 1700000060200, "T": 1700000060198,
+    "a": {"m": "ORDER",
+          "B": [{"a": "USDT", "wb": "1000.5", "cw": "990.1", "bc": "0"}],
+          "P": [{"s": "XRPUSDT", "pa": "100", "ep": "0.6015", "bep": "0.6016", "cr": "0", "up": "0.05",
+                 "mt": "cross", "iw": "0", "ps": "BOTH"}]}
+}
+
+ORDER_TRADE_UPDATE = {
+    "e": "ORDER_TRADE_UPDATE", "E": 1700000060300, "T": 1700000060298,
+    "o": {"s": "XRPUSDT", "c": "bot-1", "S": "BUY", "o": "LIMIT", "f": "GTC", "q": "100", "p": "0.6015",
+          "ap": "0.6015", "sp": "0", "x": "TRADE", "X": "FILLED", "i": 8886774, "l": "100", "z": "100",
+          "L": "0.6015", "N": "USDT", "n": "0.012", "T": 1700000060298, "t": 42, "b": "0", "a": "0",
+          "m": True, "R": False, "wt": "CONTRACT_PRICE", "ot": "LIMIT", "ps": "BOTH", "cp": False,
+          "rp": "0", "pP": False, "si": 0, "ss": 0}
+}
+
+
+@pytest.fixture
+def codecs():
+    return make_codec('msgspec'), JsonCodec('json')
+
+
+def test_kline_matches_json(codecs):
+    fast, plain = codecs
+    payload = json.dumps(KLINE).encode()
+    assert fast.kline(payload) == plain.kline(payload)
+
+
+@pytest.mark.parametrize('event', [ACCOUNT_UPDATE, ORDER_TRADE_UPDATE], ids=['account', 'order'])
+def test_account_events_match_json(codecs, event):
+    fast, plain = codecs
+    payload = json.dumps(event).encode()
+    decoded = fast.account(payload)
+    assert decoded == plain.account(payload)
+    assert decoded[1]
+
+
+def test_envelope_payload_matches_json(codecs):
+    fast, plain = codecs
+    message = json.dumps({"stream": "xrpusdt@kline_1m", "data": KLINE}).encode()
+    stream, data = fast.envelope(message)
+    assert stream == plain.envelope(message)[0]
+    assert fast.kline(data) == plain.kline(plain.envelope(message)[1])
+
+
+@pytest.mark.parametrize('backend', ['msgspec', 'json'])
+def test_account_update_keeps_leverage(backend):
+    """거래소 ACCOUNT_UPDATE 에는 레버리지(l)가 없으므로 기존 포지션 레버리지를 유지"""
+    from modules.account_state import AccountState
+    account = AccountState(['XRPUSDT'])
+    account.set_position('XRPUSDT', leverage=5)
+    _, positions = make_codec(backend).account(json.dumps(ACCOUNT_UPDATE).encode())
+    account.apply_positions({pos.pop('symbol'): pos for pos in positions})
+    position = account.position('XRPUSDT')
+    assert position['leverage'] == 5
+    assert position['position_amount'] == 100.0 and position['breakeven_price'] == 0.6016
@@ -0,0 +1,52 @@
+import threading
+from bisect import bisect_left
+
+# 0.05ms ~ 약 110초 구간을 2^(1/4) 배 간격으로 나눈 버킷 상한 (ms)
+BUCKET_BOUNDS = tuple(0.05 * 2 ** (i / 4) for i in range(85))
+
+
+class LatencyHistogram:
+    """
+    로그 간격 버킷 지연 시간 히스토그램 (단위 ms)
+    기록은 O(log 버킷 수), 메모리는 고정이며 분위수는 버킷 상한으로 근사합니다 (오차 약 19% 이내).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, ms):
+        index = bisect_left(BUCKET_BOUNDS, ms)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += ms
+            if ms > self.max:
+                self.max = ms
+
+    def percentile(self, q):
+        """q (0~100) 분위 지연 시간의 근사값"""
+        with self.lock:
+            if not self.count:
+                return 0.0
+            target = self.count * q / 100
+            cumulative = 0
+            for index, count in enumerate(self.counts):
+                cumulative += count
+                if cumulative >= target and count:
+                    return min(BUCKET_BOUNDS[index], self.max) if index < len(BUCKET_BOUNDS) else self.max
+            return self.max
+
+    def summary(self):
+        """{'count', 'mean', 'p50', 'p90', 'p99', 'max'} (ms)"""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
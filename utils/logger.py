@@ -1,60 +1,149 @@
+import atexit
+import json
 import logging
+import queue
+import time
 from datetime import datetime
-from config.settings import TRADE_LOG, BALANCE_LOG
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from config.settings import TRADE_LOG, BALANCE_LOG, LOG_LEVEL, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_SAMPLE_INTERVAL
 import os
 
 # 로그 디렉토리 생성
 os.makedirs(os.path.dirname(TRADE_LOG), exist_ok=True)
 os.makedirs(os.path.dirname(BALANCE_LOG), exist_ok=True)
 
+# LogRecord 기본 속성 (나머지는 extra 로 넘긴 구조화 필드)
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName'}
 
-def init_logger():
-    """로거 초기화"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(TRADE_LOG),  # 파일 핸들러
-            logging.StreamHandler()          # 콘솔 핸들러
-        ]
-    )
+
+class JsonFormatter(logging.Formatter):
+    """로그 한 건을 JSON 한 줄로 기록 (time, level, logger, message + symbol/event/latency_ms 등 extra 필드)"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRS)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class EventFilter(logging.Filter):
+    """extra 의 event 값이 events 에 있는 기록만 통과"""
+
+    def __init__(self, *events):
+        super().__init__()
+        self.events = set(events)
+
+    def filter(self, record):
+        return getattr(record, 'event', None) in self.events
+
+
+class LogSampler:
+    """
+    고빈도 스트림 로그 샘플링: 키별로 interval 초에 한 번만 기록하고 그 사이 생략한 건수를 함께 남김
+    """
+
+    def __init__(self, interval=LOG_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.last = {}
+        self.suppressed = {}
+
+    def allow(self, key):
+        """:return: 기록할 차례면 직전 기록 이후 건수 (이번 건 포함), 아니면 None"""
+        now = time.monotonic()
+        last = self.last.get(key)
+        if last is not None and now - last < self.interval:
+            self.suppressed[key] = self.suppressed.get(key, 0) + 1
+            return None
+        self.last[key] = now
+        return self.suppressed.pop(key, 0) + 1
+
+
+def _start_listener():
+    """
+    로그 파이프라인 구성: 모든 로거 -> QueueHandler -> (백그라운드 스레드) QueueListener -> 콘솔/파일
+    호출한 스레드(웹소켓, 주문)는 큐에 넣기만 하고 콘솔/디스크 I/O 는 리스너 스레드가 처리합니다.
+    """
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+    trade_file = RotatingFileHandler(TRADE_LOG, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                     encoding='utf-8')
+    trade_file.setFormatter(JsonFormatter())
+
+    balance_file = RotatingFileHandler(BALANCE_LOG, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                       encoding='utf-8')
+    balance_file.setFormatter(JsonFormatter())
+    balance_file.addFilter(EventFilter('balance'))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(LOG_LEVEL)
+
+    listener = QueueListener(log_queue, console, trade_file, balance_file, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # 종료 시 큐에 남은 로그 기록
+    return listener
+
+
+def init_logger(level=LOG_LEVEL):
+    """로거 초기화 (파이프라인은 import 시 이미 시작됨, 로그 레벨만 변경)"""
+    logging.getLogger().setLevel(level)
     logging.info("로거 초기화 완료")
 
-# 로거 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(TRADE_LOG),  # 파일 핸들러
-        logging.StreamHandler()          # 콘솔 핸들러
-    ]
-)
+
+_listener = _start_listener()
+_sampler = LogSampler()
 
 logger = logging.getLogger(__name__)
 
-def log_trade(symbol, side, price, quantity):
+
+def log_event(event, message, level=logging.INFO, **fields):
+    """
+    구조화 로그 기록
+    :param event: 이벤트 종류 (예: 'trade', 'balance', 'depth')
+    :param fields: JSON 로그에 함께 남길 필드 (symbol, latency_ms 등)
+    """
+    logger.log(level, message, extra={'event': event, **fields})
+
+
+def log_sampled(key, event, message, level=logging.DEBUG, **fields):
+    """
+    고빈도 스트림용 샘플링 로그 (key 별로 LOG_SAMPLE_INTERVAL 초에 한 번, 생략 건수는 count 필드)
+    해당 레벨이 꺼져 있으면 아무 것도 하지 않습니다.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    count = _sampler.allow(key)
+    if count is not None:
+        logger.log(level, message, extra={'event': event, 'count': count, **fields})
+
+
+def log_trade(symbol, side, price, quantity, **fields):
     """
     거래 내역을 로그 파일과 콘솔에 기록합니다.
-    
+
     :param symbol: 코인 심볼 (예: 'BTCUSDT')
     :param side: 주문 방향 (예: 'BUY' 또는 'SELL')
     :param price: 주문 가격
     :param quantity: 주문 수량
     """
-    log_message = (
-        f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-        f"거래 완료 - {symbol} {side} {quantity}@{price}"
-    )
-    logger.info(log_message)
+    log_event('trade', f"거래 완료 - {symbol} {side} {quantity}@{price}",
+              symbol=symbol, side=side, price=price, quantity=quantity, **fields)
 
-def log_balance(balance_data):
+
+def log_balance(balance_data, reason=None):
     """
-    잔고 정보를 로그 파일과 콘솔에 기록합니다.
-    
+    잔고 정보를 로그 파일(BALANCE_LOG 포함)과 콘솔에 기록합니다.
+
     :param balance_data: 잔고 정보 딕셔너리
+    :param reason: 잔고 갱신 사유
     """
-    log_message = (
-        f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-        f"잔고 정보 - {balance_data}"
-    )
-    logger.info(log_message)
\ No newline at end of file
+    message = "잔고 정보 - " + "\t".join(f"{key}: {value}" for key, value in balance_data.items())
+    if reason:
+        message += f"\t{reason}"
+    log_event('balance', message, reason=reason, **balance_data)
@@ -1,15 +1,15 @@
 import subprocess
 import time
 from datetime import datetime, timezone, timedelta
-from binance.client import Client
-from config.settings import API_KEY, SECRET_KEY, KST
+from config.settings import KST
+from modules.rest_client import shared_client
 import logging
 
 logger = logging.getLogger(__name__)
 
 class TimeSync:
     def __init__(self):
-        self.client = Client(API_KEY, SECRET_KEY)  # Binance 클라이언트 초기화
+        self.rest = shared_client()  # 공용 REST 클라이언트
     
     def sync_system_time(self):
         """윈도우 시간 동기화 (기존 sync_time 함수 개선)"""
@@ -23,10 +23,14 @@ class TimeSync:
         """KST 시간 문자열 반환"""
         return datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')
     
-    def check_time_diff(self):
-        """서버-로컬 시간 차이 체크 (기존 timecheck 로직 완전 재구현)"""
+    def check_time_diff(self, server_time=None):
+        """
+        서버-로컬 시간 차이 체크 (기존 timecheck 로직 완전 재구현)
+        :param server_time: 이미 조회한 서버 시간(ms), 없으면 REST 로 조회
+        """
         try:
-            server_time = self.client.get_server_time()['serverTime']
+            if server_time is None:
+                server_time = self.rest.server_time()
             local_time = int(time.time() * 1000)
             time_diff = local_time - server_time
             
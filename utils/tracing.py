@@ -0,0 +1,110 @@
+import time
+from config.settings import TRACE_ENABLED
+from utils.latency import LatencyHistogram
+from utils.logger import logger
+
+# 캔들 메시지 하나가 주문이 되기까지의 구간 (ms)
+STAGES = (
+    'exchange_to_receive',  # 거래소 이벤트 시각(E) -> 로컬 수신 (벽시계 기준, 시간 동기화 오차 포함)
+    'parse',                # 수신 -> 메시지 디코딩 완료
+    'data_update',          # 디코딩 -> 캔들 버퍼 갱신
+    'indicators',           # 캔들 버퍼 갱신 -> 증분 지표 갱신
+    'decision',             # 지표 갱신 -> 전략 신호 결정 (thread 런타임은 폴링 대기 포함)
+    'order_send',           # 신호 결정 -> 주문 REST 요청 시작
+    'order_ack',            # 주문 REST 요청 -> 응답
+    'tick_to_order',        # 수신 -> 주문 REST 요청 시작
+    'depth_receive',        # 오더북: 거래소 이벤트 시각 -> 로컬 수신
+    'depth_apply',          # 오더북: 수신 -> 로컬 오더북 반영
+)
+
+
+def stamp():
+    """메시지 수신 시각 (monotonic ns, 벽시계 ns)"""
+    return time.monotonic_ns(), time.time_ns()
+
+
+class TickTrace:
+    """심볼별 마지막 캔들 메시지의 단계별 시각 (monotonic ns)"""
+    __slots__ = ('received', 'indicators', 'decided')
+
+    def __init__(self, received, indicators):
+        self.received = received
+        self.indicators = indicators
+        self.decided = None
+
+
+class PipelineTracer:
+    """
+    틱 -> 주문 구간별 지연 시간 히스토그램
+
+    단계 시각은 time.monotonic_ns() 로 찍고 (거래소 시각 비교만 time.time_ns()),
+    고정 크기 로그 버킷 히스토그램(LatencyHistogram)에 기록하므로 운영 중에도 켜 둘 수 있습니다.
+    웹소켓 스레드와 전략/주문 스레드 사이는 심볼별 마지막 TickTrace 로 이어집니다.
+    """
+
+    def __init__(self, enabled=TRACE_ENABLED):
+        self.enabled = enabled
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self.traces = {}
+
+    def _record(self, stage, start_ns, end_ns):
+        self.histograms[stage].record((end_ns - start_ns) / 1e6)
+
+    def kline(self, symbol, event_ms, received, parsed_ns, updated_ns, indicators_ns):
+        """
+        캔들 메시지 처리 완료 (웹소켓 핸들러)
+        :param received: stamp() 결과
+        """
+        if not self.enabled:
+            return
+        received_ns, received_wall_ns = received
+        if event_ms:
+            self.histograms['exchange_to_receive'].record(max(0.0, received_wall_ns / 1e6 - event_ms))
+        self._record('parse', received_ns, parsed_ns)
+        self._record('data_update', parsed_ns, updated_ns)
+        self._record('indicators', updated_ns, indicators_ns)
+        self.traces[symbol] = TickTrace(received_ns, indicators_ns)
+
+    def depth(self, event_ms, received):
+        """오더북 차분 메시지 반영 완료"""
+        if not self.enabled:
+            return
+        received_ns, received_wall_ns = received
+        if event_ms:
+            self.histograms['depth_receive'].record(max(0.0, received_wall_ns / 1e6 - event_ms))
+        self._record('depth_apply', received_ns, time.monotonic_ns())
+
+    def decision(self, symbol):
+        """전략 신호 결정 (마지막 캔들 메시지 기준, 같은 메시지는 한 번만 기록)"""
+        trace = self.traces.get(symbol) if self.enabled else None
+        if trace is None or trace.decided is not None:
+            return
+        trace.decided = time.monotonic_ns()
+        self._record('decision', trace.indicators, trace.decided)
+
+    def order(self, symbol, sent_ns, acked_ns):
+        """주문 REST 요청 시작/응답 시각 (마지막 캔들 메시지에서 주문까지)"""
+        if not self.enabled:
+            return
+        self._record('order_ack', sent_ns, acked_ns)
+        trace = self.traces.get(symbol)
+        if trace is not None:
+            self._record('tick_to_order', trace.received, sent_ns)
+            if trace.decided is not None:
+                self._record('order_send', trace.decided, sent_ns)
+
+    def reset(self):
+        """히스토그램 초기화 (워밍업 구간 제외 등)"""
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+
+    def stats(self):
+        """구간별 지연 시간 요약 {구간: {'count', 'mean', 'p50', 'p90', 'p99', 'max'}} (ms, 기록 없는 구간 제외)"""
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items() if histogram.count}
+
+    def log_summary(self):
+        for stage, stats in self.stats().items():
+            logger.info(f"지연 {stage}: {stats['count']}회, p50 {stats['p50']:.2f}ms, "
+                        f"p99 {stats['p99']:.2f}ms, max {stats['max']:.2f}ms")
+
+
+TRACER = PipelineTracer()  # 프로세스 공용 (웹소켓 핸들러, 전략 평가, 주문)